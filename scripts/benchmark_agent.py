@@ -0,0 +1,145 @@
+"""
+Benchmarks the DataJournalistAgent's own overhead with the offline fixture LLM
+(`model="fake/default"`, see salary_data/fake_llm.py), so no provider or
+network is involved. Reports:
+
+- prompt building and output cleaning, per call;
+- tool overhead: a SalaryTools lookup called directly vs. the same tool as
+  run by the agent (schema validation, callbacks, scratchpad);
+- end-to-end `query` latency and throughput with 1..N concurrent requests
+  sharing one agent, and callback latency: time to the first `stream_query`
+  event.
+
+With the default zero LLM delay, every number is framework overhead. Agent
+logs are silenced while timing. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_agent.py [--requests 40] [--workers 1 4 8] [--first-token-ms 0]
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+
+QUESTIONS = [
+    "How much purchasing power did Buenos Aires lose since 2023?",
+    "Which are the top 3 paying provinces?",
+    "Compare salaries in Córdoba against inflation",
+    "What is the teacher salary in Chaco?",
+]
+
+
+def build_agent(first_token_delay: float = 0.0, token_delay: float = 0.0):
+    from salary_data.agent import DataJournalistAgent
+    from salary_data.response_cache import ResponseCache
+
+    data = make_dataset()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = DataJournalistAgent(
+            {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+            model_params={
+                "model": "fake/default",
+                "first_token_delay": first_token_delay,
+                "token_delay": token_delay,
+            },
+            data_version="benchmark",
+            # Nothing cached or routed, so every request runs the agent loop
+            response_cache=ResponseCache(maxsize=0),
+        )
+    agent.router = None
+    return agent
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def time_stages(agent, repeat: int) -> dict:
+    raw_answer = "Thought: I now know the final answer\nFinal Answer: " + "word " * 60
+    tool = next(t for t in agent.agent.tools if t.name == "get_province_salary")
+    args = {"province": "Chaco", "period": "2025-09-01"}
+    agent.tools.province_salary(**args)  # warm the tool cache for both paths
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {
+            "build_prompt": _median_ms(
+                lambda: agent.build_prompt(QUESTIONS[0], {"language_preference": "en"}), repeat
+            ),
+            "clean_output": _median_ms(lambda: agent.clean_output(raw_answer), repeat),
+            "tool, direct call": _median_ms(lambda: agent.tools.province_salary(**args), repeat),
+            "tool, as run by the agent": _median_ms(lambda: tool.invoke(args), repeat),
+        }
+
+
+def time_concurrency(agent, workers: int, requests: int) -> dict:
+    def one(i):
+        question = QUESTIONS[i % len(QUESTIONS)]
+        start = time.perf_counter()
+        first = None
+        for event in agent.stream_query(question):
+            if first is None:
+                first = time.perf_counter() - start
+        return first, time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - start
+    latencies = [r[1] * 1000 for r in results]
+    first_events = [r[0] * 1000 for r in results]
+    return {
+        "p50": _percentile(latencies, 0.5),
+        "p95": _percentile(latencies, 0.95),
+        "first_event_p50": _percentile(first_events, 0.5),
+        "throughput": requests / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent overhead with the fixture LLM")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--first-token-ms", type=float, default=0)
+    parser.add_argument("--token-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    agent = build_agent(args.first_token_ms / 1000, args.token_ms / 1000)
+
+    print(f"[Benchmark] Agent stages, median of {args.repeat}:")
+    for label, ms in time_stages(agent, args.repeat).items():
+        print(f"  {label:<28} {ms:8.3f} ms")
+
+    print(
+        f"[Benchmark] stream_query, {args.requests} requests, fixture LLM with "
+        f"{args.first_token_ms:.0f} ms to first chunk, {args.token_ms:.0f} ms per token:"
+    )
+    for workers in args.workers:
+        r = time_concurrency(agent, workers, args.requests)
+        print(
+            f"  {workers:>2} workers | p50 {r['p50']:7.1f} ms | p95 {r['p95']:7.1f} ms"
+            f" | first event p50 {r['first_event_p50']:7.1f} ms | {r['throughput']:6.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmarks AgentPool sizes with the offline fixture LLM (`model="fake/default"`)
+and provider-like delays: a burst of concurrent chat requests against one
+worker process, each leasing an executor for its agent run. Also times
+building an executor with `clone()` against building a full agent. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_agent_pool.py [--requests 16] [--sizes 1 2 4 8]
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_agent import QUESTIONS, build_agent
+from salary_data.agent_pool import AgentPool
+
+
+def time_burst(agent, size: int, requests: int) -> dict:
+    pool = AgentPool(agent, size=size, timeout=600)
+
+    def one(i):
+        start = time.perf_counter()
+        with pool.acquire() as executor:
+            executor.query(QUESTIONS[i % len(QUESTIONS)])
+        return (time.perf_counter() - start) * 1000
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=requests) as threads:
+            latencies = sorted(threads.map(one, range(requests)))
+        wall = time.perf_counter() - start
+    stats = pool.stats()
+    return {
+        "wall_s": wall,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "avg_wait_ms": stats["avg_wait_ms"],
+        "queued": stats["queued"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent pool sizes")
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    agent = build_agent(args.first_token_ms / 1000, args.token_ms / 1000)
+    build_ms = (time.perf_counter() - start) * 1000
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        agent.clone()
+        clone_ms = (time.perf_counter() - start) * 1000
+    print(f"[Benchmark] Full agent build {build_ms:.1f} ms | clone() {clone_ms:.1f} ms")
+
+    print(
+        f"[Benchmark] {args.requests} concurrent requests, fixture LLM with "
+        f"{args.first_token_ms:.0f} ms to first chunk, {args.token_ms:.0f} ms per token:"
+    )
+    for size in args.sizes:
+        r = time_burst(agent, size, args.requests)
+        print(
+            f"  pool size {size:>2} | burst {r['wall_s']:6.2f} s | p50 {r['p50']:7.0f} ms"
+            f" | p95 {r['p95']:7.0f} ms | queued {r['queued']:>2} | avg wait {r['avg_wait_ms']:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
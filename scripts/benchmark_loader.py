@@ -0,0 +1,97 @@
+"""
+Benchmarks DataLoader end to end against an offline storage backend.
+
+Seeds a local or in-memory store with a published snapshot of synthetic,
+production-shaped data, then times the paths that matter in production:
+
+- cold start: a fresh DataLoader resolving `current` and loading every dataset
+- refresh check: the single pointer GET the background refresher makes
+- update: publishing a new snapshot in which one dataset changed
+
+Optionally emulates a per-request round trip so the parallel fetch can be
+compared with S3-like latency. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_loader.py \
+        [--backend memory|local] [--latency-ms 0 20] [--repeat 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+from salary_data.loader import DataLoader
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(backend: str, latency_ms: float, repeat: int = 10):
+    os.environ["DATA_STORAGE_BACKEND"] = backend
+    os.environ["DATA_STORAGE_LATENCY_MS"] = "0"
+    data = make_dataset()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATA_STORAGE_PATH"] = root
+
+        # Seed without latency, then measure with it
+        seeder = DataLoader()
+        if backend == "memory":
+            seeder.storage.store.clear()
+        seeder.publish_snapshot(data, force=True)
+
+        os.environ["DATA_STORAGE_LATENCY_MS"] = str(latency_ms)
+
+        def cold_start():
+            loader = DataLoader()
+            loaded = loader.get_all_data(allow_scrape=False, manifest=loader.get_manifest())
+            assert len(loaded) == len(data)
+
+        loader = DataLoader()
+        changed = {**data}
+
+        def update():
+            # A new quarter of net salaries; every other dataset is reused
+            changed["net_salaries"] = changed["net_salaries"] * 1.01
+            assert loader.publish_snapshot(changed) is not None
+
+        return {
+            "backend": backend,
+            "latency_ms": latency_ms,
+            "cold_start_ms": _median_ms(cold_start, repeat),
+            "refresh_check_ms": _median_ms(loader.get_manifest, repeat),
+            "update_ms": _median_ms(update, repeat),
+        }
+
+
+def print_report(rows):
+    print("| Backend | Emulated latency (ms) | Cold start (ms) | Refresh check (ms) | Update, 1 dataset changed (ms) |")
+    print("| :--- | ---: | ---: | ---: | ---: |")
+    for r in rows:
+        print(
+            f"| {r['backend']} | {r['latency_ms']:g} | {r['cold_start_ms']:.1f} "
+            f"| {r['refresh_check_ms']:.1f} | {r['update_ms']:.1f} |"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["memory", "local"], default="local")
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 20])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = [run_benchmark(args.backend, latency, args.repeat) for latency in args.latency_ms]
+    print_report(rows)
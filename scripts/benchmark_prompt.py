@@ -0,0 +1,51 @@
+"""
+Measures the DataJournalistAgent prompt size per prompt mode (see
+salary_data/prompts.py): the static system prefix and the first LLM call of
+every evaluation question, counted with the model's tokenizer. No LLM is
+called. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_prompt.py [--model openai/gpt-4o-mini]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_router import build_agent, llm_prompt_tokens, load_cases
+
+
+def measure(model: str, mode: str) -> dict:
+    import litellm
+
+    os.environ["AGENT_PROMPT_MODE"] = mode
+    agent = build_agent(model)
+    per_question = [
+        llm_prompt_tokens(agent, case["q"], case.get("history", [])) for case in load_cases()
+    ]
+    return {
+        "system_tokens": litellm.token_counter(model=model, text=agent.system_prompt),
+        "median_request_tokens": statistics.median(per_question),
+        "max_request_tokens": max(per_question),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure agent prompt tokens per mode")
+    parser.add_argument("--model", default="openai/gpt-4o-mini")
+    args = parser.parse_args()
+
+    results = {mode: measure(args.model, mode) for mode in ("full", "compact")}
+    print(f"[Benchmark] Prompt tokens for the first LLM call ({args.model}):")
+    for mode, r in results.items():
+        print(
+            f"  {mode:<8} | system prefix {r['system_tokens']:>5} | per request: median"
+            f" {r['median_request_tokens']:>6.0f}, max {r['max_request_tokens']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
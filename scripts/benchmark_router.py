@@ -0,0 +1,147 @@
+"""
+Benchmarks the agent's intent router (salary_data/router.py) on the evaluation
+questions (tests/eval_dataset.jsonl) over synthetic data.
+
+For every question it reports whether the router answers it and how fast, and
+the prompt size and estimated cost of the LLM path it replaces. The LLM
+estimate prices the real agent prompt (system prompt, dataframe heads, tool
+schemas and the per-question input) with litellm's price table, times the
+number of model calls a tool-calling run usually makes. Pass --live to also
+time the LLM path end to end (needs the model's API key). Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_router.py [--model openai/gpt-4o-mini] [--live]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+
+EVAL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tests", "eval_dataset.jsonl"
+)
+
+# A tool-calling run is a tool call plus the final answer, sometimes a retry
+LLM_CALLS = 3
+COMPLETION_TOKENS = 150
+
+
+def load_cases(path: str = EVAL_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_agent(model: str):
+    from salary_data.agent import DataJournalistAgent
+
+    data = make_dataset()
+    return DataJournalistAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": model, "temperature": 0},
+        data_version="benchmark",
+    )
+
+
+def llm_prompt_tokens(agent, question: str, history: list) -> int:
+    """Prompt tokens of the first LLM call for `question`."""
+    import litellm
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    prompt = agent.agent.agent.runnable.steps[1]
+    user_input = agent.build_prompt(question, chat_history=history)
+    messages = [
+        {"role": "system" if m.type == "system" else "user", "content": m.content}
+        for m in prompt.format_messages(input=user_input, agent_scratchpad=[])
+    ]
+    tools = [convert_to_openai_tool(t) for t in agent.agent.tools]
+    return litellm.token_counter(model=agent.model_params["model"], messages=messages, tools=tools)
+
+
+def llm_cost(model: str, prompt_tokens: int) -> float:
+    import litellm
+
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=COMPLETION_TOKENS
+        )
+    except Exception:
+        # Local models (ollama) are not in the price table
+        return 0.0
+    # Later calls resend the prompt plus the tool results; count it once per call
+    return (prompt_cost + completion_cost) * LLM_CALLS
+
+
+def _median_us(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def run_benchmark(model: str, live: bool = False, repeat: int = 200):
+    agent = build_agent(model)
+    router = agent.router
+    if router is None:
+        raise SystemExit("AGENT_ROUTER is disabled; unset it to benchmark the router.")
+
+    rows = []
+    for case in load_cases():
+        question, history = case["q"], case.get("history", [])
+        routed = router.route(question, chat_history=history)
+        route_us = _median_us(lambda: router.route(question, chat_history=history), repeat)
+        tokens = llm_prompt_tokens(agent, question, history)
+        row = {
+            "question": question,
+            "intent": routed.intent if routed else "llm",
+            "route_us": route_us,
+            "llm_prompt_tokens": tokens,
+            "llm_cost_usd": llm_cost(model, tokens),
+        }
+        if live:
+            agent.router = None
+            start = time.perf_counter()
+            agent.query(question, chat_history=history)
+            row["llm_s"] = time.perf_counter() - start
+            agent.router = router
+        rows.append(row)
+
+    print(f"[Benchmark] Router over {len(rows)} eval questions ({model}):")
+    for row in rows:
+        live_col = f" | LLM {row['llm_s']:6.2f} s" if "llm_s" in row else ""
+        print(
+            f"  {row['intent']:<17} | route {row['route_us']:7.1f} µs"
+            f" | LLM prompt {row['llm_prompt_tokens']:>5} tok, ~${row['llm_cost_usd']:.5f}"
+            f"{live_col} | {row['question'][:60]}"
+        )
+
+    routed_rows = [r for r in rows if r["intent"] != "llm"]
+    cost_without = sum(r["llm_cost_usd"] for r in rows)
+    cost_with = sum(r["llm_cost_usd"] for r in rows if r["intent"] == "llm")
+    print(f"  Routed: {len(routed_rows)}/{len(rows)} questions answered without the LLM.")
+    print(
+        f"  Estimated LLM cost per {len(rows)} questions: ${cost_without:.4f} without the router,"
+        f" ${cost_with:.4f} with it."
+    )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent intent router")
+    parser.add_argument("--model", default="openai/gpt-4o-mini")
+    parser.add_argument("--live", action="store_true", help="also time real LLM runs")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.model, live=args.live, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
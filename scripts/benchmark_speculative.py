@@ -0,0 +1,100 @@
+"""
+Benchmarks GUARDRAIL_SPECULATIVE: chat requests whose relevance only the LLM
+guardrail can decide, answered by `ChatService.answer` with the guardrail
+before the agent (default) and with both running concurrently.
+
+The agent runs on the offline fixture LLM with a per-call delay; the
+guardrail's LLM call is replaced by a sleep of `--guardrail-ms` returning a
+fixed verdict, and its verdict cache is off, so every request pays it.
+Reports median latency for accepted and rejected questions, and the agent
+LLM calls spent on rejected ones. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_speculative.py [--requests 10] [--guardrail-ms 400] [--first-token-ms 300]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+import contextlib
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_agent import build_agent
+from salary_data.agent_pool import AgentPool
+from salary_data.chat import ChatService
+from salary_data.guardrails import InputValidator, verdict_cache
+
+# Questions the heuristics and the classifier leave to the LLM
+QUESTIONS = ["What do you think of it?", "And what about that one?", "Tell me more"]
+
+
+class DelayedValidator(InputValidator):
+    """InputValidator whose LLM relevance call is a fixed delay and verdict."""
+
+    def __init__(self, delay_s: float, relevant: bool):
+        super().__init__("benchmark/guardrail", verdicts=verdict_cache(maxsize=0))
+        self.classifier = None
+        self.delay_s = delay_s
+        self.relevant = relevant
+
+    def _llm_relevance(self, text):
+        time.sleep(self.delay_s)
+        return (True, "RELEVANT") if self.relevant else (False, "IRRELEVANT")
+
+
+def time_mode(agent, speculative: bool, relevant: bool, args) -> dict:
+    store = SimpleNamespace(current=lambda: SimpleNamespace(version="benchmark"))
+    service = ChatService(store, model_params={}, guardrail_model="", speculative=speculative)
+    service._agent_entry = ("benchmark", AgentPool(agent))
+    service._validator = DelayedValidator(args.guardrail_ms / 1000, relevant)
+
+    latencies, iterations = [], []
+    for i in range(args.requests):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            start = time.perf_counter()
+            service.answer(QUESTIONS[i % len(QUESTIONS)], {"language_preference": "en"}, [])
+            latencies.append((time.perf_counter() - start) * 1000)
+        records = [
+            json.loads(line[len("[Telemetry] "):])
+            for line in out.getvalue().splitlines()
+            if line.startswith("[Telemetry] ")
+        ]
+        iterations.append(records[-1]["iterations"] if records else 0)
+    return {"p50": statistics.median(latencies), "llm_calls": statistics.mean(iterations)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the speculative guardrail")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--guardrail-ms", type=float, default=400)
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    os.environ["GUARDRAIL_CLASSIFIER"] = "0"
+    # langchain logs each RunGate cancellation as a callback error
+    logging.getLogger("langchain_core.callbacks.manager").setLevel(logging.ERROR)
+    agent = build_agent(args.first_token_ms / 1000)
+    print(
+        f"[Benchmark] {args.requests} requests per row, guardrail LLM {args.guardrail_ms:.0f} ms,"
+        f" agent LLM {args.first_token_ms:.0f} ms per call:"
+    )
+    for relevant in (True, False):
+        for speculative in (False, True):
+            r = time_mode(agent, speculative, relevant, args)
+            print(
+                f"  {'accepted' if relevant else 'rejected'} | "
+                f"{'speculative' if speculative else 'sequential ':<11} | p50 {r['p50']:7.0f} ms"
+                f" | agent LLM calls {r['llm_calls']:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Measures the cold start of the Lambda handler module (`salary_app`) offline and
+fails when it exceeds the startup budget.
+
+Each run imports `salary_app` in a fresh interpreter, against a local storage
+backend seeded with synthetic data. No AWS or LLM access is needed. The chat
+stack must not be imported at all. Phase timings come from
+`salary_data.startup.startup_profile`, and an extra run under tracemalloc
+reports Python allocations. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_startup.py \
+        [--repeat 5] [--budget total_ms=3000 --budget data_ms=500 ...]
+
+Exits with status 1 if any budget is exceeded.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.startup import check_budgets
+from salary_data.synthetic import make_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for a laptop or CI runner; a regression such as importing the
+# LLM stack at module level (~6 s) or scraping on startup trips them.
+BUDGETS = {
+    "total_ms": 3000,
+    "imports_ms": 2500,
+    "data_ms": 500,
+    "reports_ms": 100,
+    "chat_ms": 50,
+    "app_ms": 300,
+    "callbacks_ms": 100,
+    "peak_rss_mb": 400,
+}
+
+# Importing any of these at startup means the lazy chat stack regressed
+CHAT_MODULES = ["salary_data.agent", "litellm", "langchain_experimental", "langchain_litellm"]
+
+CHILD_CODE = """
+import json, sys
+import salary_app
+profile = salary_app.startup_profile.as_dict()
+profile["chat_modules"] = [m for m in {chat_modules!r} if m in sys.modules]
+print("STARTUP_PROFILE " + json.dumps(profile))
+"""
+
+
+def seed_store(root: str):
+    """Publishes a synthetic snapshot to a local storage backend at `root`."""
+    os.environ["DATA_STORAGE_BACKEND"] = "local"
+    os.environ["DATA_STORAGE_PATH"] = root
+    from salary_data.loader import DataLoader
+
+    DataLoader().publish_snapshot(make_dataset(), force=True)
+
+
+def run_once(env: dict, trace_memory: bool = False) -> dict:
+    cmd = [sys.executable]
+    if trace_memory:
+        cmd += ["-X", "tracemalloc=1"]
+    cmd += ["-c", CHILD_CODE.format(chat_modules=CHAT_MODULES)]
+    result = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_PROFILE "):
+            return json.loads(line[len("STARTUP_PROFILE "):])
+    raise RuntimeError(f"salary_app failed to import:\n{result.stderr[-2000:]}")
+
+
+def run_benchmark(repeat: int = 5) -> dict:
+    with tempfile.TemporaryDirectory() as root:
+        seed_store(root)
+        env = {
+            **os.environ,
+            "DATA_STORAGE_BACKEND": "local",
+            "DATA_STORAGE_PATH": root,
+            "DATA_STORAGE_LATENCY_MS": "0",
+            "DATA_REFRESH_INTERVAL": "0",
+            "CHAT_PREWARM": "0",
+            # Never reach a real provider, even if something calls out
+            "AGENT_MODEL": "fake/benchmark",
+            "GUARDRAIL_MODEL": "fake/benchmark",
+            "PYTHONPATH": os.pathsep.join(
+                [os.path.join(ROOT, "src"), os.environ.get("PYTHONPATH", "")]
+            ),
+        }
+        env.pop("AWS_S3_BUCKET", None)
+
+        runs = [run_once(env) for _ in range(repeat)]
+        traced = run_once(env, trace_memory=True)
+
+    phases = list(runs[0]["phases"])
+    results = {f"{p}_ms": statistics.median(r["phases"][p] for r in runs) for p in phases}
+    results["total_ms"] = statistics.median(r["total_ms"] for r in runs)
+    results["peak_rss_mb"] = max(r["memory"][phases[-1]]["peak_rss_mb"] for r in runs)
+    results["traced_peak_mb"] = traced["memory"][phases[-1]]["traced_peak_mb"]
+    results["chat_modules"] = sorted(set(m for r in runs for m in r["chat_modules"]))
+    results["phases"] = phases
+    results["traced"] = traced["memory"]
+    return results
+
+
+def print_report(results: dict, budgets: dict):
+    print("| Phase | Median (ms) | Budget (ms) | Python allocations after phase (MB) |")
+    print("| :--- | ---: | ---: | ---: |")
+    for phase in results["phases"]:
+        key = f"{phase}_ms"
+        print(
+            f"| {phase} | {results[key]:.1f} | {budgets.get(key, '-')} "
+            f"| {results['traced'][phase]['traced_mb']:.1f} |"
+        )
+    print(f"| **total** | {results['total_ms']:.1f} | {budgets.get('total_ms', '-')} | |")
+    print(
+        f"\nPeak RSS: {results['peak_rss_mb']:.0f} MB (budget {budgets.get('peak_rss_mb', '-')}). "
+        f"Peak traced Python allocations: {results['traced_peak_mb']:.1f} MB."
+    )
+
+
+def parse_budget(value: str):
+    key, _, limit = value.partition("=")
+    if key not in BUDGETS:
+        raise argparse.ArgumentTypeError(f"Unknown budget '{key}'. Known: {', '.join(BUDGETS)}")
+    return key, float(limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget", type=parse_budget, action="append", default=[],
+        help="Override a budget, e.g. total_ms=2500 (repeatable)",
+    )
+    args = parser.parse_args()
+
+    budgets = {**BUDGETS, **dict(args.budget)}
+    results = run_benchmark(repeat=args.repeat)
+    print_report(results, budgets)
+
+    failures = check_budgets(results, budgets)
+    if failures:
+        print("\n[Startup] Budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n[Startup] All budgets met.")
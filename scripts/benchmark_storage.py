@@ -0,0 +1,89 @@
+"""
+Benchmarks the Parquet storage profiles on synthetic, production-shaped data.
+
+For each profile and dataset it reports the object size (bytes transferred on
+a full GET), encode time, full decode time and projected decode time (a single
+column, e.g. one `infl_*` category). Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_storage.py [--repeat 50]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+from salary_data.storage import STORAGE_PROFILES, to_parquet_bytes, read_parquet_bytes
+
+# The single column each dashboard/agent read actually needs
+PROJECTIONS = {
+    "net_salaries": ["Chaco"],
+    "gross_salaries": ["Chaco"],
+    "basic_salaries": ["Chaco"],
+    "inflation_ipc": ["infl_Nivel_general"],
+    "poverty_lines": ["linea_pobreza"],
+    "clusters": ["cluster"],
+    "anomalies": ["anomaly"],
+}
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(repeat: int = 50):
+    data = make_dataset()
+    rows = []
+    for profile in STORAGE_PROFILES.values():
+        for name, df in data.items():
+            body = to_parquet_bytes(df, profile)
+            rows.append(
+                {
+                    "profile": profile.name,
+                    "dataset": name,
+                    "bytes": len(body),
+                    "encode_ms": _median_ms(lambda: to_parquet_bytes(df, profile), repeat),
+                    "decode_ms": _median_ms(lambda: read_parquet_bytes(body), repeat),
+                    "projected_ms": _median_ms(
+                        lambda: read_parquet_bytes(body, columns=PROJECTIONS[name]), repeat
+                    ),
+                }
+            )
+    return rows
+
+
+def print_report(rows):
+    print("| Profile | Dataset | Bytes | Encode (ms) | Decode all (ms) | Decode 1 column (ms) |")
+    print("| :--- | :--- | ---: | ---: | ---: | ---: |")
+    for r in rows:
+        print(
+            f"| {r['profile']} | {r['dataset']} | {r['bytes']:,} | {r['encode_ms']:.2f} "
+            f"| {r['decode_ms']:.2f} | {r['projected_ms']:.2f} |"
+        )
+
+    print("\n| Profile | Total bytes | Decode all (ms) | Decode 1 column (ms) |")
+    print("| :--- | ---: | ---: | ---: |")
+    for profile in STORAGE_PROFILES:
+        subset = [r for r in rows if r["profile"] == profile]
+        print(
+            f"| {profile} | {sum(r['bytes'] for r in subset):,} "
+            f"| {sum(r['decode_ms'] for r in subset):.2f} "
+            f"| {sum(r['projected_ms'] for r in subset):.2f} |"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print_report(run_benchmark(repeat=args.repeat))
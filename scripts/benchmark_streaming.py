@@ -0,0 +1,105 @@
+"""
+Measures time-to-first-token of the DataJournalistAgent against a local,
+scripted LLM (salary_data/fake_llm.py): one tool call, then a streamed final
+answer, with provider-like delays. Compares the blocking `query` (the user sees
+nothing until the answer is complete) with `stream_query`. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_streaming.py [--first-token-ms 400] [--token-ms 30]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+
+ANSWER = (
+    "Between 2023-09 and 2025-09, the purchasing power of teacher salaries in "
+    "Chaco changed by -12.40%, a loss: nominal salaries grew, but less than the "
+    "consumer price index over the same period, so a teacher's net salary buys "
+    "less than it did two years ago."
+)
+
+
+def build_agent(first_token_delay: float, token_delay: float):
+    from langchain_core.messages import AIMessage
+    from salary_data.agent import DataJournalistAgent
+    from salary_data.fake_llm import ScriptedChatModel, tool_call
+    from salary_data.response_cache import ResponseCache
+
+    class ScriptedAgent(DataJournalistAgent):
+        def _make_llm(self):
+            return ScriptedChatModel(
+                responses=[
+                    tool_call(
+                        "calculate_purchasing_power_loss",
+                        start_date="2023-09-01",
+                        end_date="2025-09-01",
+                        province="Chaco",
+                    ),
+                    AIMessage(content=ANSWER),
+                ],
+                first_token_delay=first_token_delay,
+                token_delay=token_delay,
+            )
+
+    data = make_dataset()
+    agent = ScriptedAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": "scripted"},
+        data_version="benchmark",
+        # Nothing cached, so every run goes through the LLM loop
+        response_cache=ResponseCache(maxsize=0),
+    )
+    agent.router = None
+    return agent
+
+
+def time_blocking(agent) -> float:
+    start = time.perf_counter()
+    agent.query("How did purchasing power change in Chaco?")
+    return time.perf_counter() - start
+
+
+def time_streaming(agent):
+    start = time.perf_counter()
+    first_event = first_token = None
+    for event in agent.stream_query("How did purchasing power change in Chaco?"):
+        now = time.perf_counter() - start
+        if first_event is None:
+            first_event = now
+        if event["type"] == "token" and first_token is None:
+            first_token = now
+    return first_event, first_token, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent time-to-first-token")
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    agent = build_agent(args.first_token_ms / 1000, args.token_ms / 1000)
+    blocking = [time_blocking(agent) for _ in range(args.repeat)]
+    streaming = [time_streaming(agent) for _ in range(args.repeat)]
+
+    print(
+        f"[Benchmark] Scripted LLM: {args.first_token_ms:.0f} ms to first chunk per call,"
+        f" {args.token_ms:.0f} ms per token, 1 tool call + {len(ANSWER.split())}-word answer"
+    )
+    print(f"  query()        | first visible output {statistics.median(blocking) * 1000:7.0f} ms (the whole answer)")
+    print(
+        f"  stream_query() | first event (tool) {statistics.median(s[0] for s in streaming) * 1000:7.0f} ms"
+        f" | first answer token {statistics.median(s[1] for s in streaming) * 1000:7.0f} ms"
+        f" | complete {statistics.median(s[2] for s in streaming) * 1000:7.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
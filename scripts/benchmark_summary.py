@@ -0,0 +1,100 @@
+"""
+Benchmarks the "Download Executive Summary" click on synthetic data: the time
+from the callback firing to the markdown payload being ready.
+
+Compares rendering the summary on every click (the old path, through the
+agent's frames) with SummaryStore, cold (first click for a data version) and
+warm. Pass --agent to also time the old first click, which built the whole
+LLM agent just to reach its frames. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_summary.py [--repeat 20] [--agent]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+from dash import dcc
+from salary_data.summary import SummaryStore, render_executive_summary
+from salary_data.tools import prepare_frames
+
+
+class FixedStore:
+    """Stands in for SnapshotRefresher with one snapshot."""
+
+    def __init__(self, version: str, agent_dfs: dict):
+        self.snapshot = SimpleNamespace(version=version, agent_dfs=agent_dfs)
+
+    def current(self):
+        return self.snapshot
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(repeat: int = 20, agent: bool = False):
+    data = make_dataset()
+    agent_dfs = {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")}
+    frames = prepare_frames(agent_dfs)
+
+    def click(summary_md):
+        return dcc.send_string(summary_md, "executive_summary.md")
+
+    results = {
+        "render per click": _median_ms(
+            lambda: click(render_executive_summary(frames, lang="es")), repeat
+        ),
+    }
+
+    versions = iter(range(10**6))
+
+    def cold_click():
+        store = FixedStore(f"v{next(versions)}", agent_dfs)
+        return click(SummaryStore(store).get("es"))
+
+    results["SummaryStore, first click per version"] = _median_ms(cold_click, repeat)
+
+    warm = SummaryStore(FixedStore("warm", agent_dfs))
+    warm.render_all()
+    results["SummaryStore, warm"] = _median_ms(lambda: click(warm.get("es")), repeat)
+
+    if agent:
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+        start = time.perf_counter()
+        from salary_data.agent import DataJournalistAgent
+
+        old = DataJournalistAgent(
+            agent_dfs, model_params={"model": "openai/gpt-4o-mini"}, data_version="old"
+        )
+        click(old.generate_executive_summary(lang="es"))
+        results["old first click (agent import + build)"] = (time.perf_counter() - start) * 1000
+
+    print(f"[Benchmark] Executive summary download, median of {repeat}:")
+    for label, ms in results.items():
+        print(f"  {label:<42} {ms:10.3f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the executive summary download")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--agent", action="store_true", help="also time the old first click")
+    args = parser.parse_args()
+    run_benchmark(args.repeat, agent=args.agent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmarks the agent tool computations (salary_data/tools.py) on synthetic,
+production-shaped data, with the result cache disabled and enabled.
+
+Reports the one-off precomputation cost per dataset and the median latency per
+call. Usage:
+
+    PYTHONPATH=src poetry run python scripts/benchmark_tools.py [--repeat 300]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.synthetic import make_dataset
+from salary_data.cache import LRUCache
+from salary_data.tools import SalaryTools, prepare_frames
+
+
+def prepared_frames():
+    """Same alignment as DataJournalistAgent._prepare_data."""
+    return prepare_frames(make_dataset())
+
+
+CALLS = {
+    "calculate_purchasing_power_loss (province)": lambda t: t.purchasing_power_change(
+        "2018-01-01", "2025-06-01", province="Salta"
+    ),
+    "calculate_purchasing_power_loss (top 5)": lambda t: t.purchasing_power_change(
+        "2018-01-01", "2025-06-01", k=5
+    ),
+    "get_ranking_top_k": lambda t: t.ranking_top_k(5, "2024-06"),
+    "get_province_salary": lambda t: t.province_salary("Chaco", "2024-01-01"),
+    "calculate_inflation_change": lambda t: t.inflation_change("2023-01-01", "2024-01-01"),
+}
+
+
+def _median_us(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def run_benchmark(repeat: int = 300):
+    frames = prepared_frames()
+    start = time.perf_counter()
+    uncached = SalaryTools(frames, data_version="bench", cache=LRUCache(maxsize=0))
+    precompute_ms = (time.perf_counter() - start) * 1000
+    cached = SalaryTools(frames, data_version="bench", cache=LRUCache(maxsize=1024))
+
+    rows = [
+        {
+            "tool": name,
+            "uncached_us": _median_us(lambda: call(uncached), repeat),
+            "cached_us": _median_us(lambda: call(cached), repeat),
+        }
+        for name, call in CALLS.items()
+    ]
+    return precompute_ms, rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    precompute_ms, rows = run_benchmark(repeat=args.repeat)
+    print(f"Precomputation per dataset: {precompute_ms:.2f} ms\n")
+    print("| Tool call | Uncached (µs) | Cached (µs) |")
+    print("| :--- | ---: | ---: |")
+    for r in rows:
+        print(f"| {r['tool']} | {r['uncached_us']:.1f} | {r['cached_us']:.1f} |")
@@ -0,0 +1,39 @@
+"""
+Precompiles the cluster analysis reports into `reports/report_sections.json`.
+
+The dashboard loads this artifact instead of parsing the Markdown reports on
+every cold start. Re-run it after editing a report (the Docker build runs it
+too). Usage:
+
+    PYTHONPATH=src poetry run python scripts/build_reports.py [--reports-dir reports]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.reports import REPORTS_DIR, SECTIONS_FILE, compile_all
+
+
+def build(reports_dir: str = REPORTS_DIR) -> str:
+    sections = compile_all(reports_dir)
+    out_path = os.path.join(reports_dir, SECTIONS_FILE)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(sections, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+    for lang, report in sections.items():
+        print(f"[Reports] {lang}: intro, {len(report['clusters'])} clusters, synthesis.")
+    print(f"[Reports] Wrote {out_path}")
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports-dir", default=REPORTS_DIR)
+    args = parser.parse_args()
+    build(args.reports_dir)
@@ -120,6 +120,10 @@ def run_evaluation():
 
             avg_score = total_score / len(eval_cases) if eval_cases else 0
             mlflow.log_metric("average_score", avg_score)
+            # Cumulative across models: the tool cache is shared per data version
+            mlflow.log_metric("tool_cache_hit_rate", agent.tool_cache_stats()["hit_rate"])
+            # Tool calls with a misspelled or aliased province that no longer need a retry
+            mlflow.log_metric("province_retries_saved", agent.province_stats()["retries_saved"])
             print(f"Model Average Score: {avg_score:.2f}/5")
 
     print("\n--- Evaluation Complete ---")
@@ -1,5 +1,7 @@
 from salary_data.scraper import Scraper
 from salary_data.analytics import AnalyticsPipeline
+from salary_data.loader import DataLoader
+from dotenv import load_dotenv
 import os
 import sys
 
@@ -7,20 +9,43 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
+IPC_HEADLINE = "infl_Nivel_general"
+
+
+def load_inputs(loader: DataLoader, scraper: Scraper):
+    """
+    Net salaries and the headline IPC series from the published snapshot, reading
+    only the headline column of the IPC object. Scrapes when nothing is published.
+    """
+    manifest = loader.resolve_current()
+    if manifest:
+        df_nom = loader.load_dataset("net_salaries", manifest=manifest)
+        df_ipc = loader.load_dataset("inflation_ipc", columns=[IPC_HEADLINE], manifest=manifest)
+        if df_nom is not None and df_ipc is not None:
+            print(f"Using published snapshot {manifest.get('version')}.")
+            return df_nom, df_ipc[IPC_HEADLINE]
+
+    print("No published snapshot. Fetching data from CGECSE and INDEC...")
+    df_nom = scraper.get_cgecse_salaries(scraper.URL_TESTIGO_NETO)
+    return df_nom, scraper.get_ipc_indec()[IPC_HEADLINE]
+
+
 def main():
     print("--- Starting Monthly Update Pipeline ---")
+    load_dotenv()
 
     # 1. Initialize tools
     scraper = Scraper()
     pipeline = AnalyticsPipeline()
 
     # 2. Fetch latest data
-    print("Step 1: Fetching data from CGECSE and INDEC...")
+    print("Step 1: Loading salaries and IPC...")
     try:
         # Align data starting from Dec 2016 for consistency
         START_LIMIT = "2016-12-01"
-        df_nom = scraper.get_cgecse_salaries(scraper.URL_TESTIGO_NETO).loc[START_LIMIT:]
-        df_ipc = scraper.get_ipc_indec()["infl_Nivel_general"].loc[START_LIMIT:]
+        df_nom, df_ipc = load_inputs(DataLoader(), scraper)
+        df_nom = df_nom.loc[START_LIMIT:]
+        df_ipc = df_ipc.loc[START_LIMIT:]
 
         # Calculate real salary for the pipeline
         # Using a recent date as base to keep values intuitive
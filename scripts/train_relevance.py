@@ -0,0 +1,303 @@
+"""
+Trains the guardrails' local relevance classifier (salary_data/relevance.py)
+and exports it to artifacts/relevance_classifier.json.
+
+Positives are the evaluation questions (tests/eval_dataset.jsonl) plus
+templated questions about salaries, prices, poverty lines and provinces, in
+Spanish and English, many worded without the heuristics' keywords. Negatives
+are templated off-topic requests. The model is a scikit-learn TfidfVectorizer
+(character n-grams, via `char_ngrams`) with a LogisticRegression, first
+scored on templates held out of training, then refit on everything.
+
+The reject threshold is calibrated on held-out templates too: half the lowest
+P(relevant) any held-out relevant prompt got, over several splits (content-free
+follow-ups such as "Tell me more" are always trained on instead). Prompts at or
+below it are rejected without the LLM. Needs the analytics dependency
+group. Usage:
+
+    PYTHONPATH=src poetry run python scripts/train_relevance.py [--output artifacts/relevance_classifier.json]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import datetime
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_data.provinces import PROVINCES
+from salary_data.relevance import ARTIFACT_NAME, FORMAT_VERSION, NGRAM_RANGE, char_ngrams
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The reject threshold is this fraction of the lowest held-out relevant score
+REJECT_MARGIN = 0.5
+EVAL_PATH = os.path.join(ROOT, "tests", "eval_dataset.jsonl")
+
+RELEVANT = [
+    "¿Cuánto cobra un docente en {prov}?",
+    "¿Cuánto gana un maestro en {prov} en {month} de {year}?",
+    "¿Qué provincia le paga mejor a los maestros?",
+    "¿Dónde están peor pagos los docentes?",
+    "¿Cómo les fue a los maestros de {prov} este año?",
+    "¿Los docentes de {prov} le ganaron a los precios?",
+    "Mostrame cómo cambió el sueldo docente en {prov}",
+    "¿Cuánto perdieron los maestros desde {year}?",
+    "¿Y en {prov}?",
+    "¿Qué pasa con {prov} y {prov2}?",
+    "¿Cuál es la canasta básica total en {month} de {year}?",
+    "¿Cuánto subieron los precios en {year}?",
+    "¿Está {prov} por encima del promedio nacional?",
+    "Resumen de la situación de los docentes en {prov}",
+    "¿Qué provincias tuvieron caídas bruscas en {year}?",
+    "¿En qué grupo está {prov}?",
+    "¿Cuánto necesita una familia para no ser pobre?",
+    "¿Alcanza el sueldo de un maestro para vivir?",
+    "¿Cuál fue el aumento de los docentes de {prov} en {year}?",
+    "Compará {prov} con {prov2} desde {year}",
+    "How much does a teacher make in {prov}?",
+    "Which province pays teachers the least?",
+    "Did teachers in {prov} keep up with prices?",
+    "How did wages change in {prov} since {year}?",
+    "What is the poverty line in {month} {year}?",
+    "Compare {prov} and {prov2}",
+    "Is {prov} above the national average?",
+    "What happened to real wages in {year}?",
+    "How are educators doing in {prov}?",
+    "Give me a summary for {prov}",
+    "What about {prov}?",
+    "Which jurisdictions had sudden drops in {year}?",
+    "Which group of provinces does {prov} belong to?",
+    "How much did prices rise in Argentina in {year}?",
+    "Is a teacher's income enough to cover the basic basket?",
+    "What was the raise for teachers in {prov} in {year}?",
+    "Where do teachers earn the most?",
+    "Are teachers in {prov} better off than in {year}?",
+    # The dashboard's own features, often asked without any data keyword
+    "Explain the anomalies",
+    "Explain the anomalies in {prov}",
+    "Explicame las anomalías de {prov}",
+    "Any unusual months for {prov} in {year}?",
+    "¿Hubo meses raros en {prov}?",
+    "What do the clusters mean?",
+    "¿Qué significan los clusters?",
+    "Which cluster is {prov} in?",
+    "Which group is this one in?",
+    "Summarize the chart",
+    "Resumí el gráfico",
+    "What does this chart show?",
+    "¿Qué muestra el gráfico de {prov}?",
+    "Describe the trend for {prov} since {year}",
+    "¿Cuál es la tendencia en {prov}?",
+    "Why did {prov} drop in {year}?",
+]
+# Follow-ups that only make sense after a data answer. They share no words with
+# the data, so no held-out score can say anything about them: they are always
+# trained on and never used to calibrate the reject threshold.
+FOLLOW_UPS = [
+    "Tell me more",
+    "Contame más",
+    "What do you think of it?",
+    "¿Qué opinás de eso?",
+    "And what about that one?",
+    "¿Y eso por qué?",
+    "Explain that again",
+    "Can you go deeper on that?",
+]
+IRRELEVANT = [
+    "What's the weather like in {city} today?",
+    "¿Qué tiempo hace en {city}?",
+    "Recommend me a good movie for tonight",
+    "Recomendame una serie para ver",
+    "Write a poem about {thing}",
+    "Escribí un poema sobre {thing}",
+    "How do I cook {food}?",
+    "¿Cómo se hace {food}?",
+    "Who won the {sport} match yesterday?",
+    "¿Quién ganó el partido de {sport}?",
+    "Translate '{thing}' to French",
+    "Tell me a joke about {thing}",
+    "Contame un chiste de {thing}",
+    "How do I fix this Python error?",
+    "What is the capital of {country}?",
+    "¿Cuál es la capital de {country}?",
+    "Explain quantum computing in simple terms",
+    "Help me write a cover letter",
+    "What's the best phone to buy?",
+    "¿Qué auto me conviene comprar?",
+    "Plan a trip to {city}",
+    "Organizá un viaje a {city}",
+    "How many planets are there in the solar system?",
+    "What time is it in {city}?",
+    "Who is the president of {country}?",
+    "Give me a workout routine",
+    "¿Qué le regalo a mi novia?",
+    "Summarize the plot of {book}",
+    "Resumime {book}",
+    "Which pizza is the best?",
+    "¿Cuál es la mejor pizza de {city}?",
+    "Can you help me with my {thing} homework?",
+    "Who is the best {sport} player ever?",
+    "¿Quién es el mejor jugador de {sport}?",
+    "What are the rules of {sport}?",
+    "How do I learn to play the guitar?",
+    "What's a good name for my dog?",
+    "¿Cómo cuido un cactus?",
+    "Write a haiku about {thing}",
+    "What is the meaning of life?",
+    "How tall is Mount Everest?",
+    "Help me debug my JavaScript code",
+    "What's the recipe for {food}?",
+    "Pasame la receta de {food}",
+    "Recommend a book like {book}",
+    "¿Qué película me recomendás?",
+    "How do I change a flat tire?",
+    "Best restaurants in {city}",
+    "¿Dónde se come bien en {city}?",
+    "What is photosynthesis?",
+    "Solve 2x + 3 = 7",
+    "Write an email to my boss asking for a day off",
+    "How old is the universe?",
+    "Tell me about the history of {country}",
+    "Contame la historia de {country}",
+    "Create a shopping list for {food}",
+    "How do I meditate?",
+    "¿Me contás un cuento sobre {thing}?",
+    "What is the speed of light?",
+    "How do vaccines work?",
+    "Who painted the Mona Lisa?",
+    "¿Qué hora es en {city}?",
+    "What is {thing}?",
+]
+FILLERS = {
+    "month": ["enero", "marzo", "junio", "septiembre", "January", "June", "September", "December"],
+    "city": ["Paris", "Madrid", "Tokyo", "Montevideo", "New York", "Rome", "Lima"],
+    "thing": ["the sea", "cats", "love", "autumn", "robots", "math", "chemistry"],
+    "food": ["lasagna", "empanadas", "sushi", "a chocolate cake", "risotto"],
+    "sport": ["football", "tennis", "basketball", "rugby"],
+    "country": ["France", "Japan", "Brazil", "Canada", "Italy", "Chile"],
+    "book": ["Don Quixote", "Harry Potter", "Hamlet", "Rayuela"],
+}
+
+
+def fill(template: str, rng: random.Random) -> str:
+    values = {k: rng.choice(v) for k, v in FILLERS.items()}
+    values.update(prov=rng.choice(PROVINCES), prov2=rng.choice(PROVINCES), year=rng.randint(2017, 2025))
+    return template.format(**values)
+
+
+def make_training_set(per_template: int = 30, seed: int = 0):
+    """(texts, labels, groups); the group is the template a text came from."""
+    rng = random.Random(seed)
+    texts, labels, groups = [], [], []
+    with open(EVAL_PATH, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if line.strip():
+                texts.append(json.loads(line)["q"])
+                labels.append(1)
+                groups.append(f"eval-{i}")
+    for label, templates in ((1, RELEVANT), (0, IRRELEVANT), (1, FOLLOW_UPS)):
+        prefix = "follow-up" if templates is FOLLOW_UPS else label
+        for t, template in enumerate(templates):
+            for _ in range(per_template):
+                texts.append(fill(template, rng))
+                labels.append(label)
+                groups.append(f"{prefix}-{t}")
+    return texts, labels, groups
+
+
+def split_templates(texts, labels, groups, seed: int = 0):
+    """(train, test) indices with a quarter of the templates held out; follow-ups always train."""
+    from sklearn.model_selection import GroupShuffleSplit
+
+    split = GroupShuffleSplit(n_splits=1, test_size=0.25, random_state=seed)
+    train, test = next(split.split(texts, labels, groups))
+    follow_ups = [i for i in test if groups[i].startswith("follow-up")]
+    return list(train) + follow_ups, [i for i in test if i not in set(follow_ups)]
+
+
+def build_model(c: float):
+    from sklearn.pipeline import make_pipeline
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return make_pipeline(
+        TfidfVectorizer(analyzer=char_ngrams, min_df=2),
+        LogisticRegression(C=c, class_weight="balanced", max_iter=1000),
+    )
+
+
+def held_out_metrics(texts, labels, groups, c: float) -> dict:
+    """Accuracy and F1 on whole templates the model never saw."""
+    from sklearn.metrics import accuracy_score, f1_score
+
+    train, test = split_templates(texts, labels, groups)
+    model = build_model(c).fit([texts[i] for i in train], [labels[i] for i in train])
+    predicted = model.predict([texts[i] for i in test])
+    truth = [labels[i] for i in test]
+    return {
+        "held_out_accuracy": round(float(accuracy_score(truth, predicted)), 4),
+        "held_out_f1": round(float(f1_score(truth, predicted)), 4),
+        "held_out_size": len(test),
+    }
+
+
+def calibrate_reject(texts, labels, groups, c: float, splits: int = 5) -> dict:
+    """Reject threshold below every held-out relevant prompt, with a 2x margin."""
+    lowest, negatives = 1.0, []
+    for seed in range(splits):
+        train, test = split_templates(texts, labels, groups, seed)
+        model = build_model(c).fit([texts[i] for i in train], [labels[i] for i in train])
+        probs = model.predict_proba([texts[i] for i in test])[:, 1]
+        lowest = min([lowest] + [p for i, p in zip(test, probs) if labels[i] == 1])
+        negatives.extend(p for i, p in zip(test, probs) if labels[i] == 0)
+    reject_below = round(float(REJECT_MARGIN * lowest), 4)
+    rejected = sum(bool(p <= reject_below) for p in negatives) / len(negatives)
+    return {"reject_below": reject_below, "held_out_rejected": round(rejected, 4)}
+
+
+def export(model, path: str, metrics: dict):
+    vectorizer, classifier = model.steps[0][1], model.steps[1][1]
+    coef = classifier.coef_[0]
+    features = {
+        gram: [round(float(vectorizer.idf_[i]), 6), round(float(vectorizer.idf_[i] * coef[i]), 6)]
+        for gram, i in vectorizer.vocabulary_.items()
+    }
+    artifact = {
+        "format": FORMAT_VERSION,
+        "ngram_range": list(NGRAM_RANGE),
+        "intercept": round(float(classifier.intercept_[0]), 6),
+        "metrics": metrics,
+        "features": dict(sorted(features.items())),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"[Relevance] Exported {len(features)} features to {path} ({os.path.getsize(path) / 1024:.0f} KB).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the guardrails relevance classifier")
+    parser.add_argument("--output", default=os.path.join(ROOT, "artifacts", ARTIFACT_NAME))
+    parser.add_argument("--per-template", type=int, default=30)
+    parser.add_argument("--c", type=float, default=10.0)
+    args = parser.parse_args()
+
+    texts, labels, groups = make_training_set(args.per_template)
+    print(f"[Relevance] {len(texts)} examples ({sum(labels)} relevant) from {len(set(groups))} templates.")
+    metrics = held_out_metrics(texts, labels, groups, args.c)
+    metrics.update(calibrate_reject(texts, labels, groups, args.c))
+    print(f"[Relevance] Held-out templates: {metrics}")
+
+    model = build_model(args.c).fit(texts, labels)
+    metrics.update(
+        examples=len(texts),
+        trained_at=datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+    export(model, args.output, metrics)
+
+
+if __name__ == "__main__":
+    main()
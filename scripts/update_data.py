@@ -1,46 +1,79 @@
 import os
 import sys
+import argparse
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from salary_data.loader import DataLoader
+from salary_data.loader import DataLoader, ANALYTICS_INPUTS, hash_bytes
 
 
-def run_update():
+def run_update(force: bool = False):
     load_dotenv()
 
     loader = DataLoader()
-
-    # 1. Scrape everything
     print(f"[{datetime.now()}] Starting data update check...")
-    current_data = loader.scrape_and_process_all()
 
-    # 2. Check if update is actually needed (optional optimization)
-    # We compare the latest date in the scraped salary data with what's on S3
-    latest_s3_net = loader._load_from_s3("raw/net_salaries.parquet")
+    # 1. Change detection: hash every raw source before parsing anything
+    previous = loader.load_hashes()
+    raw_sources = loader.fetch_raw_sources()
+    source_hashes = {name: hash_bytes(content) for name, content in raw_sources.items()}
+
+    changed = [
+        name
+        for name, digest in source_hashes.items()
+        if digest != previous["sources"].get(name)
+    ]
+    print(f"Changed sources: {changed or 'none'}")
 
-    if latest_s3_net is not None:
-        last_s3_date = latest_s3_net.index.max()
-        last_scraped_date = current_data["net_salaries"].index.max()
+    if not changed and not force:
+        print("No source changed since the last update. Nothing to do.")
+        return
 
-        print(f"Last date in S3: {last_s3_date}")
-        print(f"Last date scraped: {last_scraped_date}")
+    # 2. Parse, and only retrain analytics when its inputs changed
+    run_analytics = force or any(name in changed for name in ANALYTICS_INPUTS)
+    if not run_analytics:
+        print("Salary/IPC inputs unchanged. Skipping analytics pipeline.")
+    current_data = loader.scrape_and_process_all(
+        raw_sources=raw_sources, run_analytics=run_analytics
+    )
 
-        if last_scraped_date <= last_s3_date:
-            print("No new salary data detected. Skipping upload to S3.")
-            # Note: We might still want to update if IPC or Poverty data changed,
-            # but usually they move together or close enough.
-            # To be safe, we could also check IPC.
-            return
+    # 3. Publish a new snapshot. Only objects whose content hash differs are
+    # uploaded, and the `current` pointer (which records the hashes) is written
+    # last, so a failed run leaves readers on the previous version and is
+    # retried in full next time.
+    version = loader.publish_snapshot(
+        current_data, source_hashes=source_hashes, force=force
+    )
+    if version is None:
+        print("Failed to publish the new snapshot. The previous version stays live.")
+        sys.exit(1)
+    print(f"Update completed successfully. Live version: {version}")
 
-    # 3. Upload to S3
-    print("New data detected or S3 was empty. Uploading to S3...")
-    loader.upload_all_to_s3(current_data)
-    print("Update completed successfully.")
+
+def run_rollback(version: str):
+    load_dotenv()
+    if not DataLoader().rollback(version):
+        sys.exit(1)
+    print(f"Rolled back to snapshot {version}.")
 
 
 if __name__ == "__main__":
-    run_update()
+    parser = argparse.ArgumentParser(description="Refresh the datasets stored in S3.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run analytics and re-upload everything, even if nothing changed.",
+    )
+    parser.add_argument(
+        "--rollback",
+        metavar="VERSION",
+        help="Point `current` back at a previously published snapshot and exit.",
+    )
+    args = parser.parse_args()
+    if args.rollback:
+        run_rollback(args.rollback)
+    else:
+        run_update(force=args.force)
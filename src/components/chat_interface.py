@@ -82,6 +82,9 @@ def create_chat_interface():
                     # Stores for state management
                     dcc.Store(id="chat-history-store", data=[]),
                     dcc.Store(id="pending-query-store", data=None),
+                    # Async mode (CHAT_ASYNC=1): the running job and its poller
+                    dcc.Store(id="chat-job-store", data=None),
+                    dcc.Interval(id="chat-poll", interval=500, disabled=True),
                 ],
                 id="chat-sidebar",
                 title="Data Journalist AI",
@@ -93,6 +96,36 @@ def create_chat_interface():
     )
 
 
+def thinking_dots():
+    return html.Div(
+        [
+            html.Span(".", className="thinking-dot"),
+            html.Span(".", className="thinking-dot"),
+            html.Span(".", className="thinking-dot"),
+        ],
+        className="thinking-container",
+    )
+
+
+def format_stream(stream):
+    """
+    Renders an answer still in progress: the tools called so far, then the
+    text streamed since the last tool call, then the thinking dots.
+    """
+    children = [
+        html.Div(
+            f"🔧 {name}",
+            className="chat-tool-event",
+            style={"fontSize": "12px", "color": "#6c757d", "fontFamily": "monospace"},
+        )
+        for name in stream.get("tools", [])
+    ]
+    if stream.get("draft"):
+        children.append(html.Div(stream["draft"]))
+    children.append(thinking_dots())
+    return html.Div(children)
+
+
 def format_message(msg):
     """Formats a message bubble for the chat history."""
     is_user = msg["role"] == "user"
@@ -100,14 +133,8 @@ def format_message(msg):
 
     content = msg["content"]
     if is_thinking:
-        content = html.Div(
-            [
-                html.Span(".", className="thinking-dot"),
-                html.Span(".", className="thinking-dot"),
-                html.Span(".", className="thinking-dot"),
-            ],
-            className="thinking-container",
-        )
+        # Streaming answers (CHAT_ASYNC=1) carry their progress in "stream"
+        content = format_stream(msg["stream"]) if msg.get("stream") else thinking_dots()
 
     return html.Div(
         [
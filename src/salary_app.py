@@ -1,3 +1,5 @@
+# Imported first: the profile's clock starts at cold start
+from salary_data.startup import startup_profile
 import dash_bootstrap_components as dbc
 from apig_wsgi import make_lambda_handler
 from dash import (
@@ -14,119 +16,75 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from salary_data.loader import DataLoader
-from salary_data.agent import DataJournalistAgent
-from salary_data.guardrails import InputValidator
+from salary_data.snapshot import SnapshotRefresher, START_LIMIT
+from salary_data.chat import ChatService
+from salary_data.jobs import JobQueue
+from salary_data.summary import SummaryStore
+from salary_data.reports import (
+    compile_report_file,
+    load_report_sections,
+    process_citations,  # noqa: F401  (re-exported for report tooling and tests)
+)
 from components.chat_interface import create_chat_interface, format_message
 from datetime import datetime
 from dotenv import load_dotenv
 import os
-import re
 
+startup_profile.mark("imports")
 load_dotenv()
 
 # --- Data Loading ---
 loader = DataLoader()
 scraper = loader.scraper  # Re-expose scraper for utility methods in callbacks
-all_data = loader.get_all_data()
-
-# Pre-load and align data to start from Dec 2016 (INDEC IPC start)
-START_LIMIT = "2016-12-01"
-
-df_net_salary = all_data["net_salaries"].loc[START_LIMIT:]
-df_gross_salary = all_data["gross_salaries"].loc[START_LIMIT:]
-df_basic_salary = all_data["basic_salaries"].loc[START_LIMIT:]
-df_ipc = all_data["inflation_ipc"]
-df_cba_cbt = all_data["poverty_lines"].loc[START_LIMIT:]
-
-df_clusters = all_data.get("clusters")
-df_anomalies = all_data.get("anomalies")
-HAS_ANALYTICS = df_clusters is not None and df_anomalies is not None
 
-# Load and Parse Reports
-REPORT_SECTIONS = {
-    "es": {"intro": "", "clusters": [], "synthesis": ""},
-    "en": {"intro": "", "clusters": [], "synthesis": ""},
-}
-
-
-def process_citations(text):
-    """Converts citation numbers in [[N]] format to superscript links."""
-    # 1. Citations in text: Match [[N]] and convert to <sup><a href="#refN">N</a></sup>
-    text = re.sub(r"\[\[(\d{1,2})\]\]", r'<sup><a href="#ref\1">\1</a></sup>', text)
+# Callbacks read data through `data_store.current()` (an immutable snapshot,
+# aligned to start from Dec 2016) so a background refresh never mixes versions
+# within a request. Set DATA_REFRESH_INTERVAL (seconds) to poll S3 for updates.
+data_store = SnapshotRefresher(
+    loader, interval=int(os.getenv("DATA_REFRESH_INTERVAL", "0"))
+)
+data_store.load_initial()
+startup_profile.mark("data")
 
-    # 2. Reference list anchors:
-    # Match a line starting with 1. or 24. in the References section
-    text = re.sub(r"^(\d{1,2})\.", r'<a id="ref\1"></a>\1.', text, flags=re.MULTILINE)
-    return text
+# Load Reports (precompiled into slides by scripts/build_reports.py)
+REPORT_SECTIONS = load_report_sections()
 
 
 def parse_report(path, lang):
-    # Check both current working directory and relative to this file's location
-    # (to support running from root or from src/)
-    possible_paths = [
-        os.path.join(os.getcwd(), path),
-        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path),
-    ]
-
-    final_path = None
-    for p in possible_paths:
-        if os.path.exists(p):
-            final_path = p
-            break
-
-    if not final_path:
-        print(f"Warning: Report not found at {path} in any of {possible_paths}")
-        return
-
-    with open(final_path, "r") as f:
-        content = f.read()
-        sections = re.split(r"\n(?=## \*\*)", content)
-        intro_parts = []
-        cluster_start_idx = -1
-        for idx, s in enumerate(sections):
-            if "## **Cluster 1:" in s:
-                cluster_start_idx = idx
-                break
-            intro_parts.append(s)
-
-        REPORT_SECTIONS[lang]["intro"] = process_citations(
-            "\n\n".join(intro_parts).strip()
-        )
-
-        if cluster_start_idx != -1:
-            synthesis_parts = []
-            for s in sections[cluster_start_idx:]:
-                if "## **Cluster" in s:
-                    REPORT_SECTIONS[lang]["clusters"].append(
-                        process_citations(s.strip())
-                    )
-                else:
-                    synthesis_parts.append(s.strip())
-
-            if synthesis_parts:
-                REPORT_SECTIONS[lang]["synthesis"] = process_citations(
-                    "\n\n".join(synthesis_parts).strip()
-                )
+    """Compiles a Markdown report into REPORT_SECTIONS[lang] (skips the artifact)."""
+    sections = compile_report_file(path)
+    if sections is not None:
+        REPORT_SECTIONS[lang] = sections
 
 
-parse_report("reports/cluster_analysis_report.md", "en")
-parse_report("reports/cluster_analysis_report_es.md", "es")
+startup_profile.mark("reports")
 
 # --- Initialize Agent & Guardrails ---
-agent_dfs = {
-    "net_salaries": df_net_salary,
-    "inflation_ipc": df_ipc,
-    "poverty_lines": df_cba_cbt,
-    "anomalies": df_anomalies,
-}
+# The chat stack (langchain, litellm) is imported and built on the first chat
+# request, keeping it out of the cold start. Set CHAT_PREWARM=1 to build it on a
+# background thread right after startup instead.
 model_params = {
     "model": os.getenv("AGENT_MODEL", "openai/gpt-4o-mini"),
     "temperature": 0.2,
-    "num_retries": 3,
+    # Each retry can take up to AGENT_LLM_TIMEOUT_S (see AgentBudget)
+    "num_retries": int(os.getenv("AGENT_LLM_RETRIES", "1")),
 }
 guardrail_model = os.getenv("GUARDRAIL_MODEL", "openai/gpt-4.1-nano")
-journalist_agent = DataJournalistAgent(agent_dfs, model_params=model_params)
-validator = InputValidator(relevance_model=guardrail_model)
+chat_service = ChatService(
+    data_store, model_params=model_params, guardrail_model=guardrail_model
+)
+
+data_store.add_listener(chat_service.on_snapshot)
+# Executive summaries are rendered once per data version and language, on the
+# first download or right after a refresh
+summary_store = SummaryStore(data_store)
+data_store.add_listener(summary_store.on_snapshot)
+# CHAT_ASYNC=1: agent runs go to a worker pool and the chat UI polls for them
+chat_jobs = JobQueue.from_env() if os.getenv("CHAT_ASYNC") == "1" else None
+data_store.start()
+if os.getenv("CHAT_PREWARM", "0") == "1":
+    chat_service.prewarm()
+startup_profile.mark("chat")
 
 # --- Translations ---
 TRANSLATIONS = {
@@ -425,363 +383,375 @@ app = Dash(
 )
 server = app.server
 handler = make_lambda_handler(server)
+startup_profile.mark("app")
 
 # --- Layout ---
-app.layout = dbc.Container(
-    [
-        dcc.Store(id="lang-store", data="es"),
-        create_chat_interface(),  # AI Chat Interface
-        dbc.Row(
-            [
-                dbc.Col(
-                    [
-                        dbc.Button(
-                            "?",
-                            id="open-offcanvas",
-                            n_clicks=0,
-                            color="info",
-                            outline=True,
-                            size="sm",
-                            className="mt-4",
-                        )
-                    ],
-                    width=1,
-                    className="text-start",
-                ),
-                dbc.Col(
-                    [html.H1(id="app-title", className="text-center mt-4")], width=10
-                ),
-                dbc.Col(
-                    [
-                        html.Div(
-                            [
-                                dbc.Button(
-                                    "ES",
-                                    id="btn-es",
-                                    size="sm",
-                                    color="primary",
-                                    outline=True,
-                                    className="me-1",
-                                ),
-                                dbc.Button(
-                                    "EN",
-                                    id="btn-en",
-                                    size="sm",
-                                    color="primary",
-                                    outline=True,
-                                ),
-                            ],
-                            className="text-end mt-4",
-                        )
-                    ],
-                    width=1,
-                    className="text-end",
-                ),
-            ],
-            align="center",
-            className="mb-4",
-        ),
-        dbc.Offcanvas(
-            id="offcanvas-usage",
-            is_open=False,
-        ),
-        dbc.Row(
-            [
-                # Sidebar/Controls
-                dbc.Col(
-                    [
-                        dbc.Card(
-                            [
-                                dbc.CardHeader(
-                                    id="sidebar-header", className="fw-bold"
-                                ),
-                                dbc.CardBody(
-                                    [
-                                        html.Label(
-                                            id="label-province", className="mt-2"
-                                        ),
-                                        dcc.Dropdown(
-                                            id="province-dropdown",
-                                            options=[
-                                                {"label": col, "value": col}
-                                                for col in df_net_salary.columns
-                                            ],
-                                            value="Chaco",
-                                            clearable=False,
-                                            className="mb-3",
-                                        ),
-                                        html.Label(id="label-salary-type"),
-                                        dcc.RadioItems(
-                                            id="salary-type-radio",
-                                            options=[],  # Loaded via callback
-                                            value="net",
-                                            inline=True,
-                                            className="mb-3",
-                                            inputStyle={
-                                                "margin-right": "5px",
-                                                "margin-left": "15px",
-                                            },
-                                        ),
-                                        html.Label(id="label-adjustment"),
-                                        dbc.Checklist(
-                                            id="adjustment-toggle",
-                                            options=[],  # Loaded via callback
-                                            value=["real", "cbt"],
-                                            switch=True,
-                                            className="mb-3",
-                                        ),
-                                        html.Label(id="label-ref-line"),
-                                        dcc.Dropdown(
-                                            id="ref-line-dropdown",
-                                            options=[],  # Loaded via callback
-                                            value="linea_pobreza",
-                                            clearable=False,
-                                            className="mb-3",
-                                        ),
-                                        html.Label(id="label-infl-cat"),
-                                        dcc.Dropdown(
-                                            id="inflation-category-dropdown",
-                                            options=[
-                                                {
-                                                    "label": col.replace(
-                                                        "infl_", ""
-                                                    ).replace("_", " "),
-                                                    "value": col,
-                                                }
-                                                for col in df_ipc.columns
-                                            ],
-                                            value="infl_Nivel_general",
-                                            clearable=False,
-                                            className="mb-3",
-                                        ),
-                                        html.Label(id="label-base-date"),
-                                        dcc.Dropdown(
-                                            id="base-date-dropdown",
-                                            options=[
-                                                {
-                                                    "label": d.strftime("%Y-%m"),
-                                                    "value": d.strftime("%Y-%m-%d"),
-                                                }
-                                                for d in df_ipc.index
-                                            ],
-                                            value=df_net_salary.index[-1].strftime(
-                                                "%Y-%m-%d"
+def build_layout(df_net_salary, df_ipc):
+    """The dashboard layout, with filter options and defaults taken from the given frames."""
+    return dbc.Container(
+        [
+            dcc.Store(id="lang-store", data="es"),
+            create_chat_interface(),  # AI Chat Interface
+            dbc.Row(
+                [
+                    dbc.Col(
+                        [
+                            dbc.Button(
+                                "?",
+                                id="open-offcanvas",
+                                n_clicks=0,
+                                color="info",
+                                outline=True,
+                                size="sm",
+                                className="mt-4",
+                            )
+                        ],
+                        width=1,
+                        className="text-start",
+                    ),
+                    dbc.Col(
+                        [html.H1(id="app-title", className="text-center mt-4")], width=10
+                    ),
+                    dbc.Col(
+                        [
+                            html.Div(
+                                [
+                                    dbc.Button(
+                                        "ES",
+                                        id="btn-es",
+                                        size="sm",
+                                        color="primary",
+                                        outline=True,
+                                        className="me-1",
+                                    ),
+                                    dbc.Button(
+                                        "EN",
+                                        id="btn-en",
+                                        size="sm",
+                                        color="primary",
+                                        outline=True,
+                                    ),
+                                ],
+                                className="text-end mt-4",
+                            )
+                        ],
+                        width=1,
+                        className="text-end",
+                    ),
+                ],
+                align="center",
+                className="mb-4",
+            ),
+            dbc.Offcanvas(
+                id="offcanvas-usage",
+                is_open=False,
+            ),
+            dbc.Row(
+                [
+                    # Sidebar/Controls
+                    dbc.Col(
+                        [
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(
+                                        id="sidebar-header", className="fw-bold"
+                                    ),
+                                    dbc.CardBody(
+                                        [
+                                            html.Label(
+                                                id="label-province", className="mt-2"
                                             ),
-                                            clearable=False,
-                                            className="mb-3",
-                                        ),
-                                        html.Label(id="label-date-range"),
-                                        dcc.DatePickerRange(
-                                            id="date-picker-range",
-                                            min_date_allowed=df_net_salary.index[0],
-                                            max_date_allowed=df_net_salary.index[-1],
-                                            start_date=df_net_salary.index[
-                                                0
-                                            ],  # Dec 2016
-                                            end_date=df_net_salary.index[-1],
-                                            display_format="YYYY-MM",
-                                            className="mb-3",
-                                        ),
-                                    ]
-                                ),
-                            ],
-                            className="shadow-sm mb-4",
-                        )
-                    ],
-                    width=12,
-                    lg=3,
-                ),
-                # Main Content
-                dbc.Col(
-                    [
-                        dbc.Tabs(
-                            [
-                                dbc.Tab(
-                                    label="Dashboard",
-                                    tab_id="tab-general",
-                                    id="tab-general",
-                                    children=[
-                                        # KPIs Row
-                                        dbc.Row(
-                                            [
-                                                dbc.Col(
-                                                    id="kpi-latest", width=12, md=3
-                                                ),
-                                                dbc.Col(
-                                                    id="kpi-quarterly", width=12, md=3
-                                                ),
-                                                dbc.Col(
-                                                    id="kpi-annual", width=12, md=3
-                                                ),
-                                                dbc.Col(
-                                                    id="kpi-interannual", width=12, md=3
-                                                ),
-                                            ],
-                                            className="mt-3 mb-4",
-                                        ),
-                                        # Charts Row
-                                        dbc.Row(
-                                            [
-                                                dbc.Col(
-                                                    [
-                                                        dbc.Card(
-                                                            [
-                                                                dbc.CardHeader(
-                                                                    id="trend-header",
-                                                                    className="fw-bold",
-                                                                ),
-                                                                dbc.CardBody(
-                                                                    dcc.Graph(
-                                                                        id="historical-trend-chart",
-                                                                        config={
-                                                                            "displayModeBar": False
-                                                                        },
-                                                                    )
-                                                                ),
-                                                            ],
-                                                            className="shadow-sm mb-4",
-                                                        )
-                                                    ],
-                                                    width=12,
+                                            dcc.Dropdown(
+                                                id="province-dropdown",
+                                                options=[
+                                                    {"label": col, "value": col}
+                                                    for col in df_net_salary.columns
+                                                ],
+                                                value="Chaco",
+                                                clearable=False,
+                                                className="mb-3",
+                                            ),
+                                            html.Label(id="label-salary-type"),
+                                            dcc.RadioItems(
+                                                id="salary-type-radio",
+                                                options=[],  # Loaded via callback
+                                                value="net",
+                                                inline=True,
+                                                className="mb-3",
+                                                inputStyle={
+                                                    "margin-right": "5px",
+                                                    "margin-left": "15px",
+                                                },
+                                            ),
+                                            html.Label(id="label-adjustment"),
+                                            dbc.Checklist(
+                                                id="adjustment-toggle",
+                                                options=[],  # Loaded via callback
+                                                value=["real", "cbt"],
+                                                switch=True,
+                                                className="mb-3",
+                                            ),
+                                            html.Label(id="label-ref-line"),
+                                            dcc.Dropdown(
+                                                id="ref-line-dropdown",
+                                                options=[],  # Loaded via callback
+                                                value="linea_pobreza",
+                                                clearable=False,
+                                                className="mb-3",
+                                            ),
+                                            html.Label(id="label-infl-cat"),
+                                            dcc.Dropdown(
+                                                id="inflation-category-dropdown",
+                                                options=[
+                                                    {
+                                                        "label": col.replace(
+                                                            "infl_", ""
+                                                        ).replace("_", " "),
+                                                        "value": col,
+                                                    }
+                                                    for col in df_ipc.columns
+                                                ],
+                                                value="infl_Nivel_general",
+                                                clearable=False,
+                                                className="mb-3",
+                                            ),
+                                            html.Label(id="label-base-date"),
+                                            dcc.Dropdown(
+                                                id="base-date-dropdown",
+                                                options=[
+                                                    {
+                                                        "label": d.strftime("%Y-%m"),
+                                                        "value": d.strftime("%Y-%m-%d"),
+                                                    }
+                                                    for d in df_ipc.index
+                                                ],
+                                                value=df_net_salary.index[-1].strftime(
+                                                    "%Y-%m-%d"
                                                 ),
-                                            ]
-                                        ),
-                                        dbc.Row(
-                                            [
-                                                dbc.Col(
-                                                    [
-                                                        dbc.Card(
-                                                            [
-                                                                dbc.CardHeader(
-                                                                    [
-                                                                        dbc.Row(
-                                                                            [
-                                                                                dbc.Col(
-                                                                                    id="comparison-header",
-                                                                                    className="fw-bold",
-                                                                                    width=8,
-                                                                                ),
-                                                                                dbc.Col(
-                                                                                    dcc.Dropdown(
-                                                                                        id="comparison-month-dropdown",
-                                                                                        options=[
-                                                                                            {
-                                                                                                "label": d.strftime(
-                                                                                                    "%Y-%m"
-                                                                                                ),
-                                                                                                "value": i,
-                                                                                            }
-                                                                                            for i, d in enumerate(
+                                                clearable=False,
+                                                className="mb-3",
+                                            ),
+                                            html.Label(id="label-date-range"),
+                                            dcc.DatePickerRange(
+                                                id="date-picker-range",
+                                                min_date_allowed=df_net_salary.index[0],
+                                                max_date_allowed=df_net_salary.index[-1],
+                                                start_date=df_net_salary.index[
+                                                    0
+                                                ],  # Dec 2016
+                                                end_date=df_net_salary.index[-1],
+                                                display_format="YYYY-MM",
+                                                className="mb-3",
+                                            ),
+                                        ]
+                                    ),
+                                ],
+                                className="shadow-sm mb-4",
+                            )
+                        ],
+                        width=12,
+                        lg=3,
+                    ),
+                    # Main Content
+                    dbc.Col(
+                        [
+                            dbc.Tabs(
+                                [
+                                    dbc.Tab(
+                                        label="Dashboard",
+                                        tab_id="tab-general",
+                                        id="tab-general",
+                                        children=[
+                                            # KPIs Row
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        id="kpi-latest", width=12, md=3
+                                                    ),
+                                                    dbc.Col(
+                                                        id="kpi-quarterly", width=12, md=3
+                                                    ),
+                                                    dbc.Col(
+                                                        id="kpi-annual", width=12, md=3
+                                                    ),
+                                                    dbc.Col(
+                                                        id="kpi-interannual", width=12, md=3
+                                                    ),
+                                                ],
+                                                className="mt-3 mb-4",
+                                            ),
+                                            # Charts Row
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        id="trend-header",
+                                                                        className="fw-bold",
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        dcc.Graph(
+                                                                            id="historical-trend-chart",
+                                                                            config={
+                                                                                "displayModeBar": False
+                                                                            },
+                                                                        )
+                                                                    ),
+                                                                ],
+                                                                className="shadow-sm mb-4",
+                                                            )
+                                                        ],
+                                                        width=12,
+                                                    ),
+                                                ]
+                                            ),
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        [
+                                                                            dbc.Row(
+                                                                                [
+                                                                                    dbc.Col(
+                                                                                        id="comparison-header",
+                                                                                        className="fw-bold",
+                                                                                        width=8,
+                                                                                    ),
+                                                                                    dbc.Col(
+                                                                                        dcc.Dropdown(
+                                                                                            id="comparison-month-dropdown",
+                                                                                            options=[
+                                                                                                {
+                                                                                                    "label": d.strftime(
+                                                                                                        "%Y-%m"
+                                                                                                    ),
+                                                                                                    "value": i,
+                                                                                                }
+                                                                                                for i, d in enumerate(
+                                                                                                    df_net_salary.index
+                                                                                                )
+                                                                                            ],
+                                                                                            value=len(
                                                                                                 df_net_salary.index
                                                                                             )
-                                                                                        ],
-                                                                                        value=len(
-                                                                                            df_net_salary.index
-                                                                                        )
-                                                                                        - 1,
-                                                                                        clearable=False,
-                                                                                        style={
-                                                                                            "fontSize": "0.9rem"
-                                                                                        },
+                                                                                            - 1,
+                                                                                            clearable=False,
+                                                                                            style={
+                                                                                                "fontSize": "0.9rem"
+                                                                                            },
+                                                                                        ),
+                                                                                        width=4,
                                                                                     ),
-                                                                                    width=4,
-                                                                                ),
-                                                                            ],
-                                                                            align="center",
-                                                                        )
-                                                                    ]
-                                                                ),
-                                                                dbc.CardBody(
-                                                                    dcc.Graph(
-                                                                        id="provincial-comparison-chart",
-                                                                        config={
-                                                                            "displayModeBar": False
-                                                                        },
-                                                                        style={
-                                                                            "height": "600px"
-                                                                        },
-                                                                    )
-                                                                ),
-                                                            ],
-                                                            className="shadow-sm mb-4",
-                                                        )
-                                                    ],
-                                                    width=12,
-                                                ),
-                                            ]
-                                        ),
-                                    ],
-                                ),
-                                dbc.Tab(
-                                    label="Analytics",
-                                    tab_id="tab-analytics",
-                                    id="tab-analytics",
-                                    children=[
-                                        dcc.Store(
-                                            id="analytics-carousel-index", data=0
-                                        ),
-                                        dbc.Row(
-                                            [
-                                                dbc.Col(
-                                                    [
-                                                        html.Div(
-                                                            id="analytics-report-container",
-                                                            className="mt-3",
-                                                        ),
-                                                        html.Div(
-                                                            [
-                                                                dbc.ButtonGroup(
-                                                                    [
-                                                                        dbc.Button(
-                                                                            "←",
-                                                                            id="analytics-prev",
-                                                                            color="secondary",
-                                                                            outline=True,
-                                                                            size="sm",
-                                                                        ),
-                                                                        dbc.Button(
-                                                                            id="analytics-progress",
-                                                                            color="secondary",
-                                                                            outline=True,
-                                                                            size="sm",
-                                                                            disabled=True,
+                                                                                ],
+                                                                                align="center",
+                                                                            )
+                                                                        ]
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        dcc.Graph(
+                                                                            id="provincial-comparison-chart",
+                                                                            config={
+                                                                                "displayModeBar": False
+                                                                            },
                                                                             style={
-                                                                                "minWidth": "100px"
+                                                                                "height": "600px"
                                                                             },
-                                                                        ),
-                                                                        dbc.Button(
-                                                                            "→",
-                                                                            id="analytics-next",
-                                                                            color="secondary",
-                                                                            outline=True,
-                                                                            size="sm",
-                                                                        ),
-                                                                    ],
-                                                                    className="shadow-sm",
-                                                                )
-                                                            ],
-                                                            className="d-flex justify-content-center mt-3 mb-5",
-                                                        ),
-                                                    ],
-                                                    width=12,
-                                                )
-                                            ]
-                                        ),
-                                    ],
-                                ),
-                            ],
-                            id="main-tabs",
-                            active_tab="tab-general",
-                        )
-                    ],
-                    width=12,
-                    lg=9,
-                ),
-            ]
-        ),
-    ],
-    fluid=True,
-)
+                                                                        )
+                                                                    ),
+                                                                ],
+                                                                className="shadow-sm mb-4",
+                                                            )
+                                                        ],
+                                                        width=12,
+                                                    ),
+                                                ]
+                                            ),
+                                        ],
+                                    ),
+                                    dbc.Tab(
+                                        label="Analytics",
+                                        tab_id="tab-analytics",
+                                        id="tab-analytics",
+                                        children=[
+                                            dcc.Store(
+                                                id="analytics-carousel-index", data=0
+                                            ),
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        [
+                                                            html.Div(
+                                                                id="analytics-report-container",
+                                                                className="mt-3",
+                                                            ),
+                                                            html.Div(
+                                                                [
+                                                                    dbc.ButtonGroup(
+                                                                        [
+                                                                            dbc.Button(
+                                                                                "←",
+                                                                                id="analytics-prev",
+                                                                                color="secondary",
+                                                                                outline=True,
+                                                                                size="sm",
+                                                                            ),
+                                                                            dbc.Button(
+                                                                                id="analytics-progress",
+                                                                                color="secondary",
+                                                                                outline=True,
+                                                                                size="sm",
+                                                                                disabled=True,
+                                                                                style={
+                                                                                    "minWidth": "100px"
+                                                                                },
+                                                                            ),
+                                                                            dbc.Button(
+                                                                                "→",
+                                                                                id="analytics-next",
+                                                                                color="secondary",
+                                                                                outline=True,
+                                                                                size="sm",
+                                                                            ),
+                                                                        ],
+                                                                        className="shadow-sm",
+                                                                    )
+                                                                ],
+                                                                className="d-flex justify-content-center mt-3 mb-5",
+                                                            ),
+                                                        ],
+                                                        width=12,
+                                                    )
+                                                ]
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                                id="main-tabs",
+                                active_tab="tab-general",
+                            )
+                        ],
+                        width=12,
+                        lg=9,
+                    ),
+                ]
+            ),
+        ],
+        fluid=True,
+    )
+
+
+def serve_layout():
+    """Builds the layout from the current snapshot so new data reaches new page loads."""
+    snap = data_store.current()
+    return build_layout(snap.net_salary, snap.ipc)
+
+
+app.layout = serve_layout
 
 
 # --- Callbacks ---
@@ -925,6 +895,17 @@ def update_dashboard(
 ):
     t = TRANSLATIONS[lang]
 
+    # Read one snapshot for the whole request
+    snap = data_store.current()
+    df_net_salary = snap.net_salary
+    df_gross_salary = snap.gross_salary
+    df_basic_salary = snap.basic_salary
+    df_ipc = snap.ipc
+    df_cba_cbt = snap.cba_cbt
+    df_clusters = snap.clusters
+    df_anomalies = snap.anomalies
+    HAS_ANALYTICS = snap.has_analytics
+
     # 0. Guards for None values
     if any(
         v is None
@@ -1253,21 +1234,17 @@ def update_dashboard(
             )
 
         # Slides 1-6: Clusters
-        for i, section_text in enumerate(lang_report["clusters"]):
-            title_match = re.search(r"## \*\*Cluster \d: (.*?)\*\*", section_text)
+        for i, section in enumerate(lang_report["clusters"]):
             display_idx = i + 1
-            if title_match:
-                card_title = f"Cluster {display_idx}: {title_match.group(1)}"
-                body_text = re.sub(
-                    r"## \*\*Cluster \d:.*?\*\*", "", section_text
-                ).strip()
+            if section["title"]:
+                card_title = f"Cluster {display_idx}: {section['title']}"
             else:
                 card_title = (
                     f"Deep Dive: Cluster {display_idx}"
                     if lang == "en"
                     else f"Análisis: Cluster {display_idx}"
                 )
-                body_text = section_text
+            body_text = section["body"]
 
             df_cls = df_long_c[df_long_c["cluster"] == str(i)]
 
@@ -1349,31 +1326,17 @@ def update_dashboard(
             )
 
         # Final Slide: Synthesis
-        if lang_report["synthesis"]:
-            s_text = lang_report["synthesis"]
-            s_title_match = re.search(
-                r"## \*\*Synthesis and Future Outlook: (.*?)\*\*", s_text
-            )
-            if not s_title_match:
-                # Try Spanish header
-                s_title_match = re.search(
-                    r"## \*\*Síntesis y Perspectivas Futuras: (.*?)\*\*", s_text
-                )
-
-            if s_title_match:
-                s_card_title = f"{'Synthesis' if lang == 'en' else 'Síntesis'}: {s_title_match.group(1)}"
-                s_body_text = re.sub(
-                    r"## \*\*(Synthesis and Future Outlook|Síntesis y Perspectivas Futuras):.*?\*\*",
-                    "",
-                    s_text,
-                ).strip()
+        synthesis = lang_report["synthesis"]
+        if synthesis["body"]:
+            if synthesis["title"]:
+                s_card_title = f"{'Synthesis' if lang == 'en' else 'Síntesis'}: {synthesis['title']}"
             else:
                 s_card_title = (
                     "Synthesis & Future Outlook"
                     if lang == "en"
                     else "Síntesis y Perspectivas Futuras"
                 )
-                s_body_text = s_text
+            s_body_text = synthesis["body"]
 
             all_slides.append(
                 dbc.Card(
@@ -1460,11 +1423,16 @@ app.clientside_callback(
 
 
 # STAGE 2: Agent Processing (Server-side)
+# With CHAT_ASYNC=1 the agent runs on a worker pool: this callback only submits
+# the job, and STAGE 2b polls for the answer, so slow LLM calls never hold a
+# request worker.
 @app.callback(
     Output("chat-history-store", "data"),
     Output("pending-query-store", "data", allow_duplicate=True),
     Output("chat-input", "disabled", allow_duplicate=True),
     Output("send-chat", "disabled", allow_duplicate=True),
+    Output("chat-job-store", "data"),
+    Output("chat-poll", "disabled"),
     Input("pending-query-store", "data"),
     State("chat-history-store", "data"),
     State("province-dropdown", "value"),
@@ -1476,37 +1444,69 @@ app.clientside_callback(
 )
 def run_agent_process(query, history, province, s_type, start, end, lang):
     if query is None:
-        return no_update, no_update, False, False
-
-    # --- Guardrail Check ---
-    is_valid, error_msg = validator.validate(query)
-    if not is_valid:
-        if history and history[-1]["content"] == "_THINKING_":
-            history[-1]["content"] = error_msg
-        return history, None, False, False
+        return no_update, no_update, False, False, no_update, no_update
 
-    # --- Agent Execution ---
     context = {
         "selected_province": province,
         "salary_type": s_type,
         "visible_date_range": f"{start} to {end}",
         "language_preference": lang,
     }
+    # History excluding the _THINKING_ placeholder
+    previous = history[:-1]
 
-    try:
-        # History excluding the _THINKING_ placeholder
-        response = journalist_agent.query(
-            query, context_metadata=context, chat_history=history[:-1]
+    if chat_jobs is not None:
+        job_id = chat_jobs.submit_stream(
+            chat_service.stream_answer, query, context, previous
         )
-        ans = response.get("output", "I'm sorry, I couldn't process that.")
-    except Exception as e:
-        ans = f"Error: {str(e)}"
+        # Inputs stay disabled until the poll delivers the answer
+        return no_update, None, True, True, job_id, False
 
+    ans = chat_service.answer(query, context, previous)
     if history and history[-1]["content"] == "_THINKING_":
         history[-1]["content"] = ans
 
     # Return updated history, clear pending query, and RE-ENABLE inputs
-    return history, None, False, False
+    return history, None, False, False, no_update, no_update
+
+
+# STAGE 2b: Poll for async answers (CHAT_ASYNC=1), showing tools and streamed
+# text of the answer in progress
+@app.callback(
+    Output("chat-history-store", "data", allow_duplicate=True),
+    Output("chat-input", "disabled", allow_duplicate=True),
+    Output("send-chat", "disabled", allow_duplicate=True),
+    Output("chat-job-store", "data", allow_duplicate=True),
+    Output("chat-poll", "disabled", allow_duplicate=True),
+    Input("chat-poll", "n_intervals"),
+    State("chat-job-store", "data"),
+    State("chat-history-store", "data"),
+    prevent_initial_call=True,
+)
+def poll_agent_job(n_intervals, job_id, history):
+    if not job_id or chat_jobs is None:
+        return no_update, no_update, no_update, None, True
+
+    status = chat_jobs.status(job_id)
+    if status["state"] == "pending":
+        partial = status.get("partial")
+        if partial is None or not history or history[-1].get("stream") == partial:
+            return no_update, no_update, no_update, no_update, no_update
+        history[-1]["stream"] = partial
+        return history, no_update, no_update, no_update, no_update
+
+    if status["state"] == "done":
+        ans = status["result"]
+    elif status["state"] == "error":
+        ans = f"Error: {status['error']}"
+    else:
+        ans = "Error: the request expired. Please ask again."
+    chat_jobs.discard(job_id)
+
+    if history and history[-1]["content"] == "_THINKING_":
+        history[-1]["content"] = ans
+        history[-1].pop("stream", None)
+    return history, False, False, None, True
 
 
 # STAGE 3: Render UI
@@ -1528,11 +1528,14 @@ def render_chat(history):
 )
 def download_summary(n_clicks, lang):
     if n_clicks:
-        summary_md = journalist_agent.generate_executive_summary(lang=lang)
+        summary_md = summary_store.get(lang)
         filename = f"executive_summary_{datetime.now().strftime('%Y%m%d')}.md"
         return dcc.send_string(summary_md, filename)
     return no_update
 
 
+startup_profile.mark("callbacks")
+startup_profile.report()
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8050, debug=True)
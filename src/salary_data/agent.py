@@ -3,14 +3,25 @@ from langchain_litellm import ChatLiteLLM
 from langchain_ollama import ChatOllama
 from langchain_aws import ChatBedrock
 from langchain_core.tools import tool
-from salary_data.scraper import Scraper
+from langchain_core.callbacks import BaseCallbackHandler, UsageMetadataCallbackHandler
+from salary_data.tools import SalaryTools, prepare_frames
+from salary_data.summary import render_executive_summary
+from salary_data.response_cache import RESPONSE_CACHE, prior_turns, response_key
+from salary_data.router import IntentRouter
+from salary_data.prompts import prompt_mode, query_input, system_prompt
+from salary_data.telemetry import RequestTelemetry
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Iterator, Optional
+from concurrent.futures import Future
 from langchain_core.exceptions import OutputParserException
 import pandas as pd
+import os
 import re
+import copy
+import time
+import queue
+import threading
 
-import json
 
 # --- Tool Input Schemas ---
 
@@ -51,55 +62,168 @@ class InflationChangeInput(BaseModel):
     end_date: str = Field(description="End date in YYYY-MM-DD format")
 
 
-def _parse_input(input_val: any, target_key: str) -> any:
-    """Helper to handle cases where LLM passes a JSON string instead of unpacked args."""
-    if isinstance(input_val, str):
-        cleaned = input_val.strip(" '\"[]")
-        if cleaned.startswith("{") and cleaned.endswith("}"):
-            try:
-                data = json.loads(cleaned)
-                return data.get(target_key, cleaned)
-            except Exception:
-                return cleaned
-    return input_val
+class _StreamHandler(BaseCallbackHandler):
+    """Forwards tool starts and LLM tokens of an agent run to a queue."""
+
+    def __init__(self, events: "queue.Queue[dict]"):
+        self.events = events
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name", "tool")
+        self.events.put({"type": "tool", "name": name, "input": input_str})
+
+    def on_llm_new_token(self, token, **kwargs):
+        if token:
+            self.events.put({"type": "token", "text": token})
+
+
+class _ToolResults(BaseCallbackHandler):
+    """Keeps the tool outputs of a run, for partial answers."""
+
+    def __init__(self):
+        self.outputs = []
+
+    def on_tool_end(self, output, **kwargs):
+        self.outputs.append(str(getattr(output, "content", output)))
+
+
+class RunCancelled(Exception):
+    """Raised by a `RunGate` to stop an agent run whose request was rejected."""
+
+
+class RunGate(BaseCallbackHandler):
+    """
+    Stops a speculative agent run if the guardrail verdict it was started
+    ahead of comes back negative. `verdict` is a Future of (is_valid, message).
+    The gate checks the verdict without waiting at every LLM call and tool
+    start. It waits for the verdict before the final answer is returned or
+    cached. A guardrail that fails or takes longer than `timeout` lets the run
+    through, like the validator's own ERROR_FALLBACK.
+    """
+
+    raise_error = True
+
+    def __init__(self, verdict: Future, timeout: float = 30.0):
+        self.verdict = verdict
+        self.timeout = timeout
+
+    def rejected(self, wait: bool = False) -> bool:
+        if not wait and not self.verdict.done():
+            return False
+        try:
+            return not self.verdict.result(timeout=self.timeout)[0]
+        except Exception:
+            return False
+
+    def _check(self, wait: bool = False):
+        if self.rejected(wait):
+            raise RunCancelled("The guardrail rejected the request")
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._check()
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._check()
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self._check()
+
+    def on_agent_finish(self, finish, **kwargs):
+        self._check(wait=True)
+
+
+class AgentBudget:
+    """
+    Iteration and time limits for one agent run. The deadline is checked
+    between agent steps, and each LLM call is capped by `llm_timeout_s`, so a
+    run ends within about `deadline_s + llm_timeout_s` (times the provider
+    retries) instead of holding a worker indefinitely.
+    """
+
+    def __init__(
+        self, max_iterations: int = 8, deadline_s: float = 30.0, llm_timeout_s: float = 15.0
+    ):
+        self.max_iterations = max_iterations
+        self.deadline_s = deadline_s
+        self.llm_timeout_s = llm_timeout_s
+
+    @classmethod
+    def from_env(cls) -> "AgentBudget":
+        return cls(
+            max_iterations=int(os.getenv("AGENT_MAX_ITERATIONS", "8")),
+            deadline_s=float(os.getenv("AGENT_DEADLINE_S", "30")),
+            llm_timeout_s=float(os.getenv("AGENT_LLM_TIMEOUT_S", "15")),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "max_iterations": self.max_iterations,
+            "deadline_s": self.deadline_s,
+            "llm_timeout_s": self.llm_timeout_s,
+        }
+
+
+# How AgentExecutor's output starts when it hits max_iterations or max_execution_time
+STOPPED_PREFIX = "Agent stopped due to"
+
+PARTIAL_ANSWER = {
+    "es": "No pude completar el análisis en el tiempo disponible.",
+    "en": "I couldn't complete the analysis in the time available.",
+}
+PARTIAL_FOUND = {
+    "es": "Esto es lo que encontré hasta ahora:",
+    "en": "This is what I found so far:",
+}
+PARTIAL_RETRY = {
+    "es": "Probá con una pregunta más específica (una provincia, un período).",
+    "en": "Try a more specific question (one province, one period).",
+}
 
 
 class DataJournalistAgent:
-    def __init__(self, dfs_dict: dict[str, pd.DataFrame], model_params=None):
+    def __init__(
+        self,
+        dfs_dict: dict[str, pd.DataFrame],
+        model_params=None,
+        data_version: Optional[str] = None,
+        response_cache=None,
+        budget: Optional[AgentBudget] = None,
+    ):
         self.model_params = model_params or {
             "model": "ollama/llama3.1:8b",
             "base_url": "http://localhost:11434",
             "temperature": 0,
         }
+        self.budget = budget or AgentBudget.from_env()
         self.dfs_dict = self._prepare_data(dfs_dict)
+        # Tool results are memoized per data version (see salary_data/tools.py)
+        self.tools = SalaryTools(self.dfs_dict, data_version=data_version)
+        # Final answers are cached too, so repeated questions skip the LLM
+        self.response_cache = RESPONSE_CACHE if response_cache is None else response_cache
+        # Single-tool questions are answered by rules, without the LLM
+        self.router = (
+            IntentRouter(self.tools) if os.getenv("AGENT_ROUTER", "1") == "1" else None
+        )
         self.agent = self._setup_agent()
 
-    def _prepare_data(self, dfs_dict):
-        scraper = Scraper()
-        df_net = dfs_dict.get("net_salaries")
-        df_ipc = dfs_dict.get("inflation_ipc")
-        df_poverty = dfs_dict.get("poverty_lines")
-        df_anomalies = dfs_dict.get("anomalies")
-
-        common_index = df_net.index.intersection(df_ipc.index)
-        df_net = df_net.loc[common_index]
-        df_ipc = df_ipc.loc[common_index]
-        df_poverty = df_poverty.loc[common_index]
-
-        start_limit = df_net.index.min()
-        df_real = scraper.calculate_real_salary(
-            df_net, df_ipc["infl_Nivel_general"], base_date=start_limit
-        )
+    def clone(self) -> "DataJournalistAgent":
+        """A new executor sharing this agent's frames, tools, router and caches."""
+        twin = copy.copy(self)
+        twin.agent = twin._setup_agent()
+        return twin
 
-        return {
-            "nominal_salaries": df_net,
-            "real_salaries": df_real,
-            "inflation_ipc": df_ipc,
-            "poverty_lines": df_poverty,
-            "anomalies": df_anomalies,
-        }
+    def tool_cache_stats(self) -> dict:
+        """Hit/miss counts of the shared tool cache, overall and per tool."""
+        return self.tools.stats()
 
-    def _setup_agent(self):
+    def province_stats(self) -> dict:
+        """How tool province arguments were resolved; `retries_saved` counts alias and fuzzy hits."""
+        return self.tools.provinces.stats()
+
+    def _prepare_data(self, dfs_dict):
+        return prepare_frames(dfs_dict)
+
+    def _make_llm(self):
         model_name = self.model_params.get("model", "")
         if model_name.startswith("ollama/"):
             clean_name = model_name.replace("ollama/", "")
@@ -107,39 +231,43 @@ class DataJournalistAgent:
                 model=clean_name,
                 base_url=self.model_params.get("base_url", "http://localhost:11434"),
                 temperature=self.model_params.get("temperature", 0),
+                client_kwargs={"timeout": self.budget.llm_timeout_s},
             )
         elif model_name.startswith("bedrock/"):
             clean_name = model_name.replace("bedrock/", "")
+            from botocore.config import Config
+
             llm = ChatBedrock(
                 model_id=clean_name,
                 model_kwargs={"temperature": self.model_params.get("temperature", 0)},
+                config=Config(read_timeout=self.budget.llm_timeout_s),
+            )
+        elif model_name.startswith("fake/"):
+            # Offline scripted backend for tests and benchmarks (salary_data/fake_llm.py)
+            from salary_data.fake_llm import FixtureChatModel
+
+            llm = FixtureChatModel.from_fixture(
+                model_name.replace("fake/", "", 1),
+                first_token_delay=self.model_params.get("first_token_delay", 0.0),
+                token_delay=self.model_params.get("token_delay", 0.0),
+                timeout=self.budget.llm_timeout_s,
             )
         else:
-            llm = ChatLiteLLM(**self.model_params)
+            llm = ChatLiteLLM(
+                **{"request_timeout": self.budget.llm_timeout_s, **self.model_params}
+            )
+        return llm
 
+    def _setup_agent(self):
+        llm = self._make_llm()
         df_list = list(self.dfs_dict.values())
-        df_net = self.dfs_dict["nominal_salaries"]
+        tools = self.tools
 
         @tool("get_province_salary", args_schema=ProvinceSalaryInput)
         def get_province_salary(province: str, period: str = None) -> str:
             """Get the nominal salary for a SPECIFIC province. Use this for single-province lookups."""
             try:
-                province = _parse_input(province, "province")
-                province = province.strip(" '\"[]")
-                available = df_net.index
-
-                period_val = _parse_input(period, "period") if period else None
-                if period_val and str(period_val).lower() != "none":
-                    tgt = pd.to_datetime(str(period_val).strip(" '\"[]"))
-                    closest = available[available <= tgt].max()
-                else:
-                    closest = available.max()
-
-                if province not in df_net.columns:
-                    return f"Error: Province '{province}' not found. Available: {', '.join(df_net.columns)}"
-
-                val = df_net.loc[closest, province]
-                return f"Nominal salary for {province} in {closest.strftime('%Y-%m')}: ${val:,.2f}"
+                return tools.province_salary(province, period)
             except Exception as e:
                 return f"Error: {e}. Ensure province name is correct."
 
@@ -154,45 +282,9 @@ class DataJournalistAgent:
             """Calculates % change in real salary (purchasing power) between two dates.
             Use this for ALL questions about EVOLUTION, LOSS, GAIN, or RANKING BY CHANGE over time."""
             try:
-                df_real = self.dfs_dict["real_salaries"]
-                s_d = _parse_input(start_date, "start_date")
-                e_d = _parse_input(end_date, "end_date")
-                prov = _parse_input(province, "province") if province else None
-                k_val = _parse_input(k, "k") if k else None
-                most_loss_val = _parse_input(most_loss, "most_loss")
-
-                s_d = str(s_d).strip(" '\"[]")
-                e_d = str(e_d).strip(" '\"[]")
-
-                # Align dates to available indices
-                available = df_real.index
-                s_date = available[available >= pd.to_datetime(s_d)].min()
-                e_date = available[available <= pd.to_datetime(e_d)].max()
-
-                if prov and str(prov).lower() != "none":
-                    prov = str(prov).strip(" '\"[]")
-                    loss = (
-                        df_real.loc[e_date, prov] / df_real.loc[s_date, prov] - 1
-                    ) * 100
-                    return f"Purchasing power change for {prov} ({s_date.strftime('%Y-%m')} to {e_date.strftime('%Y-%m')}): {loss:+.2f}%"
-                else:
-                    loss_all = (df_real.loc[e_date] / df_real.loc[s_date] - 1) * 100
-                    loss_all = loss_all[
-                        loss_all.index != "Promedio Ponderado (MG Total)"
-                    ]
-
-                    if k_val:
-                        # Sort: If most_loss is True, we want the lowest % changes (most negative) at the top.
-                        sorted_loss = loss_all.sort_values(
-                            ascending=bool(most_loss_val)
-                        )
-                        top_k = sorted_loss.head(int(k_val))
-                        res = f"{'Worst' if most_loss_val else 'Best'} {k_val} provinces in purchasing power change ({s_date.strftime('%Y-%m')} to {e_date.strftime('%Y-%m')}):\n"
-                        for p, v in top_k.items():
-                            res += f"- {p}: {v:+.2f}%\n"
-                        return res
-
-                    return f"Purchasing power change for all provinces ({s_date.strftime('%Y-%m')} to {e_date.strftime('%Y-%m')}):\n{loss_all.to_string()}"
+                return tools.purchasing_power_change(
+                    start_date, end_date, province=province, k=k, most_loss=most_loss
+                )
             except Exception as e:
                 return f"Error: {e}."
 
@@ -202,20 +294,7 @@ class DataJournalistAgent:
             Use ONLY for 'Who pays more/less RIGHT NOW?' questions.
             DO NOT use for 'Who lost/gained more?' (use calculate_purchasing_power_loss instead)."""
             try:
-                k_val = _parse_input(k, "k")
-                period_val = _parse_input(period, "period")
-                asc_val = _parse_input(asc, "asc")
-
-                tgt = pd.to_datetime(str(period_val).strip(" '\"[]"))
-                available = df_net.index
-                closest = available[available <= tgt].max()
-                salaries = df_net.loc[closest].sort_values(ascending=bool(asc_val))
-                salaries = salaries[salaries.index != "Promedio Ponderado (MG Total)"]
-                top_k = salaries.head(int(k_val))
-                res = f"{'Bottom' if asc_val else 'Top'} {k_val} provinces in {closest.strftime('%Y-%m')}:\n"
-                for prov, val in top_k.items():
-                    res += f"- {prov}: ${val:,.2f}\n"
-                return res
+                return tools.ranking_top_k(k, period, asc=asc)
             except Exception as e:
                 return f"Error: {e}."
 
@@ -224,21 +303,7 @@ class DataJournalistAgent:
             """Calculates the percentage change in the general inflation index (IPC) between two dates.
             Use this when you need to compare salary evolution against inflation, or when asked directly about inflation."""
             try:
-                df_ipc = self.dfs_dict["inflation_ipc"]
-                s_d = _parse_input(start_date, "start_date")
-                e_d = _parse_input(end_date, "end_date")
-
-                s_d = str(s_d).strip(" '\"[]")
-                e_d = str(e_d).strip(" '\"[]")
-
-                available = df_ipc.index
-                s_date = available[available >= pd.to_datetime(s_d)].min()
-                e_date = available[available <= pd.to_datetime(e_d)].max()
-
-                start_val = df_ipc.loc[s_date, "infl_Nivel_general"]
-                end_val = df_ipc.loc[e_date, "infl_Nivel_general"]
-                inflation_change = (end_val / start_val - 1) * 100
-                return f"Inflation (IPC) change from {s_date.strftime('%Y-%m')} to {e_date.strftime('%Y-%m')}: {inflation_change:+.2f}%"
+                return tools.inflation_change(start_date, end_date)
             except Exception as e:
                 return f"Error: {e}."
 
@@ -248,117 +313,166 @@ class DataJournalistAgent:
             get_ranking_top_k,
             calculate_inflation_change,
         ]
-        provinces = list(self.dfs_dict["nominal_salaries"].columns)
-        date_min = self.dfs_dict["nominal_salaries"].index.min().strftime("%Y-%m-%d")
-        date_max = self.dfs_dict["nominal_salaries"].index.max().strftime("%Y-%m-%d")
-
-        prefix = f"""
-You are "Lia", the AI Data Journalist for the Teacher Salaries Dashboard.
-Your persona is professional, helpful, and data-driven. 
-
-IDENTITY & CONTEXT:
-- If asked "Who are you?" or "What can you do?", explain that you are an assistant designed to analyze Argentinian teacher salaries, inflation, provincial data, and anomalies (unusual drops or gains in real salary) using the dashboard's datasets.
-- Always be polite and professional.
-
-TOOL SELECTION RULES:
-1. TOOL PREFERENCE: Always prefer using the provided custom tools (`calculate_purchasing_power_loss`, `calculate_inflation_change`, `get_province_salary`, `get_ranking_top_k`). Only write your own Python code if a specific task cannot be accomplished with these tools.
-2. FOR EVOLUTION / CHANGE OVER TIME: Always use 'calculate_purchasing_power_loss' for salaries. If asked to compare against inflation, use 'calculate_inflation_change'.
-3. FOR SNAPSHOTS / CURRENT STATE: Use 'get_ranking_top_k' only to compare salaries at a single point in time (e.g., "highest salary in Jan 2024").
-4. FOR SINGLE PROVINCE: Use 'get_province_salary'.
-
-LANGUAGE & OUTPUT RULES:
-1. RESPONSE LANGUAGE: Match the user's language (Spanish for Spanish, English for English).
-2. DATE CLARITY: ALWAYS mention the exact date range (YYYY-MM) in your final answer.
-3. RELATIVE DATES: Treat "last year" or "last X years" relative to the "Latest Data Point Available" provided in the context.
-4. COMPLETE SENTENCES: Always include the DATA (numbers/percentages) in a natural sentence. 
-5. PERCENTAGES: When discussing loss or gain, ALWAYS include the percentage (%) provided by the tool.
-
-BEHAVIORAL RULES:
-1. For general conversation or identity questions, respond DIRECTLY without using tools.
-2. EDGE CASES: If a user asks about a province or location not in the dataset (e.g., fictional places like "Narnia"), politely state that it is not a valid province instead of using tools.
-3. ALWAYS provide a clear, conversational answer to the user.
-
-DATA SPECS:
-- Range: {date_min} to {date_max}.
-- Provinces: {", ".join(provinces)}
-"""
+        mode = prompt_mode()
+        self.system_prompt = system_prompt(self.dfs_dict, self.tools.data_version, mode)
+        self._log_prompt_size(mode)
+
         agent = create_pandas_dataframe_agent(
             llm,
             df_list,
             verbose=True,
             allow_dangerous_code=True,
-            prefix=prefix,
-            max_iterations=15,
+            # The multi-DataFrame prompt runs str.format over the prefix
+            prefix=self.system_prompt.replace("{", "{{").replace("}", "}}"),
+            max_iterations=self.budget.max_iterations,
+            max_execution_time=self.budget.deadline_s,
             extra_tools=custom_tools,
-            include_df_in_prompt=True,
+            include_df_in_prompt=mode == "full",
+            # Compact mode: the schemas are already in the prefix
+            suffix=None if mode == "full" else "",
             number_of_head_rows=2,
             agent_type="tool-calling",
         )
         return agent
 
-    def query(
-        self, user_prompt: str, context_metadata: dict = None, chat_history: list = None
-    ):
-        import datetime
+    def _log_prompt_size(self, mode: str):
+        try:
+            import litellm
 
-        now = datetime.datetime.now().strftime("%Y-%m-%d")
-        date_max = self.dfs_dict["nominal_salaries"].index.max().strftime("%Y-%m-%d")
+            tokens = litellm.token_counter(
+                model=self.model_params.get("model", ""), text=self.system_prompt
+            )
+            print(f"[Agent] System prompt ({mode}): {tokens} tokens")
+        except Exception:
+            print(f"[Agent] System prompt ({mode}): {len(self.system_prompt)} chars")
+
+    def build_prompt(
+        self,
+        user_prompt: str,
+        context_metadata: dict = None,
+        chat_history: list = None,
+        lang: str = "es",
+    ) -> str:
+        """The per-question input sent to the LLM agent."""
+        import datetime
 
-        metadata_block = (
-            f"DASHBOARD FILTERS: {context_metadata}" if context_metadata else ""
+        return query_input(
+            user_prompt,
+            lang,
+            date_max=self.dfs_dict["nominal_salaries"].index.max().strftime("%Y-%m-%d"),
+            today=datetime.datetime.now().strftime("%Y-%m-%d"),
+            context_metadata=context_metadata,
+            chat_history=chat_history,
         )
+
+    def _fast_path(self, user_prompt, context_metadata, chat_history):
+        """(answer or None, cache key, lang). Answers come from the router or the response cache."""
         lang = (
             context_metadata.get("language_preference", "es")
             if context_metadata
             else "es"
         )
-        history_block = (
-            "RECENT CONVERSATION:\n"
-            + "\n".join(
-                [f"{m['role'].upper()}: {m['content']}" for m in chat_history[-3:]]
+        if self.router is not None:
+            routed = self.router.route(
+                user_prompt,
+                lang=lang,
+                chat_history=prior_turns(user_prompt, chat_history),
+                context_metadata=context_metadata,
             )
-            if chat_history
-            else ""
+            if routed is not None:
+                print(f"[Agent] Routed to '{routed.intent}'; skipping the LLM.")
+                return {"output": routed.answer, "routed": routed.intent}, None, lang
+
+        cache_key = response_key(
+            user_prompt,
+            lang,
+            context_metadata,
+            chat_history,
+            self.tools.data_version,
+            model=self.model_params.get("model", ""),
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            print("[Agent] Response cache hit; skipping the LLM.")
+            return {"output": cached, "cached": True}, cache_key, lang
+        return None, cache_key, lang
+
+    @staticmethod
+    def clean_output(ans: str) -> str:
+        """Strips ReAct labels that leak into the final answer."""
+        # Remove "Final Answer:" label if present
+        if "Final Answer:" in ans:
+            ans = ans.split("Final Answer:")[-1].strip()
+
+        # Remove leading "Thought:" sections that might have leaked
+        # This regex looks for "Thought:" at the start of the string or after a newline,
+        # and removes it along with everything until the next double newline or the end.
+        ans = re.sub(
+            r"(^|\n)Thought:.*?\n(\n|$)", "\n", ans, flags=re.DOTALL | re.IGNORECASE
+        ).strip()
+        return re.sub(r"^Thought:.*", "", ans, flags=re.IGNORECASE).strip()
+
+    def new_telemetry(self) -> RequestTelemetry:
+        return RequestTelemetry(
+            model=self.model_params.get("model", ""), data_version=self.tools.data_version
         )
 
-        full_prompt = f"""
-{metadata_block}
-
-{history_block}
-
-CONTEXT:
-- Today's Date: {now}
-- Latest Data Point Available: {date_max}
-
-USER QUESTION: {user_prompt}
-
-INSTRUCTIONS:
-- When asked for "last year", "last two years", or relative dates, use the "Latest Data Point Available" ({date_max}) as the most recent reference.
-- ALWAYS state the exact date range (YYYY-MM to YYYY-MM) used in your Final Answer.
-- Respond in {lang.upper()} (matching the user's current question language).
-- Provide a concise, complete-sentence answer.
-"""
-
+    def _prepare(self, user_prompt, context_metadata, chat_history, telemetry):
+        """(fast-path answer or None, agent input, cache key, lang), with stage timings."""
+        telemetry.data_version = self.tools.data_version
+        with telemetry.stage("fast_path"):
+            answer, cache_key, lang = self._fast_path(user_prompt, context_metadata, chat_history)
+        if answer is not None:
+            telemetry.path = "router" if "routed" in answer else "cache"
+            answer["telemetry"] = telemetry.emit()
+            return answer, None, cache_key, lang
+        with telemetry.stage("build_prompt"):
+            full_prompt = self.build_prompt(user_prompt, context_metadata, chat_history, lang)
+        return None, full_prompt, cache_key, lang
+
+    def _run(
+        self,
+        full_prompt: str,
+        cache_key: str,
+        callbacks: list = None,
+        telemetry: Optional[RequestTelemetry] = None,
+        lang: str = "es",
+    ) -> dict:
+        """Runs the LLM agent on a built prompt and cleans its final answer."""
+        telemetry = telemetry or self.new_telemetry()
+        # Caller callbacks first, so a RunGate stops a step before anything records it
+        callbacks = list(callbacks or []) + [telemetry.handler]
+        res = self._invoke(full_prompt, cache_key, callbacks, telemetry, lang)
+        res["telemetry"] = telemetry.emit(res.get("usage"))
+        return res
+
+    def _invoke(
+        self, full_prompt: str, cache_key: str, callbacks: list, telemetry, lang: str
+    ) -> dict:
         print(f"\n--- [AGENT QUERY START] ---\n{full_prompt}\n---")
+        usage_handler = UsageMetadataCallbackHandler()
+        tool_results = _ToolResults()
+        start = time.perf_counter()
         try:
-            res = self.agent.invoke({"input": full_prompt})
-            ans = res.get("output", "")
-
-            # --- Output Cleaning ---
-            # Remove "Final Answer:" label if present
-            if "Final Answer:" in ans:
-                ans = ans.split("Final Answer:")[-1].strip()
-
-            # Remove leading "Thought:" sections that might have leaked
-            # This regex looks for "Thought:" at the start of the string or after a newline,
-            # and removes it along with everything until the next double newline or the end.
-            ans = re.sub(
-                r"(^|\n)Thought:.*?\n(\n|$)", "\n", ans, flags=re.DOTALL | re.IGNORECASE
-            ).strip()
-            ans = re.sub(r"^Thought:.*", "", ans, flags=re.IGNORECASE).strip()
-
+            with telemetry.stage("agent"):
+                res = self.agent.invoke(
+                    {"input": full_prompt},
+                    config={"callbacks": [usage_handler, tool_results] + callbacks},
+                )
+            res["usage"] = self._log_usage(usage_handler, time.perf_counter() - start)
+            if str(res.get("output", "")).startswith(STOPPED_PREFIX):
+                iterations = len(telemetry.handler.llm_calls)
+                reason = "iterations" if iterations >= self.budget.max_iterations else "deadline"
+                return {
+                    **res,
+                    **self._partial_answer(reason, tool_results.outputs, telemetry, lang),
+                }
+            with telemetry.stage("clean_output"):
+                ans = self.clean_output(res.get("output", ""))
             res["output"] = ans
             print(f"--- [AGENT RESPONSE (CLEAN)] ---\n{ans}\n---")
+            self.response_cache.put(cache_key, ans)
+            telemetry.path = "llm"
             return res
         except OutputParserException as e:
             output = str(e.llm_output) if hasattr(e, "llm_output") else str(e)
@@ -368,202 +482,112 @@ INSTRUCTIONS:
             output = re.sub(r"^Thought:.*?\n", "", output, flags=re.IGNORECASE).strip()
 
             print(f"--- [AGENT PARSE ERROR RECOVERY] ---\n{output}\n---")
+            telemetry.path = "parse_recovery"
             return {"output": output.strip()}
+        except RunCancelled:
+            print("[Agent] Run cancelled by the guardrail.")
+            telemetry.path = "cancelled"
+            return {"output": "", "cancelled": True}
         except Exception as e:
+            if "timeout" in type(e).__name__.lower():
+                return self._partial_answer("llm_timeout", tool_results.outputs, telemetry, lang)
+            telemetry.path = "error"
             if any(x in str(e).lower() for x in ["rate_limit", "429", "quota"]):
                 return {"output": "⚠️ **Quota reached.** Please wait 30s."}
             return {"output": f"Error: {str(e)}"}
 
-    def generate_executive_summary(self, lang="es") -> str:
-        """Generates a data-driven executive summary with macro indicators and tabular salary comparison."""
-        df_net = self.dfs_dict["nominal_salaries"]
-        df_real = self.dfs_dict["real_salaries"]
-        df_ipc = self.dfs_dict["inflation_ipc"]
-        df_poverty = self.dfs_dict["poverty_lines"]
-
-        last_date = df_net.index.max()
-        prev_quarter = last_date - pd.DateOffset(months=3)
-        prev_year = last_date - pd.DateOffset(years=1)
-
-        # Annual accumulated (YTD): from Dec of previous year
-        dec_prev_year_date = pd.Timestamp(year=last_date.year - 1, month=12, day=1)
-        if dec_prev_year_date not in df_net.index:
-            dec_prev_year_date = df_net.index[df_net.index <= dec_prev_year_date].max()
-
-        # Formatting helpers
-        def f_curr(v):
-            return f"${v:,.0f}"
-
-        def f_pct(v):
-            return f"{v * 100:+.1f}%"
-
-        # Localized date formatting helper
-        def f_date(dt, lang):
-            months_es = {
-                1: "Enero",
-                2: "Febrero",
-                3: "Marzo",
-                4: "Abril",
-                5: "Mayo",
-                6: "Junio",
-                7: "Julio",
-                8: "Agosto",
-                9: "Septiembre",
-                10: "Octubre",
-                11: "Noviembre",
-                12: "Diciembre",
-            }
-            if lang == "es":
-                return f"{months_es[dt.month]} {dt.year}"
-            return dt.strftime("%B %Y")
-
-        # --- Macroeconomic Table ---
-        # IPC (General), CBT (Family 4), CBA (Family 4)
-        ipc_col = "infl_Nivel_general"
-        cbt_col = "linea_pobreza"
-        cba_col = "linea_indigencia"
-
-        macro_data = []
-        for label, col, df in [
-            ("IPC", ipc_col, df_ipc),
-            ("CBT (Pobreza)", cbt_col, df_poverty),
-            ("CBA (Indigencia)", cba_col, df_poverty),
-        ]:
-            if col in df.columns:
-                q_var = (df.loc[last_date, col] / df.loc[prev_quarter, col]) - 1
-                ytd_var = (df.loc[last_date, col] / df.loc[dec_prev_year_date, col]) - 1
-                i_var = (df.loc[last_date, col] / df.loc[prev_year, col]) - 1
-
-                row_label = (
-                    label
-                    if lang == "es"
-                    else label.replace("Pobreza", "Poverty").replace(
-                        "Indigencia", "Indigency"
-                    )
-                )
-                macro_data.append(
-                    {
-                        "Indicator" if lang == "en" else "Indicador": row_label,
-                        "Last Quarter" if lang == "en" else "Últ. Trimestre": f_pct(
-                            q_var
-                        ),
-                        "Annual Acc." if lang == "en" else "Acum. Anual": f_pct(
-                            ytd_var
-                        ),
-                        "Interannual" if lang == "en" else "Interanual": f_pct(i_var),
-                    }
-                )
-
-        df_macro_table = pd.DataFrame(macro_data)
-        last_cbt = f_curr(df_poverty.loc[last_date, cbt_col])
-        last_cba = f_curr(df_poverty.loc[last_date, cba_col])
-
-        # --- Salary Table ---
-        summary_df = pd.DataFrame(index=df_net.columns)
-        summary_df["Last Net Salary"] = df_net.loc[last_date]
-
-        # Nominal variations
-        summary_df["Nom Q"] = (df_net.loc[last_date] / df_net.loc[prev_quarter]) - 1
-        summary_df["Nom YTD"] = (
-            df_net.loc[last_date] / df_net.loc[dec_prev_year_date]
-        ) - 1
-        summary_df["Nom I"] = (df_net.loc[last_date] / df_net.loc[prev_year]) - 1
-
-        # Real variations
-        summary_df["Real Q"] = (df_real.loc[last_date] / df_real.loc[prev_quarter]) - 1
-        summary_df["Real YTD"] = (
-            df_real.loc[last_date] / df_real.loc[dec_prev_year_date]
-        ) - 1
-        summary_df["Real I"] = (df_real.loc[last_date] / df_real.loc[prev_year]) - 1
-
-        summary_df = summary_df.sort_values(by="Last Net Salary", ascending=False)
-
-        # Real Salary Drop (Average YoY) for insights
-        real_drop_avg = summary_df["Real I"].mean()
-
-        # Table Formatting for Salary
-        display_df = pd.DataFrame(index=summary_df.index)
-        display_df["Last Net Salary" if lang == "en" else "Últ. Salario Neto"] = (
-            summary_df["Last Net Salary"].apply(f_curr)
-        )
-
-        real_label = "Real" if lang == "en" else "Real"
-        display_df["Quarterly Var." if lang == "en" else "Var. Trimestral"] = [
-            f"{f_pct(n)} ({real_label}: {f_pct(r)})"
-            for n, r in zip(summary_df["Nom Q"], summary_df["Real Q"])
-        ]
-        display_df["Annual Acc. Var." if lang == "en" else "Var. Acum. Anual"] = [
-            f"{f_pct(n)} ({real_label}: {f_pct(r)})"
-            for n, r in zip(summary_df["Nom YTD"], summary_df["Real YTD"])
-        ]
-        display_df["Interannual Var." if lang == "en" else "Var. Interanual"] = [
-            f"{f_pct(n)} ({real_label}: {f_pct(r)})"
-            for n, r in zip(summary_df["Nom I"], summary_df["Real I"])
-        ]
-        display_df.index.name = "Province" if lang == "en" else "Provincia"
-
-        # Insights
-        top_province = summary_df.index[0]
-        bottom_province = summary_df.index[-1]
-        gap = summary_df["Last Net Salary"].max() / summary_df["Last Net Salary"].min()
-        max_var_prov = summary_df["Nom I"].idxmax()
-        min_var_prov = summary_df["Nom I"].idxmin()
-
-        if lang == "es":
-            report = f"""# Resumen Ejecutivo sobre los Salarios de los Docentes en Argentina
-
-Entre diciembre de 2016 y {f_date(last_date, "es")} ({df_net.index.min().strftime("%Y-%m")} a {last_date.strftime("%Y-%m")}), los salarios de los docentes en Argentina han experimentado variaciones significativas. 
-
-### Indicadores Macroeconómicos ({f_date(last_date, "es")})
-Últimos valores de referencia (Canasta para familia de 4):
-*   **Línea de Pobreza (CBT):** {last_cbt}
-*   **Línea de Indigencia (CBA):** {last_cba}
-
-{df_macro_table.to_markdown(index=False)}
-
-### Evolución del Poder Adquisitivo
-Durante el último año, desde {f_date(prev_year, "es")} hasta {f_date(last_date, "es")}, los salarios reales han bajado **{abs(real_drop_avg) * 100:.1f}%** en promedio. Esta caída refleja que los ajustes salariales no han logrado compensar el aumento sostenido del IPC.
-
-### Tabla de Salarios y Variaciones ({f_date(last_date, "es")})
-La siguiente tabla detalla la situación salarial por jurisdicción, ordenada por el salario neto más reciente. Las variaciones muestran el cambio nominal seguido del ajuste real (poder de compra) entre paréntesis.
-
-{display_df.reset_index().to_markdown(index=False)}
-
-### Hallazgos Clave
-*   **Brecha Federal:** Existe una diferencia de **{gap:.1f} veces** entre el salario más alto ({top_province}: {f_curr(summary_df["Last Net Salary"].max())}) y el más bajo ({bottom_province}: {f_curr(summary_df["Last Net Salary"].min())}).
-*   **Variación Interanual:** Mientras que **{max_var_prov}** registró el mayor incremento nominal interanual ({f_pct(summary_df["Nom I"].max())}), **{min_var_prov}** tuvo el ajuste más bajo ({f_pct(summary_df["Nom I"].min())}).
-*   **Dinámica Trimestral:** El promedio de ajuste trimestral para todas las provincias fue de **{summary_df["Nom Q"].mean() * 100:.1f}%**, con variaciones que oscilan entre el {f_pct(summary_df["Nom Q"].min())} y el {f_pct(summary_df["Nom Q"].max())}.
-
-Los datos reflejan un panorama complejo donde, a pesar de los aumentos nominales, el poder adquisitivo real sigue bajo presión en todo el territorio nacional.
-"""
+    def _partial_answer(self, reason: str, tool_outputs: list, telemetry, lang: str) -> dict:
+        """Answer for a run cut short by its budget: the tool results so far, if any."""
+        telemetry.path = "partial"
+        telemetry.budget = {"stopped_by": reason, **self.budget.as_dict()}
+        print(f"[Agent] Budget exhausted ({reason}); returning a partial answer.")
+        lang = lang if lang in PARTIAL_ANSWER else "es"
+        # Latest distinct tool results, oldest first
+        found = list(dict.fromkeys(reversed(tool_outputs)))[:3][::-1]
+        if found:
+            text = "\n\n".join([PARTIAL_ANSWER[lang] + " " + PARTIAL_FOUND[lang]] + found)
         else:
-            report = f"""# Executive Summary: Teacher Salaries in Argentina
-
-Between December 2016 and {f_date(last_date, "en")} ({df_net.index.min().strftime("%Y-%m")} to {last_date.strftime("%Y-%m")}), teacher salaries in Argentina have undergone significant variations.
-
-### Macroeconomic Indicators ({f_date(last_date, "en")})
-Reference values (Basket for a family of 4):
-*   **Poverty Line (CBT):** {last_cbt}
-*   **Indigency Line (CBA):** {last_cba}
+            text = PARTIAL_ANSWER[lang] + " " + PARTIAL_RETRY[lang]
+        # Not cached: the same question may finish next time
+        return {"output": text, "partial": True, "stopped_by": reason}
 
-{df_macro_table.to_markdown(index=False)}
-
-### Purchasing Power Evolution
-Over the last year, from {f_date(prev_year, "en")} to {f_date(last_date, "en")}, real salaries have decreased by **{abs(real_drop_avg) * 100:.1f}%** on average. This decline reflects that salary adjustments have not managed to compensate for the sustained increase in the IPC.
-
-### Salary and Variations Table ({f_date(last_date, "en")})
-The following table details the salary situation by jurisdiction, sorted by the most recent net salary. Variations show the nominal change followed by the real adjustment (purchasing power) in parentheses.
-
-{display_df.reset_index().to_markdown(index=False)}
-
-### Key Findings
-*   **Federal Gap:** There is a difference of **{gap:.1f} times** between the highest salary ({top_province}: {f_curr(summary_df["Last Net Salary"].max())}) and the lowest ({bottom_province}: {f_curr(summary_df["Last Net Salary"].min())}).
-*   **Interannual Variation:** While **{max_var_prov}** recorded the highest interannual nominal increase ({f_pct(summary_df["Nom I"].max())}), **{min_var_prov}** had the lowest adjustment ({f_pct(summary_df["Nom I"].min())}).
-*   **Quarterly Dynamics:** The average quarterly adjustment for all provinces was **{summary_df["Nom Q"].mean() * 100:.1f}%**, with variations ranging between {f_pct(summary_df["Nom Q"].min())} and {f_pct(summary_df["Nom Q"].max())}.
+    def query(
+        self,
+        user_prompt: str,
+        context_metadata: dict = None,
+        chat_history: list = None,
+        telemetry: Optional[RequestTelemetry] = None,
+        callbacks: list = None,
+    ):
+        telemetry = telemetry or self.new_telemetry()
+        answer, full_prompt, cache_key, lang = self._prepare(
+            user_prompt, context_metadata, chat_history, telemetry
+        )
+        if answer is not None:
+            return answer
+        return self._run(full_prompt, cache_key, callbacks, telemetry=telemetry, lang=lang)
+
+    def stream_query(
+        self,
+        user_prompt: str,
+        context_metadata: dict = None,
+        chat_history: list = None,
+        telemetry: Optional[RequestTelemetry] = None,
+        callbacks: list = None,
+    ) -> Iterator[dict]:
+        """
+        Like `query`, but yields events while the agent runs:
+        {"type": "tool", "name", "input"} when a tool starts,
+        {"type": "token", "text"} for each streamed LLM text chunk, and finally
+        {"type": "final", **response} with the cleaned answer. Text streamed
+        before a tool event was an intermediate message, not the answer.
+        """
+        telemetry = telemetry or self.new_telemetry()
+        answer, full_prompt, cache_key, lang = self._prepare(
+            user_prompt, context_metadata, chat_history, telemetry
+        )
+        if answer is not None:
+            yield {"type": "final", **answer}
+            return
+
+        events: "queue.Queue[dict]" = queue.Queue()
+
+        def run():
+            res = self._run(
+                full_prompt,
+                cache_key,
+                callbacks=list(callbacks or []) + [_StreamHandler(events)],
+                telemetry=telemetry,
+                lang=lang,
+            )
+            events.put({"type": "final", **res})
+
+        threading.Thread(target=run, name="agent-stream", daemon=True).start()
+        while True:
+            event = events.get()
+            yield event
+            if event["type"] == "final":
+                return
+
+    @staticmethod
+    def _log_usage(handler, latency_s: float) -> dict:
+        """Token counts reported by the model across the run, logged with latency."""
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+        for metadata in handler.usage_metadata.values():
+            usage["prompt_tokens"] += metadata.get("input_tokens", 0)
+            usage["completion_tokens"] += metadata.get("output_tokens", 0)
+            details = metadata.get("input_token_details") or {}
+            usage["cached_tokens"] += details.get("cache_read") or 0
+        usage["latency_s"] = round(latency_s, 3)
+        print(
+            f"[Agent] LLM run: {latency_s:.2f} s, {usage['prompt_tokens']} prompt tokens "
+            f"({usage['cached_tokens']} cached), {usage['completion_tokens']} completion tokens"
+        )
+        return usage
 
-The data reflects a complex landscape where, despite nominal increases, real purchasing power remains under pressure throughout the national territory.
-"""
-        return report
+    def generate_executive_summary(self, lang="es") -> str:
+        """Generates a data-driven executive summary with macro indicators and tabular salary comparison."""
+        return render_executive_summary(self.dfs_dict, lang=lang)
 
     def query_and_log(
         self, question: str, ground_truth: str = None, chat_history: list = None
@@ -0,0 +1,123 @@
+"""
+Bounded pool of agent executors over one data snapshot.
+
+A LangChain `AgentExecutor` (and the chat model client inside it) is not meant
+to be driven by many threads at once. `AgentPool` hands each request its own
+executor, all built from one primary `DataJournalistAgent` with `clone()`,
+so the prepared frames, the tool arrays and the caches are shared and
+read-only. Executors are built on demand, up to `size`. Beyond that, requests
+wait in line for up to `timeout` seconds, which bounds concurrent LLM runs per
+worker process. `stats()` reports the queueing.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+
+class AgentPoolTimeout(Exception):
+    """No executor became free within the pool timeout."""
+
+
+class AgentPool:
+    def __init__(self, agent, size: int = 4, timeout: float = 30.0):
+        # The primary agent; executors beyond it are its clones
+        self.agent = agent
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = [agent]
+        self._created = 1
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        # Checkouts that had to wait for a busy executor
+        self._queued = 0
+        self._timeouts = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls, agent) -> "AgentPool":
+        """Sized per process, so each gunicorn worker gets its own AGENT_POOL_SIZE."""
+        return cls(
+            agent,
+            size=int(os.getenv("AGENT_POOL_SIZE", "4")),
+            timeout=float(os.getenv("AGENT_POOL_TIMEOUT", "30")),
+        )
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """Leases an executor for one request, waiting in line if all are busy."""
+        agent = self.checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self.checkin(agent)
+
+    def checkout(self, timeout: Optional[float] = None):
+        """Takes an executor out of the pool; pair with `checkin`."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        build = waited = False
+        with self._cond:
+            self._waiting += 1
+            try:
+                while not self._idle and self._created >= self.size:
+                    remaining = timeout - (time.perf_counter() - start)
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise AgentPoolTimeout(
+                            f"All {self.size} agent executors busy for {timeout:.0f}s"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            if self._idle:
+                agent = self._idle.pop()
+            else:
+                self._created += 1
+                build = True
+            self._in_use += 1
+            self._acquired += 1
+            wait_ms = (time.perf_counter() - start) * 1000
+            self._queued += waited
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+        if build:
+            try:
+                agent = self.agent.clone()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            print(f"[AgentPool] Built executor {self._created}/{self.size}.")
+        return agent
+
+    def checkin(self, agent):
+        with self._cond:
+            self._idle.append(agent)
+            self._in_use -= 1
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "executors": self._created,
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "acquired": self._acquired,
+                "queued": self._queued,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_ms_total / self._acquired, 3)
+                if self._acquired
+                else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 3),
+            }
@@ -0,0 +1,101 @@
+"""
+Small thread-safe LRU cache with hit statistics and optional expiry.
+
+Used to memoize deterministic computations over a data snapshot. Callers
+include the snapshot's data version in their keys, so entries computed over an
+old version are never served for a new one and simply age out.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        # Seconds an entry stays valid; None keeps entries until evicted
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    def _count(self, namespace: str, field: str):
+        counts = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counts[field] += 1
+
+    def get(self, namespace: str, key: Hashable, default=None):
+        full_key = (namespace, key)
+        with self._lock:
+            entry = self._data.get(full_key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(full_key)
+                    self._count(namespace, "hits")
+                    return value
+                del self._data[full_key]
+            self._count(namespace, "misses")
+            return default
+
+    def put(self, namespace: str, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        full_key = (namespace, key)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[full_key] = (value, expires_at)
+            self._data.move_to_end(full_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, namespace: str, key: Hashable, fn: Callable[[], Any]):
+        """
+        Returns the cached value or computes and stores it. Exceptions from `fn`
+        propagate and nothing is cached. Two threads missing the same key at
+        once may both compute it; results are deterministic, so that is harmless.
+        """
+        missing = object()
+        value = self.get(namespace, key, missing)
+        if value is missing:
+            value = fn()
+            self.put(namespace, key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._stats.clear()
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit rate, overall and per namespace."""
+        with self._lock:
+            per_namespace = {
+                name: {**counts, "hit_rate": _rate(counts)}
+                for name, counts in self._stats.items()
+            }
+            hits = sum(c["hits"] for c in self._stats.values())
+            misses = sum(c["misses"] for c in self._stats.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": _rate({"hits": hits, "misses": misses}),
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "evictions": self.evictions,
+                "namespaces": per_namespace,
+            }
+
+
+def _rate(counts: Dict[str, int]) -> float:
+    total = counts["hits"] + counts["misses"]
+    return counts["hits"] / total if total else 0.0
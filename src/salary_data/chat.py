@@ -0,0 +1,251 @@
+"""
+Lazily constructed chat subsystem (DataJournalistAgent and InputValidator).
+
+Importing the agent pulls in langchain and litellm, which dominates the
+dashboard's cold start. `ChatService` defers those imports and the agent
+construction to the first chat request, or to an optional prewarm thread.
+
+With GUARDRAIL_SPECULATIVE=1, a question the guardrail heuristics cannot
+decide starts the agent while the LLM relevance check runs alongside it,
+instead of after it. A rejected question stops the agent at its next step and
+its answer is never shown or cached.
+"""
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Optional, Tuple
+
+from salary_data.agent_pool import AgentPool, AgentPoolTimeout
+
+BUSY_MESSAGE = "⚠️ **The assistant is busy.** Please try again in a few seconds."
+
+
+class ChatService:
+    """
+    Owns the agent and validator for the current data snapshot.
+
+    The agent is built on first use and rebuilt when the snapshot version
+    changes. Only the first caller per version pays the construction cost;
+    concurrent callers wait on the same lock instead of building twice.
+    Requests lease executors from an `AgentPool` over that agent.
+    """
+
+    def __init__(
+        self,
+        data_store,
+        model_params: dict,
+        guardrail_model: str,
+        speculative: Optional[bool] = None,
+    ):
+        self.data_store = data_store
+        self.model_params = model_params
+        self.guardrail_model = guardrail_model
+        self.speculative = (
+            os.getenv("GUARDRAIL_SPECULATIVE", "0") == "1" if speculative is None else speculative
+        )
+        # (snapshot version, agent pool), swapped as a single reference
+        self._agent_entry: Optional[Tuple[str, AgentPool]] = None
+        self._validator = None
+        self._lock = threading.Lock()
+        self._prewarm_thread: Optional[threading.Thread] = None
+
+    @property
+    def agent_ready(self) -> bool:
+        return self._agent_entry is not None
+
+    def get_agent(self):
+        """Returns the agent for the current snapshot, building it if needed."""
+        return self.get_pool().agent
+
+    def get_pool(self) -> AgentPool:
+        """Returns the executor pool for the current snapshot, building it if needed."""
+        snapshot = self.data_store.current()
+        entry = self._agent_entry
+        if entry is not None and entry[0] == snapshot.version:
+            return entry[1]
+
+        with self._lock:
+            entry = self._agent_entry
+            if entry is None or entry[0] != snapshot.version:
+                from salary_data.agent import DataJournalistAgent
+
+                print(f"[Chat] Building agent for dataset version {snapshot.version}...")
+                agent = DataJournalistAgent(
+                    snapshot.agent_dfs,
+                    model_params=self.model_params,
+                    data_version=snapshot.version,
+                )
+                entry = (snapshot.version, AgentPool.from_env(agent))
+                self._agent_entry = entry
+            return entry[1]
+
+    def get_validator(self):
+        """Returns the input validator, building it on first use."""
+        if self._validator is None:
+            with self._lock:
+                if self._validator is None:
+                    from salary_data.guardrails import InputValidator
+
+                    self._validator = InputValidator(
+                        relevance_model=self.guardrail_model
+                    )
+        return self._validator
+
+    def _telemetry(self):
+        """A request record that starts timing before the guardrail runs."""
+        from salary_data.telemetry import RequestTelemetry
+
+        return RequestTelemetry(model=self.model_params.get("model", ""))
+
+    def _guardrail(self, query: str, telemetry) -> Tuple[Optional[Tuple[bool, str]], list]:
+        """
+        (verdict, agent callbacks). In speculative mode, when only the LLM can
+        decide, the verdict is None and the check runs on its own thread; the
+        callbacks then hold a `RunGate` on its result.
+        """
+        validator = self.get_validator()
+        if not self.speculative:
+            with telemetry.stage("guardrail"):
+                return validator.validate(query), []
+        with telemetry.stage("guardrail"):
+            verdict = validator.precheck(query)
+        if verdict is not None:
+            return verdict, []
+
+        from salary_data.agent import RunGate
+
+        pending: Future = Future()
+
+        def check():
+            try:
+                with telemetry.stage("guardrail"):
+                    pending.set_result(validator.validate(query))
+            except Exception as e:
+                pending.set_exception(e)
+
+        telemetry.speculative = True
+        threading.Thread(target=check, name="chat-guardrail", daemon=True).start()
+        return None, [RunGate(pending)]
+
+    @staticmethod
+    def _rejection(gates: list) -> Optional[str]:
+        """The guardrail's error message if it rejected a speculative run, once it has decided."""
+        if gates and gates[0].rejected(wait=True):
+            return gates[0].verdict.result()[1]
+        return None
+
+    @staticmethod
+    def _checkout(pool: AgentPool, telemetry):
+        """Leases an executor, recording the wait (and a timeout) in telemetry."""
+        try:
+            with telemetry.stage("pool_wait"):
+                return pool.checkout()
+        except AgentPoolTimeout:
+            print(f"[Chat] Agent pool busy: {pool.stats()}")
+            telemetry.path = "busy"
+            telemetry.emit()
+            raise
+
+    def answer(self, query: str, context: dict, chat_history: list) -> str:
+        """Guardrail check plus agent run for one chat message."""
+        telemetry = self._telemetry()
+        verdict, gates = self._guardrail(query, telemetry)
+        if verdict is not None and not verdict[0]:
+            telemetry.path = "rejected"
+            telemetry.emit()
+            return verdict[1]
+        try:
+            # Pin the pool (and its data version) for this request
+            pool = self.get_pool()
+            agent = self._checkout(pool, telemetry)
+            try:
+                response = agent.query(
+                    query,
+                    context_metadata=context,
+                    chat_history=chat_history,
+                    telemetry=telemetry,
+                    callbacks=gates,
+                )
+            finally:
+                pool.checkin(agent)
+            rejection = self._rejection(gates)
+            if rejection is not None:
+                return rejection
+            return response.get("output", "I'm sorry, I couldn't process that.")
+        except AgentPoolTimeout:
+            return BUSY_MESSAGE
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def stream_answer(self, query: str, context: dict, chat_history: list):
+        """
+        Streaming version of `answer`. Yields render states
+        {"tools": [tool names], "draft": streamed text} and returns the answer.
+        """
+        telemetry = self._telemetry()
+        verdict, gates = self._guardrail(query, telemetry)
+        if verdict is not None and not verdict[0]:
+            telemetry.path = "rejected"
+            telemetry.emit()
+            return verdict[1]
+        state = {"tools": [], "draft": ""}
+        try:
+            pool = self.get_pool()
+            agent = self._checkout(pool, telemetry)
+            try:
+                for event in agent.stream_query(
+                    query,
+                    context_metadata=context,
+                    chat_history=chat_history,
+                    telemetry=telemetry,
+                    callbacks=gates,
+                ):
+                    if event["type"] == "final":
+                        rejection = self._rejection(gates)
+                        if rejection is not None:
+                            return rejection
+                        return event.get("output", "I'm sorry, I couldn't process that.")
+                    # New dicts, so readers on other threads never see a half-updated state
+                    if event["type"] == "tool":
+                        state = {"tools": state["tools"] + [event["name"]], "draft": ""}
+                    else:
+                        state = {"tools": state["tools"], "draft": state["draft"] + event["text"]}
+                    # Nothing is shown before a speculative run is known to be allowed
+                    if not gates or (gates[0].verdict.done() and not gates[0].rejected()):
+                        yield state
+            finally:
+                pool.checkin(agent)
+        except AgentPoolTimeout:
+            return BUSY_MESSAGE
+        except Exception as e:
+            return f"Error: {str(e)}"
+        return "I'm sorry, I couldn't process that."
+
+    def on_snapshot(self, snapshot):
+        """
+        Snapshot listener. Rebuilds the agent off the request path, but only if
+        one was already in use; otherwise the next chat request builds it.
+        """
+        if self.agent_ready:
+            self.get_agent()
+
+    def prewarm(self, background: bool = True):
+        """Imports and builds the chat stack ahead of the first request."""
+        if not background:
+            self._prewarm()
+            return
+        if self._prewarm_thread and self._prewarm_thread.is_alive():
+            return
+        self._prewarm_thread = threading.Thread(
+            target=self._prewarm, name="chat-prewarm", daemon=True
+        )
+        self._prewarm_thread.start()
+
+    def _prewarm(self):
+        try:
+            self.get_validator()
+            self.get_agent()
+            print("[Chat] Agent prewarmed.")
+        except Exception as e:
+            print(f"[Chat] Prewarm failed, will retry on first request: {e}")
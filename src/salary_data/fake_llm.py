@@ -0,0 +1,175 @@
+"""
+Scripted chat model for running the DataJournalistAgent without a provider.
+
+`ScriptedChatModel` replays a fixed list of responses, one per LLM call: tool
+calls or plain text. It supports `bind_tools` (as the tool-calling agent
+requires) and streams text word by word with configurable delays, so latency
+measurements such as time-to-first-token are reproducible offline.
+
+`FixtureChatModel` is the backend behind `model="fake/<fixture>"`. It replays
+scripts from a JSON fixture, picking the script by the user question and the
+step by the messages of the current run, so it stays deterministic when one
+agent serves many concurrent requests. A fixture is a list of scripts:
+
+    [{"name": "ranking", "match": ["top", "highest"],
+      "responses": [{"tool": "get_ranking_top_k", "args": {"k": 3, ...}},
+                    {"content": "Final Answer: ..."}]},
+     {"name": "fallback", "responses": [...]}]
+
+The first script with a `match` keyword in the question wins; a script
+without `match` is the fallback. Once the run has used every response, the
+last one (the answer) is repeated.
+"""
+
+import os
+import json
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import BaseModel, PrivateAttr
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def tool_call(name: str, call_id: str = "call_1", **args) -> AIMessage:
+    """A scripted response that calls one tool."""
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": call_id}])
+
+
+def _message(response: dict, step: int) -> AIMessage:
+    """A fixture response ({"tool", "args"} or {"content"}) as a message."""
+    if "tool" in response:
+        return tool_call(response["tool"], call_id=f"call_{step + 1}", **response.get("args", {}))
+    return AIMessage(content=response["content"])
+
+
+class Script(BaseModel):
+    name: str
+    match: List[str] = []
+    responses: List[AIMessage]
+
+
+def load_fixture(fixture: str) -> List[Script]:
+    """Scripts from a fixture path, or a name in salary_data/fixtures/."""
+    path = fixture if os.path.exists(fixture) else os.path.join(FIXTURE_DIR, f"{fixture}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        Script(
+            name=entry.get("name", f"script_{i}"),
+            match=[word.lower() for word in entry.get("match", [])],
+            responses=[_message(r, step) for step, r in enumerate(entry["responses"])],
+        )
+        for i, entry in enumerate(entries)
+    ]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Answers each call with the next scripted message, wrapping around at the end."""
+
+    responses: List[AIMessage] = []
+    # Seconds before the first chunk of each call, and between text chunks
+    first_token_delay: float = 0.0
+    token_delay: float = 0.0
+    # Like a provider's request timeout: calls slower than this raise TimeoutError
+    timeout: Optional[float] = None
+
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        # Responses are scripted; the tool schemas are not needed
+        return self
+
+    def _wait(self, seconds: float):
+        if self.timeout is not None and seconds > self.timeout:
+            time.sleep(self.timeout)
+            raise TimeoutError(f"Scripted LLM call timed out after {self.timeout}s")
+        time.sleep(seconds)
+
+    def _next(self, messages: List[BaseMessage]) -> AIMessage:
+        message = self.responses[self._calls % len(self.responses)]
+        self._calls += 1
+        return message
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next(messages)
+        self._wait(self.first_token_delay + self.token_delay * len(message.content.split()))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._next(messages)
+        self._wait(self.first_token_delay)
+        if message.tool_calls:
+            chunks = [
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=chunks))
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.token_delay)
+            text = word if i == len(words) - 1 else word + " "
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+
+class FixtureChatModel(ScriptedChatModel):
+    """Replays fixture scripts, chosen per question; safe to share across threads."""
+
+    scripts: List[Script]
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixture"
+
+    @classmethod
+    def from_fixture(cls, fixture: str, **kwargs: Any) -> "FixtureChatModel":
+        return cls(scripts=load_fixture(fixture), **kwargs)
+
+    def script_for(self, question: str) -> Script:
+        question = question.lower()
+        fallback = None
+        for script in self.scripts:
+            if not script.match:
+                fallback = fallback or script
+            elif any(word in question for word in script.match):
+                return script
+        if fallback is None:
+            raise ValueError(f"No fixture script matches: {question!r}")
+        return fallback
+
+    def _next(self, messages: List[BaseMessage]) -> AIMessage:
+        # The question is the last human message; each AI message after it is one step
+        last_human = max(
+            (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1
+        )
+        question = str(messages[last_human].content) if last_human >= 0 else ""
+        question = question.split("USER QUESTION:")[-1]
+        step = sum(isinstance(m, AIMessage) for m in messages[last_human + 1 :])
+        self._calls += 1
+        responses = self.script_for(question).responses
+        return responses[min(step, len(responses) - 1)]
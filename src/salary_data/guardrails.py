@@ -1,122 +1,245 @@
+import os
 import re
-import litellm
-from typing import Tuple
+import json
+import hashlib
+from typing import Iterable, Optional, Set, Tuple
+
+from salary_data.provinces import fold, province_index
+from salary_data.relevance import RelevanceClassifier
+from salary_data.response_cache import ResponseCache, normalize_question
+
+# Patterns for common prompt injection attempts
+INJECTION_PATTERNS = (
+    "ignore previous instructions",
+    "ignore all previous",
+    "forget everything",
+    "system prompt",
+    "new rules",
+    "you are now a",
+    "bypass",
+    "dan mode",
+    "jailbreak",
+)
+GREETINGS = ("hello", "hola", "hi", "hey", "buenos dias", "buenas tardes")
+IDENTITY = (
+    "quien sos",
+    "who are you",
+    "tu nombre",
+    "your name",
+    "what are you",
+    "que sos",
+)
+# Data keywords (Spanish & English), matched as whole words, so every inflection is listed
+KEYWORDS = (
+    "salario",
+    "salarios",
+    "salarial",
+    "salariales",
+    "sueldo",
+    "sueldos",
+    "cobran",
+    "cobraban",
+    "pagan",
+    "pagaban",
+    "ganan",
+    "ganaban",
+    "salary",
+    "salaries",
+    "pay",
+    "pays",
+    "paid",
+    "paying",
+    "earn",
+    "earns",
+    "earned",
+    "earning",
+    "earnings",
+    "inflacion",
+    "inflation",
+    "ipc",
+    "cpi",
+    "canasta",
+    "canastas",
+    "pobreza",
+    "poverty",
+    "ranking",
+    "rankings",
+    "top",
+    "bottom",
+    "peores",
+    "mejores",
+    "loss",
+    "losses",
+    "perdimos",
+    "ganamos",
+    "poder adquisitivo",
+    "purchasing power",
+    "evolucion",
+    "evolution",
+)
+
+INJECTION_MESSAGE = (
+    "⚠️ **Security alert:** Potential prompt injection detected. Please rephrase your question."
+)
+OFF_TOPIC_MESSAGE = (
+    "I'm sorry, I can only answer questions related to Argentinian teacher salaries and economic data."
+)
+
+
+def _trie(phrases: Iterable[str]) -> str:
+    """
+    Alternation of the folded phrases, factored by common prefix
+    ("sal(?:ario|ary|ta)"), so the regex engine rejects a position on its
+    first character instead of trying every phrase. Longer phrases win.
+    """
+    root = {}
+    for phrase in {fold(p) for p in phrases}:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+def verdict_key(text: str, relevance_model: str) -> str:
+    payload = json.dumps([relevance_model, normalize_question(text)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cacheable_verdict(verdict) -> bool:
+    # A failed LLM call says nothing about the question
+    return verdict[1] != "ERROR_FALLBACK"
+
+
+def verdict_cache(
+    maxsize: int = 1024, ttl: Optional[float] = 24 * 3600, directory: Optional[str] = None
+) -> ResponseCache:
+    """LRU of LLM relevance verdicts, optionally persisted as JSON files in `directory`."""
+    return ResponseCache(
+        maxsize=maxsize,
+        ttl=ttl,
+        directory=directory,
+        namespace="relevance",
+        cacheable=_cacheable_verdict,
+    )
+
+
+def verdict_cache_from_env() -> ResponseCache:
+    return verdict_cache(
+        maxsize=int(os.getenv("GUARDRAIL_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("GUARDRAIL_CACHE_TTL", str(24 * 3600))) or None,
+        directory=os.getenv("GUARDRAIL_CACHE_DIR") or None,
+    )
 
 
 class InputValidator:
     """
     Handles security and relevance filtering for user prompts.
+
+    The heuristics are one compiled regex with a named group per category
+    (injection, greeting, identity, keyword, province), built at construction
+    time and run once over the accent-folded prompt. Prompts they cannot
+    decide go to the local relevance classifier, which accepts confident
+    matches and rejects prompts below a stricter threshold calibrated at
+    training time; everything in between goes to the LLM. LLM verdicts are
+    cached by normalized question and relevance model.
     """
 
-    def __init__(self, relevance_model: str = "openai/gpt-4o-mini"):
+    def __init__(
+        self,
+        relevance_model: str = "openai/gpt-4o-mini",
+        classifier: Optional[RelevanceClassifier] = None,
+        confidence: Optional[float] = None,
+        verdicts: Optional[ResponseCache] = None,
+        reject_below: Optional[float] = None,
+    ):
         self.relevance_model = relevance_model
+        self.verdicts = verdicts if verdicts is not None else verdict_cache_from_env()
+        self.classifier = classifier if classifier is not None else RelevanceClassifier.from_env()
+        # The classifier accepts when P(relevant) >= confidence and rejects when
+        # P(relevant) <= reject_below, by default the artifact's calibrated value
+        self.confidence = (
+            confidence
+            if confidence is not None
+            else float(os.getenv("GUARDRAIL_CLASSIFIER_CONFIDENCE", "0.9"))
+        )
+        if reject_below is None:
+            calibrated = self.classifier.metrics.get("reject_below", 0.0) if self.classifier else 0.0
+            reject_below = float(os.getenv("GUARDRAIL_CLASSIFIER_REJECT", calibrated))
+        self.reject_below = reject_below
+        self.injection_patterns = list(INJECTION_PATTERNS)
+        groups = {
+            # Prefixes: "bypassing", "jailbreaking"
+            "injection": _trie(self.injection_patterns),
+            "greeting": _trie(GREETINGS) + r"\b",
+            "identity": _trie(IDENTITY) + r"\b",
+            "keyword": _trie(KEYWORDS) + r"\b",
+            # Exact names and aliases; typos are checked separately
+            "province": _trie(province_index().spellings) + r"\b",
+        }
+        # Every phrase starts at a word boundary
+        self._matcher = re.compile(
+            r"\b(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in groups.items()) + ")"
+        )
 
-        # Patterns for common prompt injection attempts
-        self.injection_patterns = [
-            r"ignore previous instructions",
-            r"ignore all previous",
-            r"forget everything",
-            r"system prompt",
-            r"new rules",
-            r"you are now a",
-            r"bypass",
-            r"dan mode",
-            r"jailbreak",
-        ]
+    def scan(self, text: str) -> Set[str]:
+        """Categories matched anywhere in `text`, in a single pass."""
+        return {m.lastgroup for m in self._matcher.finditer(fold(text))}
 
     def check_injection(self, text: str) -> bool:
         """Returns True if a potential prompt injection is detected."""
-        text_lower = text.lower()
-        for pattern in self.injection_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        return False
+        return "injection" in self.scan(text)
 
-    def is_relevant(self, text: str) -> Tuple[bool, str]:
+    def is_relevant(self, text: str, found: Optional[Set[str]] = None) -> Tuple[bool, str]:
         """
         Determines if the query is relevant using heuristics first, then a small LLM.
+        `found` is the result of `scan(text)`, when the caller already has it.
         """
-        clean_text = text.strip().lower()
+        found = self.scan(text) if found is None else found
+        verdict = self._quick_relevance(text, found)
+        if verdict is not None:
+            return verdict
 
+        # 5. LLM Fallback for ambiguous cases
+        verdict = self._llm_relevance(text)
+        self.verdicts.put(verdict_key(text, self.relevance_model), verdict)
+        return verdict
+
+    def _quick_relevance(self, text: str, found: Set[str]) -> Optional[Tuple[bool, str]]:
+        """The verdict of every check short of an LLM call, or None if only the LLM can decide."""
         # 1. Expanded Heuristic Pass (Greetings & Identity)
-        greetings = ["hello", "hola", "hi", "hey", "buenos dias", "buenas tardes"]
-        identity = [
-            "quien sos",
-            "quién sos",
-            "who are you",
-            "tu nombre",
-            "your name",
-            "what are you",
-            "que sos",
-            "qué sos",
-        ]
-        if any(word in clean_text for word in greetings + identity):
+        if "greeting" in found or "identity" in found:
             return True, "Greeting/Identity"
 
-        # 2. Data Keyword "Fast Pass" (Spanish & English)
-        # Includes all Argentinian provinces and key economic terms
-        provinces = [
-            "buenos aires",
-            "caba",
-            "catamarca",
-            "chaco",
-            "chubut",
-            "cordoba",
-            "corrientes",
-            "entre rios",
-            "formosa",
-            "jujuy",
-            "la pampa",
-            "la rioja",
-            "mendoza",
-            "misiones",
-            "neuquen",
-            "rio negro",
-            "salta",
-            "san juan",
-            "san luis",
-            "santa cruz",
-            "santa fe",
-            "santiago del estero",
-            "tierra del fuego",
-            "tucuman",
-        ]
-        keywords = [
-            "salario",
-            "sueldo",
-            "cobran",
-            "pagan",
-            "ganan",
-            "salary",
-            "pay",
-            "earn",
-            "inflacion",
-            "inflation",
-            "ipc",
-            "cpi",
-            "canasta",
-            "pobreza",
-            "poverty",
-            "ranking",
-            "top",
-            "bottom",
-            "peores",
-            "mejores",
-            "loss",
-            "perdimos",
-            "ganamos",
-            "poder adquisitivo",
-            "purchasing power",
-            "evolucion",
-            "evolution",
-        ]
-
-        if any(prov in clean_text for prov in provinces) or any(
-            key in clean_text for key in keywords
-        ):
+        # 2. Data Keyword "Fast Pass" (Spanish & English), with province names
+        # and aliases matched the way the agent tools resolve them (salary_data/provinces.py)
+        if "keyword" in found or "province" in found or province_index().fuzzy_mention(text):
             return True, "Heuristic_Match"
 
-        # 3. LLM Fallback for ambiguous cases
+        # 3. Local classifier, when it is confident either way. The reject side
+        # is stricter: a middling score may just be an unfamiliar phrasing.
+        if self.classifier is not None:
+            p = self.classifier.predict(text)
+            if p >= self.confidence:
+                return True, f"Classifier_Match: {p:.2f}"
+            if p <= self.reject_below:
+                return False, f"Classifier_Reject: {p:.2f}"
+
+        # 4. An LLM verdict for the same question
+        cached = self.verdicts.get(verdict_key(text, self.relevance_model))
+        if cached is not None:
+            return bool(cached[0]), cached[1]
+        return None
+
+    def _llm_relevance(self, text: str) -> Tuple[bool, str]:
         prompt = f"""
         Determine if the user query is about Argentine economy, teacher salaries, or provincial data.
         Relevant topics include: salaries, inflation, poverty, rankings, and economic comparisons in Argentina.
@@ -125,6 +248,10 @@ class InputValidator:
         """
 
         try:
+            # Imported here: litellm takes seconds to import and is only needed
+            # for queries the heuristics cannot decide
+            import litellm
+
             response = litellm.completion(
                 model=self.relevance_model,
                 messages=[{"role": "user", "content": prompt}],
@@ -146,21 +273,33 @@ class InputValidator:
             print(f"[GUARDRAILS ERROR] Relevance check failed: {e}")
             return True, "ERROR_FALLBACK"
 
+    def cache_stats(self) -> dict:
+        """Hits, misses and size of the LLM verdict cache; disk hits are in `disk_hits`."""
+        return self.verdicts.stats()
+
+    def precheck(self, text: str) -> Optional[Tuple[bool, str]]:
+        """
+        `validate` without the LLM call: (is_valid, error_message), or None when
+        only the LLM can decide. Takes microseconds.
+        """
+        found = self.scan(text)
+        if "injection" in found:
+            return False, INJECTION_MESSAGE
+        verdict = self._quick_relevance(text, found)
+        if verdict is None:
+            return None
+        return (True, "") if verdict[0] else (False, OFF_TOPIC_MESSAGE)
+
     def validate(self, text: str) -> Tuple[bool, str]:
         """
         Full validation pipeline. Returns (is_valid, error_message).
         """
-        if self.check_injection(text):
-            return (
-                False,
-                "⚠️ **Security alert:** Potential prompt injection detected. Please rephrase your question.",
-            )
+        found = self.scan(text)
+        if "injection" in found:
+            return False, INJECTION_MESSAGE
 
-        relevant, reason = self.is_relevant(text)
+        relevant, reason = self.is_relevant(text, found)
         if not relevant:
-            return (
-                False,
-                "I'm sorry, I can only answer questions related to Argentinian teacher salaries and economic data.",
-            )
+            return False, OFF_TOPIC_MESSAGE
 
         return True, ""
@@ -0,0 +1,177 @@
+"""
+Background job queue for slow chat requests.
+
+An agent run can take tens of seconds. Run inline in a Dash callback, it holds
+a request worker (a gunicorn thread, a Lambda invocation) for the whole
+ReAct loop. `JobQueue` runs it on a bounded thread pool instead and hands back
+a job id that the UI polls with short, cheap requests.
+
+Jobs submitted with `submit_stream` run a generator; its latest yielded value
+is exposed as the job's partial result while it runs (streamed answers).
+
+Results live in memory and, when a directory is configured, as small JSON
+files too, so a poll served by another worker process on the same host still
+finds them. Without a directory, polls must reach the process that ran the
+job, so running several worker processes then is a misconfiguration.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PENDING = "pending"
+DONE = "done"
+ERROR = "error"
+UNKNOWN = "unknown"
+
+
+def worker_processes() -> int:
+    """Worker processes gunicorn is configured with (WEB_CONCURRENCY or -w/--workers), 1 if unknown."""
+    match = re.search(r"(?:-w|--workers)[=\s]+(\d+)", os.getenv("GUNICORN_CMD_ARGS", ""))
+    value = match.group(1) if match else os.getenv("WEB_CONCURRENCY", "1")
+    try:
+        return int(value)
+    except ValueError:
+        return 1
+
+
+class JobQueue:
+    """Runs callables on a worker pool and tracks their results by job id."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        ttl: float = 600,
+        directory: Optional[str] = None,
+    ):
+        self.max_workers = max_workers
+        # Seconds a finished job's result is kept for polling
+        self.ttl = ttl
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="chat-job"
+        )
+        # job id -> (submitted at, future)
+        self._jobs: Dict[str, Tuple[float, Future]] = {}
+        # job id -> latest value yielded by a streaming job (memory only)
+        self._partials: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        directory = os.getenv("CHAT_JOB_DIR") or None
+        processes = worker_processes()
+        if directory is None and processes > 1:
+            print(
+                f"[Jobs] WARNING: {processes} worker processes and CHAT_JOB_DIR not set. "
+                "Polls served by another worker will report async chat jobs as unknown."
+            )
+        return cls(
+            max_workers=int(os.getenv("CHAT_WORKERS", "4")),
+            ttl=float(os.getenv("CHAT_JOB_TTL", "600")),
+            directory=directory,
+        )
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _write(self, job_id: str, entry: dict):
+        if not self.directory:
+            return
+        try:
+            # Write-then-rename, so concurrent readers never see partial JSON
+            tmp_path = f"{self._path(job_id)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({**entry, "updated_at": time.time()}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(job_id))
+        except OSError as e:
+            print(f"[Jobs] Failed to persist job {job_id}: {e}")
+
+    def _run(self, job_id: str, fn: Callable, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._write(job_id, {"state": ERROR, "error": str(e)})
+            raise
+        self._write(job_id, {"state": DONE, "result": result})
+        return result
+
+    def _drain(self, job_id: str, gen_fn: Callable, *args, **kwargs):
+        gen = gen_fn(*args, **kwargs)
+        while True:
+            try:
+                self._partials[job_id] = next(gen)
+            except StopIteration as stop:
+                return stop.value
+
+    def submit_stream(self, gen_fn: Callable, *args, **kwargs) -> str:
+        """Queues a generator function; its return value is the job result."""
+        job_id = uuid.uuid4().hex
+        return self.submit(self._drain, job_id, gen_fn, *args, job_id=job_id, **kwargs)
+
+    def submit(self, fn: Callable, *args, job_id: Optional[str] = None, **kwargs) -> str:
+        """Queues `fn(*args, **kwargs)` and returns its job id."""
+        self._prune()
+        job_id = job_id or uuid.uuid4().hex
+        self._write(job_id, {"state": PENDING})
+        future = self._executor.submit(self._run, job_id, fn, args, kwargs)
+        with self._lock:
+            self._jobs[job_id] = (time.time(), future)
+        return job_id
+
+    def status(self, job_id: str) -> dict:
+        """{"state": pending | done | error | unknown, "result" | "error": ...}"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if entry is not None:
+            future = entry[1]
+            if not future.done():
+                partial = self._partials.get(job_id)
+                if partial is None:
+                    return {"state": PENDING}
+                return {"state": PENDING, "partial": partial}
+            if future.exception() is not None:
+                return {"state": ERROR, "error": str(future.exception())}
+            return {"state": DONE, "result": future.result()}
+        if self.directory:
+            try:
+                with open(self._path(job_id), "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (FileNotFoundError, ValueError):
+                pass
+        return {"state": UNKNOWN}
+
+    def discard(self, job_id: str):
+        """Forgets a job once its result has been delivered."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._partials.pop(job_id, None)
+        if self.directory:
+            try:
+                os.remove(self._path(job_id))
+            except OSError:
+                pass
+
+    def _prune(self):
+        """Drops finished jobs nobody polled within the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, (submitted, future) in self._jobs.items()
+                if submitted < cutoff and future.done()
+            ]
+        for job_id in expired:
+            self.discard(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(not future.done() for _, future in self._jobs.values())
+            return {"jobs": len(self._jobs), "pending": running, "max_workers": self.max_workers}
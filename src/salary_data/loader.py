@@ -1,16 +1,87 @@
 import os
+import json
+import hashlib
 import pandas as pd
 import boto3
-from io import BytesIO
-from typing import Dict, Optional
-from salary_data.scraper import Scraper
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from salary_data.scraper import Scraper, BROWSER_HEADERS
 from salary_data.analytics import AnalyticsPipeline
+from salary_data.storage import (
+    S3Backend,
+    get_local_backend,
+    get_profile,
+    to_parquet_bytes,
+    read_parquet_bytes,
+    parquet_columns,
+)
+
+# Dataset name -> object key, relative to a snapshot prefix.
+# Buckets published before versioned snapshots store them at these keys directly.
+DATA_KEYS = {
+    "net_salaries": "raw/net_salaries.parquet",
+    "gross_salaries": "raw/gross_salaries.parquet",
+    "basic_salaries": "raw/basic_salaries.parquet",
+    "inflation_ipc": "raw/inflation_ipc.parquet",
+    "poverty_lines": "raw/poverty_lines.parquet",
+    "clusters": "artifacts/clusters.parquet",
+    "anomalies": "artifacts/anomalies.parquet",
+}
+
+# Pointer to the active snapshot. Always written last, after every object it references.
+CURRENT_KEY = "current.json"
+SNAPSHOT_PREFIX = "snapshots"
+
+# Snapshot objects never change once written, so they can be cached forever;
+# the pointer must always be revalidated.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+POINTER_CACHE_CONTROL = "no-cache, max-age=0"
+
+# Raw sources the analytics pipeline (real salary) is trained on
+ANALYTICS_INPUTS = ("net_salaries", "inflation_ipc")
+
+
+def hash_bytes(content: bytes) -> str:
+    """SHA-256 hex digest of raw bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame (values, index, column names and dtypes).
+    Unlike hashing the Parquet bytes, it does not depend on writer metadata.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode("utf-8"))
+    digest.update(repr([str(t) for t in df.dtypes]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
 
 
 class DataLoader:
-    """Handles loading and caching data from S3 or local fallback."""
+    """
+    Handles loading and caching data from S3 or local fallback.
+
+    Objects are read and written through a StorageBackend selected with
+    DATA_STORAGE_BACKEND: "s3" (default), "local" or "memory".
+    """
 
     def __init__(self):
+        # Parquet encoding used for uploads (see salary_data/storage.py)
+        self.profile = get_profile()
+
+        self.scraper = Scraper()
+        self.pipeline = AnalyticsPipeline()
+
+        backend = os.getenv("DATA_STORAGE_BACKEND", "s3")
+        if backend != "s3":
+            self.bucket = None
+            self.s3_client = None
+            self.storage = get_local_backend(backend)
+            print(f"[DataLoader] Using '{backend}' storage backend.")
+            return
+
         self.bucket = os.getenv("AWS_S3_BUCKET")
         self.region = os.getenv("AWS_REGION", "us-east-1")
 
@@ -38,65 +109,158 @@ class DataLoader:
                 # Boto3's default credential chain handles IAM Roles and ASIA keys automatically.
                 print("[DataLoader] Relying on default credential chain / IAM Role.")
                 self.s3_client = boto3.client("s3", region_name=self.region)
+            self.storage = S3Backend(self.s3_client, self.bucket)
         else:
             print("[DataLoader] WARNING: AWS_S3_BUCKET not set.")
             self.s3_client = None
+            self.storage = None
 
-        self.scraper = Scraper()
-        self.pipeline = AnalyticsPipeline()
+    def _load_from_s3(
+        self, key: str, columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """Loads a Parquet file from storage, decoding only `columns` if given."""
+        if not self.storage:
+            return None
+        try:
+            return read_parquet_bytes(self.storage.get(key), columns=columns)
+        except Exception as e:
+            print(f"[DataLoader] Failed to load {key} from {self.storage.name}: {e}")
+            return None
 
-    def _load_from_s3(self, key: str) -> Optional[pd.DataFrame]:
-        """Loads a Parquet file from S3."""
-        if not self.s3_client or not self.bucket:
+    def _save_to_s3(
+        self, df: pd.DataFrame, key: str, cache_control: Optional[str] = None
+    ) -> bool:
+        """Saves a DataFrame to storage as Parquet. Returns True on success."""
+        if not self.storage:
+            return False
+        try:
+            body = to_parquet_bytes(df, self.profile)
+            self.storage.put(key, body, cache_control=cache_control)
+            print(f"[DataLoader] Saved {key} to {self.storage.name}.")
+            return True
+        except Exception as e:
+            print(f"[DataLoader] Failed to save {key} to {self.storage.name}: {e}")
+            return False
+
+    def _load_json(self, key: str) -> Optional[dict]:
+        """Loads a small JSON document from storage."""
+        if not self.storage:
             return None
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-            return pd.read_parquet(BytesIO(response["Body"].read()))
+            return json.loads(self.storage.get(key))
+        except KeyError:
+            return None
         except Exception as e:
-            print(f"[DataLoader] Failed to load {key} from S3: {e}")
+            print(f"[DataLoader] Failed to load {key} from {self.storage.name}: {e}")
             return None
 
-    def _save_to_s3(self, df: pd.DataFrame, key: str):
-        """Saves a DataFrame to S3 as Parquet."""
-        if not self.s3_client or not self.bucket:
-            return
+    def _save_json(
+        self, obj: dict, key: str, cache_control: Optional[str] = None
+    ) -> bool:
+        """Saves a small JSON document to storage. Returns True on success."""
+        if not self.storage:
+            return False
         try:
-            out_buffer = BytesIO()
-            df.to_parquet(out_buffer, index=True)
-            self.s3_client.put_object(
-                Bucket=self.bucket, Key=key, Body=out_buffer.getvalue()
+            self.storage.put(
+                key,
+                json.dumps(obj, indent=2).encode("utf-8"),
+                content_type="application/json",
+                cache_control=cache_control,
             )
-            print(f"[DataLoader] Saved {key} to S3.")
+            print(f"[DataLoader] Saved {key} to {self.storage.name}.")
+            return True
         except Exception as e:
-            print(f"[DataLoader] Failed to save {key} to S3: {e}")
+            print(f"[DataLoader] Failed to save {key} to {self.storage.name}: {e}")
+            return False
+
+    def resolve_current(self) -> Optional[dict]:
+        """Reads the `current` pointer. Returns None for legacy (unversioned) buckets."""
+        pointer = self._load_json(CURRENT_KEY)
+        if pointer and pointer.get("objects"):
+            return pointer
+        return None
+
+    def _legacy_manifest(self) -> Optional[dict]:
+        """Manifest for unversioned buckets, versioned by the ETags of the fixed keys."""
+        digest = hashlib.sha256()
+        for key in DATA_KEYS.values():
+            try:
+                etag = self.storage.head(key)
+            except Exception as e:
+                print(f"[DataLoader] Failed to read ETag for {key}: {e}")
+                return None
+            digest.update(f"{key}={etag};".encode("utf-8"))
+        return {"version": f"etag-{digest.hexdigest()[:12]}", "objects": dict(DATA_KEYS)}
+
+    def get_manifest(self) -> Optional[dict]:
+        """
+        Returns the active dataset manifest: {"version": str, "objects": {name: key}}.
+        A single small GET of the pointer; legacy buckets fall back to HEAD requests.
+        Returns None if storage is not configured or unreachable.
+        """
+        if not self.storage:
+            return None
+        pointer = self.resolve_current()
+        if pointer:
+            return pointer
+        return self._legacy_manifest()
+
+    def _dataset_key(self, name: str, manifest: Optional[dict] = None) -> str:
+        if manifest is None:
+            manifest = self.resolve_current()
+        return (manifest["objects"] if manifest else DATA_KEYS)[name]
 
-    def get_all_data(self) -> Dict[str, pd.DataFrame]:
+    def load_dataset(
+        self,
+        name: str,
+        columns: Optional[List[str]] = None,
+        manifest: Optional[dict] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Loads a single dataset, decoding only `columns` (e.g. one `infl_*`
+        category of the IPC frame) when given. The index is always included.
+        """
+        return self._load_from_s3(self._dataset_key(name, manifest), columns=columns)
+
+    def dataset_columns(
+        self, name: str, manifest: Optional[dict] = None
+    ) -> Optional[List[str]]:
+        """Lists a dataset's columns from the Parquet footer, without decoding data."""
+        if not self.storage:
+            return None
+        key = self._dataset_key(name, manifest)
+        try:
+            return parquet_columns(self.storage.get(key))
+        except Exception as e:
+            print(f"[DataLoader] Failed to read schema of {key}: {e}")
+            return None
+
+    def get_all_data(
+        self, allow_scrape: bool = True, manifest: Optional[dict] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Main entry point for the app to get all necessary data.
         Tries S3 first, then scrapes/calculates if missing.
+        With allow_scrape=False only what is in S3 is returned.
+
+        The snapshot pointer is resolved once (or taken from `manifest`) and all
+        objects are then fetched in parallel, so every frame comes from the
+        same published version.
         """
         data = {}
+        if manifest is None:
+            manifest = self.resolve_current()
+        keys = manifest["objects"] if manifest else DATA_KEYS
 
-        # Keys mapping
-        keys = {
-            "net_salaries": "raw/net_salaries.parquet",
-            "gross_salaries": "raw/gross_salaries.parquet",
-            "basic_salaries": "raw/basic_salaries.parquet",
-            "inflation_ipc": "raw/inflation_ipc.parquet",
-            "poverty_lines": "raw/poverty_lines.parquet",
-            "clusters": "artifacts/clusters.parquet",
-            "anomalies": "artifacts/anomalies.parquet",
-        }
-
-        loaded_count = 0
-        for name, key in keys.items():
-            df = self._load_from_s3(key)
-            if df is not None:
-                data[name] = df
-                loaded_count += 1
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            frames = executor.map(self._load_from_s3, keys.values())
+            for name, df in zip(keys, frames):
+                if df is not None:
+                    data[name] = df
+        loaded_count = len(data)
 
         # If any data is missing from S3, perform a full scrape (fallback)
-        if loaded_count < len(keys):
+        if loaded_count < len(keys) and allow_scrape:
             # CRITICAL: Do NOT auto-scrape in Lambda production environment as it causes timeouts (10s+).
             # The bucket should be primed beforehand.
             if os.getenv("LAMBDA_TASK_ROOT"):
@@ -116,15 +280,50 @@ class DataLoader:
 
         return data
 
-    def scrape_and_process_all(self) -> Dict[str, pd.DataFrame]:
-        """Performs a full scrape and analytics run."""
+    def fetch_raw_sources(self) -> Dict[str, bytes]:
+        """Downloads every raw source file without parsing it."""
+        print("[DataLoader] Downloading raw sources...")
+        s = self.scraper
+        return {
+            "net_salaries": s.download(s.URL_TESTIGO_NETO),
+            "gross_salaries": s.download(s.URL_TESTIGO_BRUTO),
+            "basic_salaries": s.download(s.URL_BASICO),
+            "inflation_ipc": s.download(s.URL_IPC),
+            "poverty_lines": s.download(s.URL_CBA_CBT, headers=BROWSER_HEADERS),
+        }
+
+    def scrape_and_process_all(
+        self, raw_sources: Optional[Dict[str, bytes]] = None, run_analytics: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Performs a full scrape and analytics run.
+        Pre-downloaded `raw_sources` (see fetch_raw_sources) are parsed instead of
+        re-downloaded. With run_analytics=False, clusters/anomalies are omitted.
+        """
         print("[DataLoader] Scraping all data sources...")
+        raw = raw_sources or {}
+
+        df_net = self.scraper.get_cgecse_salaries(
+            self.scraper.URL_TESTIGO_NETO, content=raw.get("net_salaries")
+        )
+        df_gross = self.scraper.get_cgecse_salaries(
+            self.scraper.URL_TESTIGO_BRUTO, content=raw.get("gross_salaries")
+        )
+        df_basic = self.scraper.get_cgecse_salaries(
+            self.scraper.URL_BASICO, content=raw.get("basic_salaries")
+        )
+        df_ipc = self.scraper.get_ipc_indec(content=raw.get("inflation_ipc"))
+        df_poverty = self.scraper.get_cba_cbt(content=raw.get("poverty_lines"))
 
-        df_net = self.scraper.get_cgecse_salaries(self.scraper.URL_TESTIGO_NETO)
-        df_gross = self.scraper.get_cgecse_salaries(self.scraper.URL_TESTIGO_BRUTO)
-        df_basic = self.scraper.get_cgecse_salaries(self.scraper.URL_BASICO)
-        df_ipc = self.scraper.get_ipc_indec()
-        df_poverty = self.scraper.get_cba_cbt()
+        data = {
+            "net_salaries": df_net,
+            "gross_salaries": df_gross,
+            "basic_salaries": df_basic,
+            "inflation_ipc": df_ipc,
+            "poverty_lines": df_poverty,
+        }
+        if not run_analytics:
+            return data
 
         # Align data for analytics (Dec 2016 onwards)
         START_LIMIT = "2016-12-01"
@@ -142,27 +341,90 @@ class DataLoader:
         print("[DataLoader] Running analytics pipeline...")
         df_clusters, df_anomalies = self.pipeline.run_pipeline(df_real)
 
-        return {
-            "net_salaries": df_net,
-            "gross_salaries": df_gross,
-            "basic_salaries": df_basic,
-            "inflation_ipc": df_ipc,
-            "poverty_lines": df_poverty,
-            "clusters": df_clusters,
-            "anomalies": df_anomalies,
-        }
+        data["clusters"] = df_clusters
+        data["anomalies"] = df_anomalies
+        return data
+
+    def upload_all_to_s3(self, data: Dict[str, pd.DataFrame]) -> Optional[str]:
+        """Uploads the entire dataset to S3 as a new snapshot."""
+        return self.publish_snapshot(data, force=True)
+
+    def load_hashes(self) -> dict:
+        """Returns the hashes recorded in the current snapshot pointer ({} if none)."""
+        pointer = self.resolve_current() or {}
+        return {"sources": pointer.get("sources", {}), "objects": pointer.get("hashes", {})}
+
+    def publish_snapshot(
+        self,
+        data: Dict[str, pd.DataFrame],
+        source_hashes: Optional[Dict[str, str]] = None,
+        force: bool = False,
+    ) -> Optional[str]:
+        """
+        Publishes `data` as a new immutable snapshot under snapshots/<version>/
+        and then switches the `current` pointer to it.
+
+        Datasets whose content hash matches the previous snapshot are not
+        re-uploaded; the new manifest references the previous (immutable)
+        object instead. Datasets missing from `data` (e.g. analytics that were
+        not retrained) are carried over as well. If any upload fails, the
+        pointer is left untouched and None is returned.
+        """
+        previous = self.resolve_current() or {}
+        prev_objects = previous.get("objects", {})
+        prev_hashes = previous.get("hashes", {})
+
+        new_hashes = {name: frame_hash(df) for name, df in data.items() if name in DATA_KEYS}
+        content_digest = hashlib.sha256(
+            json.dumps(new_hashes, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:8]
+        version = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{content_digest}"
+
+        objects, hashes = {}, {}
+        for name, rel_key in DATA_KEYS.items():
+            if name not in data:
+                if name in prev_objects:
+                    objects[name] = prev_objects[name]
+                    hashes[name] = prev_hashes.get(name)
+                continue
 
-    def upload_all_to_s3(self, data: Dict[str, pd.DataFrame]):
-        """Uploads the entire dataset to S3."""
-        keys = {
-            "net_salaries": "raw/net_salaries.parquet",
-            "gross_salaries": "raw/gross_salaries.parquet",
-            "basic_salaries": "raw/basic_salaries.parquet",
-            "inflation_ipc": "raw/inflation_ipc.parquet",
-            "poverty_lines": "raw/poverty_lines.parquet",
-            "clusters": "artifacts/clusters.parquet",
-            "anomalies": "artifacts/anomalies.parquet",
+            content_hash = new_hashes[name]
+            if not force and name in prev_objects and content_hash == prev_hashes.get(name):
+                print(f"[DataLoader] {name} unchanged. Reusing {prev_objects[name]}.")
+                objects[name] = prev_objects[name]
+            else:
+                key = f"{SNAPSHOT_PREFIX}/{version}/{rel_key}"
+                if not self._save_to_s3(data[name], key, cache_control=IMMUTABLE_CACHE_CONTROL):
+                    print(f"[DataLoader] Aborting snapshot {version}. Pointer not updated.")
+                    return None
+                objects[name] = key
+            hashes[name] = content_hash
+
+        manifest = {
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "previous_version": previous.get("version"),
+            "objects": objects,
+            "hashes": hashes,
+            "sources": source_hashes or previous.get("sources", {}),
         }
-        for name, key in keys.items():
-            if name in data:
-                self._save_to_s3(data[name], key)
+        # Keep a copy next to the objects so any version can be restored later
+        if not self._save_json(
+            manifest,
+            f"{SNAPSHOT_PREFIX}/{version}/manifest.json",
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        ):
+            return None
+        # The atomic switch: readers see either the old or the new version
+        if not self._save_json(manifest, CURRENT_KEY, cache_control=POINTER_CACHE_CONTROL):
+            return None
+        print(f"[DataLoader] Published snapshot {version}.")
+        return version
+
+    def rollback(self, version: str) -> bool:
+        """Points `current` back at a previously published snapshot."""
+        manifest = self._load_json(f"{SNAPSHOT_PREFIX}/{version}/manifest.json")
+        if not manifest:
+            print(f"[DataLoader] Snapshot {version} not found.")
+            return False
+        return self._save_json(manifest, CURRENT_KEY, cache_control=POINTER_CACHE_CONTROL)
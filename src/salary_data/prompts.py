@@ -0,0 +1,147 @@
+"""
+Prompt construction for the DataJournalistAgent, on a token budget.
+
+The system prompt describes each DataFrame with a compact schema summary (name,
+shape, date range, columns) instead of markdown head rows, and lists the
+provinces once. It depends only on the data, so it is built once per data
+version and stays byte-identical across requests. Providers that cache prompt
+prefixes (OpenAI and Anthropic do) then only bill and process the short
+per-question input at full price.
+
+Everything that changes per request (today's date, filters, history, the
+question) goes in `query_input`, after the static prefix.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from salary_data.cache import LRUCache
+
+# One system prompt per data version and prompt mode
+PROMPT_CACHE = LRUCache(maxsize=8)
+
+# Longest history message (in characters) repeated in the prompt
+HISTORY_CHARS = int(os.getenv("PROMPT_HISTORY_CHARS", "600"))
+
+FRAME_DESCRIPTIONS = {
+    "nominal_salaries": "net teacher salary in ARS, one column per province",
+    "real_salaries": "net salary deflated by the IPC (purchasing power), one column per province",
+    "inflation_ipc": "INDEC consumer price index levels; infl_Nivel_general is the headline index",
+    "poverty_lines": "poverty (linea_pobreza, CBT) and indigence (linea_indigencia, CBA) lines for a family of 4",
+    "anomalies": "long format; anomaly = 1 marks an unusual drop or gain in real salary",
+}
+
+
+# Columns listed per frame before eliding the rest
+MAX_COLUMNS = 8
+_KINDS = {"f": "float", "i": "int", "u": "int", "b": "bool", "M": "date", "O": "text"}
+
+
+def prompt_mode() -> str:
+    """'compact' (schema summaries, the default) or 'full' (markdown head rows)."""
+    return os.getenv("AGENT_PROMPT_MODE", "compact")
+
+
+def describe_frame(name: str, df: pd.DataFrame, provinces: List[str]) -> str:
+    """One-line schema of a DataFrame, without any data rows."""
+    parts = [f"{df.shape[0]} rows"]
+    if isinstance(df.index, pd.DatetimeIndex) and len(df.index):
+        parts.append(
+            f"date index {df.index.min().strftime('%Y-%m')} to {df.index.max().strftime('%Y-%m')}"
+        )
+    columns = list(df.columns)
+    if columns == provinces:
+        parts.append("columns: the provinces listed above")
+    else:
+        shown = ", ".join(
+            f"{c} ({_KINDS.get(df[c].dtype.kind, df[c].dtype.name)})" for c in columns[:MAX_COLUMNS]
+        )
+        more = f", ... {len(columns) - MAX_COLUMNS} more" if len(columns) > MAX_COLUMNS else ""
+        parts.append(f"columns: {shown}{more}")
+    description = FRAME_DESCRIPTIONS.get(name, "")
+    return f"{name}: {description}. " + "; ".join(parts) + "."
+
+
+def schema_block(dfs_dict: Dict[str, pd.DataFrame]) -> str:
+    """Schemas of the frames, named as the Python tool exposes them (df1, df2, ...)."""
+    provinces = list(dfs_dict["nominal_salaries"].columns)
+    lines = ["DATAFRAMES (available in the Python tool as df1, df2, ... in this order):"]
+    for i, (name, df) in enumerate(dfs_dict.items(), start=1):
+        if df is not None:
+            lines.append(f"df{i} " + describe_frame(name, df, provinces))
+    return "\n".join(lines)
+
+
+SYSTEM_TEMPLATE = """You are "Lia", the AI Data Journalist for the Teacher Salaries Dashboard.
+Your persona is professional, helpful, and data-driven.
+
+IDENTITY & CONTEXT:
+- If asked "Who are you?" or "What can you do?", explain that you are an assistant designed to analyze Argentinian teacher salaries, inflation, provincial data, and anomalies (unusual drops or gains in real salary) using the dashboard's datasets.
+- Always be polite and professional.
+
+TOOL SELECTION RULES:
+1. TOOL PREFERENCE: Always prefer using the provided custom tools (`calculate_purchasing_power_loss`, `calculate_inflation_change`, `get_province_salary`, `get_ranking_top_k`). Only write your own Python code if a specific task cannot be accomplished with these tools.
+2. FOR EVOLUTION / CHANGE OVER TIME: Always use 'calculate_purchasing_power_loss' for salaries. If asked to compare against inflation, use 'calculate_inflation_change'.
+3. FOR SNAPSHOTS / CURRENT STATE: Use 'get_ranking_top_k' only to compare salaries at a single point in time (e.g., "highest salary in Jan 2024").
+4. FOR SINGLE PROVINCE: Use 'get_province_salary'.
+
+LANGUAGE & OUTPUT RULES:
+1. RESPONSE LANGUAGE: Respond in the language given with the question (Spanish for Spanish, English for English).
+2. DATE CLARITY: ALWAYS mention the exact date range (YYYY-MM to YYYY-MM) in your final answer.
+3. RELATIVE DATES: Treat "last year" or "last X years" relative to the "Latest data point" given with the question, not today's date.
+4. COMPLETE SENTENCES: Always include the DATA (numbers/percentages) in a concise, natural sentence.
+5. PERCENTAGES: When discussing loss or gain, ALWAYS include the percentage (%) provided by the tool.
+
+BEHAVIORAL RULES:
+1. For general conversation or identity questions, respond DIRECTLY without using tools.
+2. EDGE CASES: If a user asks about a province or location not in the dataset (e.g., fictional places like "Narnia"), politely state that it is not a valid province instead of using tools.
+3. ALWAYS provide a clear, conversational answer to the user.
+
+DATA SPECS:
+- Range: {date_min} to {date_max}.
+- Provinces: {provinces}
+{schemas}"""
+
+
+def system_prompt(dfs_dict: Dict[str, pd.DataFrame], data_version: str, mode: str) -> str:
+    """The static system prefix, built once per data version and mode."""
+
+    def build():
+        df_net = dfs_dict["nominal_salaries"]
+        return SYSTEM_TEMPLATE.format(
+            date_min=df_net.index.min().strftime("%Y-%m-%d"),
+            date_max=df_net.index.max().strftime("%Y-%m-%d"),
+            provinces=", ".join(df_net.columns),
+            schemas="\n" + schema_block(dfs_dict) if mode == "compact" else "",
+        )
+
+    return PROMPT_CACHE.get_or_compute("system", (data_version, mode), build)
+
+
+def query_input(
+    user_prompt: str,
+    lang: str,
+    date_max: str,
+    today: str,
+    context_metadata: Optional[dict] = None,
+    chat_history: Optional[list] = None,
+) -> str:
+    """The per-question input, kept short: the instructions live in the system prompt."""
+    blocks = []
+    if context_metadata:
+        blocks.append(f"DASHBOARD FILTERS: {context_metadata}")
+    if chat_history:
+        turns = []
+        for m in chat_history[-3:]:
+            content = str(m["content"])
+            if len(content) > HISTORY_CHARS:
+                content = content[:HISTORY_CHARS] + " [...]"
+            turns.append(f"{m['role'].upper()}: {content}")
+        blocks.append("RECENT CONVERSATION:\n" + "\n".join(turns))
+    blocks.append(
+        f"Today: {today}. Latest data point: {date_max}. Respond in {lang.upper()}."
+    )
+    blocks.append(f"USER QUESTION: {user_prompt}")
+    return "\n\n".join(blocks)
@@ -0,0 +1,173 @@
+"""
+Province name resolution shared by the agent tools, the intent router and the
+guardrails.
+
+`ProvinceIndex` is built once per set of names. It maps a user or LLM spelling
+to the canonical name in three steps:
+- exact match, ignoring case and accents ("cordoba" → "Córdoba");
+- aliases ("CABA", "Capital Federal", "PBA");
+- a fuzzy fallback for typos ("Cordova", "Neuquen Province"), with difflib
+  similarity against the folded names.
+
+Every resolution is counted by kind. Alias and fuzzy resolutions are lookups
+that an exact match would have missed; in the agent each of those used to
+return a "province not found" error and cost an extra LLM iteration.
+
+Only the standard library is used, so the guardrails can import it cheaply.
+"""
+
+import re
+import difflib
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# The 24 jurisdictions, as named in the salary data
+PROVINCES = (
+    "Buenos Aires",
+    "Catamarca",
+    "Chaco",
+    "Chubut",
+    "Ciudad de Buenos Aires",
+    "Córdoba",
+    "Corrientes",
+    "Entre Ríos",
+    "Formosa",
+    "Jujuy",
+    "La Pampa",
+    "La Rioja",
+    "Mendoza",
+    "Misiones",
+    "Neuquén",
+    "Río Negro",
+    "Salta",
+    "San Juan",
+    "San Luis",
+    "Santa Cruz",
+    "Santa Fe",
+    "Santiago del Estero",
+    "Tierra del Fuego",
+    "Tucumán",
+)
+
+# Alternate names for provinces, folded
+ALIASES = {
+    "caba": "Ciudad de Buenos Aires",
+    "capital federal": "Ciudad de Buenos Aires",
+    "ciudad autonoma de buenos aires": "Ciudad de Buenos Aires",
+    "ciudad de bs as": "Ciudad de Buenos Aires",
+    "pba": "Buenos Aires",
+    "provincia de buenos aires": "Buenos Aires",
+    "bs as": "Buenos Aires",
+    "tdf": "Tierra del Fuego",
+}
+
+# Wrappers stripped before matching ("Province of Salta", "Provincia de Salta")
+_PREFIX_RE = re.compile(r"^(?:the\s+)?(?:provincia|province)\s+(?:de|of)\s+|\s+(?:province|provincia)$")
+
+# Lowest difflib ratio accepted as a typo of a name
+FUZZY_CUTOFF = 0.85
+# In free text, lowercase words are mostly ordinary words ("missions"), so a
+# typo there must be closer than in a capitalized name
+LOWERCASE_MENTION_CUTOFF = 0.9
+
+
+def fold(text: str) -> str:
+    """Lowercase, accent-free form of a name, for matching user spellings."""
+    text = str(text)
+    if text.isascii():
+        return text.casefold().strip()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold().strip()
+
+
+def _key(name: str) -> str:
+    key = re.sub(r"[^\w\s]", " ", fold(name))
+    key = _PREFIX_RE.sub("", " ".join(key.split()))
+    return key.strip()
+
+
+class ProvinceIndex:
+    """Resolves province spellings to canonical names; see the module docstring."""
+
+    def __init__(self, names: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        names = list(names)
+        self._exact = {_key(n): n for n in names}
+        self._aliases = {
+            _key(a): p for a, p in (ALIASES if aliases is None else aliases).items() if p in names
+        }
+        self._keys = list(self._exact)
+        # All spellings, longest first, so "ciudad de buenos aires" wins over "buenos aires"
+        spellings = sorted({**self._aliases, **self._exact}.items(), key=lambda i: -len(i[0]))
+        self._patterns = [
+            (re.compile(r"\b" + re.escape(key) + r"\b"), name) for key, name in spellings
+        ]
+        # Folded names and aliases, longest first (for callers building their own matchers)
+        self.spellings = [key for key, _ in spellings]
+        self.tokens = {t for key, _ in spellings for t in key.split()}
+        self._counts = {"exact": 0, "alias": 0, "fuzzy": 0, "miss": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self._counts[kind] += 1
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical name for `name`, or None when nothing is close enough."""
+        key = _key(name)
+        if key in self._exact:
+            self._count("exact")
+            return self._exact[key]
+        if key in self._aliases:
+            self._count("alias")
+            return self._aliases[key]
+        close = difflib.get_close_matches(key, self._keys, n=1, cutoff=FUZZY_CUTOFF)
+        if close:
+            self._count("fuzzy")
+            return self._exact[close[0]]
+        self._count("miss")
+        return None
+
+    def find(self, text: str) -> List[str]:
+        """Canonical provinces mentioned in `text` (exact names and aliases), in order."""
+        text = " ".join(re.sub(r"[^\w\s]", " ", fold(text)).split())
+        found = []
+        for pattern, name in self._patterns:
+            match = pattern.search(text)
+            if match:
+                found.append((match.start(), name))
+                # Blank the span so shorter names inside it do not match again
+                text = text[: match.start()] + " " * len(match.group()) + text[match.end():]
+        return list(dict.fromkeys(name for _, name in sorted(found)))
+
+    def mentions(self, text: str) -> bool:
+        """Whether `text` names a province, allowing a typo in single words."""
+        return bool(self.find(text)) or self.fuzzy_mention(text) is not None
+
+    def fuzzy_mention(self, text: str) -> Optional[str]:
+        """The province a misspelled word of `text` is closest to, if any."""
+        for word in re.findall(r"\w+", str(text)):
+            if len(word) >= 5:
+                cutoff = FUZZY_CUTOFF if word[0].isupper() else LOWERCASE_MENTION_CUTOFF
+                close = difflib.get_close_matches(fold(word), self._keys, n=1, cutoff=cutoff)
+                if close:
+                    return self._exact[close[0]]
+        return None
+
+    def stats(self) -> dict:
+        """Resolutions by kind; alias + fuzzy are the misses an exact lookup would have had."""
+        with self._lock:
+            counts = dict(self._counts)
+        counts["retries_saved"] = counts["alias"] + counts["fuzzy"]
+        return counts
+
+
+_DEFAULT_INDEX: Optional[ProvinceIndex] = None
+
+
+def province_index() -> ProvinceIndex:
+    """Index over the static province list, for code that has no dataset (guardrails)."""
+    global _DEFAULT_INDEX
+    if _DEFAULT_INDEX is None:
+        _DEFAULT_INDEX = ProvinceIndex(PROVINCES)
+    return _DEFAULT_INDEX
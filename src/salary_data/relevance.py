@@ -0,0 +1,101 @@
+"""
+Local relevance classifier for the guardrails.
+
+A TF-IDF + logistic regression model over character n-grams, trained by
+`scripts/train_relevance.py` with scikit-learn and exported as plain JSON
+(`artifacts/relevance_classifier.json`): for every n-gram its idf and its
+weight (idf × coefficient). Inference needs neither scikit-learn nor numpy.
+It counts the n-grams of the prompt, looks them up in a dict, then takes a
+dot product and a sigmoid. That takes a few microseconds, compared with a
+few hundred milliseconds for an LLM relevance call.
+"""
+
+import os
+import re
+import json
+import math
+from collections import Counter
+from typing import List, Optional
+
+from salary_data.provinces import fold
+
+ARTIFACT_NAME = "relevance_classifier.json"
+FORMAT_VERSION = 1
+NGRAM_RANGE = (3, 5)
+
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+def char_ngrams(text: str, ngram_range=NGRAM_RANGE) -> List[str]:
+    """
+    Character n-grams of each accent-folded word, padded with spaces
+    (" sal", "alari"). Also the analyzer of the TfidfVectorizer at training
+    time, so both sides tokenize identically.
+    """
+    min_n, max_n = ngram_range
+    grams = []
+    for word in _NON_WORD_RE.sub(" ", fold(text)).split():
+        word = f" {word} "
+        for n in range(min_n, min(max_n, len(word)) + 1):
+            grams.extend(word[i : i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def default_path() -> Optional[str]:
+    """artifacts/relevance_classifier.json in the working directory or the project root."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for artifacts_dir in (os.path.join(os.getcwd(), "artifacts"), os.path.join(base_dir, "artifacts")):
+        path = os.path.join(artifacts_dir, ARTIFACT_NAME)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class RelevanceClassifier:
+    """Probability that a prompt is about the dashboard's data, from an exported model."""
+
+    def __init__(self, features: dict, intercept: float, ngram_range=NGRAM_RANGE, metrics=None):
+        # n-gram -> (idf, idf × coefficient)
+        self.features = {g: (v[0], v[1]) for g, v in features.items()}
+        self.intercept = intercept
+        self.ngram_range = tuple(ngram_range)
+        self.metrics = metrics or {}
+
+    @classmethod
+    def load(cls, path: str) -> "RelevanceClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported relevance classifier format: {data.get('format')}")
+        return cls(data["features"], data["intercept"], data["ngram_range"], data.get("metrics"))
+
+    @classmethod
+    def from_env(cls) -> Optional["RelevanceClassifier"]:
+        """
+        The classifier at GUARDRAIL_CLASSIFIER (a path, or "0" to disable),
+        or the bundled artifact. None if disabled, missing or unreadable.
+        """
+        setting = os.getenv("GUARDRAIL_CLASSIFIER", "")
+        if setting == "0":
+            return None
+        path = setting or default_path()
+        if not path:
+            print("[Guardrails] No relevance classifier artifact found; using the LLM fallback.")
+            return None
+        try:
+            return cls.load(path)
+        except Exception as e:
+            print(f"[Guardrails] Could not load relevance classifier {path}: {e}")
+            return None
+
+    def predict(self, text: str) -> float:
+        """P(relevant) for `text`."""
+        score = norm = 0.0
+        for gram, count in Counter(char_ngrams(text, self.ngram_range)).items():
+            feature = self.features.get(gram)
+            if feature is not None:
+                # TF-IDF with l2 normalization over the known n-grams, as scikit-learn does
+                norm += (count * feature[0]) ** 2
+                score += count * feature[1]
+        z = self.intercept + (score / math.sqrt(norm) if norm else 0.0)
+        return 1.0 / (1.0 + math.exp(-z))
@@ -0,0 +1,135 @@
+"""
+Cluster analysis reports, precompiled into dashboard slides.
+
+The Markdown reports are split into an intro, one section per cluster and a
+synthesis at build time (`scripts/build_reports.py`), with citations already
+turned into links and slide titles already extracted. The dashboard only loads
+the resulting JSON artifact, so no report parsing happens at startup or in
+callbacks.
+"""
+
+import os
+import re
+import json
+from typing import Dict, Optional
+
+REPORTS_DIR = "reports"
+REPORT_FILES = {
+    "en": "cluster_analysis_report.md",
+    "es": "cluster_analysis_report_es.md",
+}
+SECTIONS_FILE = "report_sections.json"
+
+CLUSTER_HEADING = re.compile(r"## \*\*Cluster \d: (.*?)\*\*")
+SYNTHESIS_HEADING = re.compile(
+    r"## \*\*(?:Synthesis and Future Outlook|Síntesis y Perspectivas Futuras): (.*?)\*\*"
+)
+
+
+def empty_sections() -> dict:
+    return {"intro": "", "clusters": [], "synthesis": {"title": None, "body": ""}}
+
+
+def process_citations(text):
+    """Converts citation numbers in [[N]] format to superscript links."""
+    # 1. Citations in text: Match [[N]] and convert to <sup><a href="#refN">N</a></sup>
+    text = re.sub(r"\[\[(\d{1,2})\]\]", r'<sup><a href="#ref\1">\1</a></sup>', text)
+
+    # 2. Reference list anchors:
+    # Match a line starting with 1. or 24. in the References section
+    text = re.sub(r"^(\d{1,2})\.", r'<a id="ref\1"></a>\1.', text, flags=re.MULTILINE)
+    return text
+
+
+def _split_heading(text: str, heading: re.Pattern) -> dict:
+    """Separates a section's `## **...: Title**` heading from its body."""
+    match = heading.search(text)
+    if not match:
+        return {"title": None, "body": text}
+    return {"title": match.group(1), "body": heading.sub("", text, count=1).strip()}
+
+
+def compile_report(content: str) -> dict:
+    """
+    Splits one Markdown report into slides:
+    {"intro": str, "clusters": [{"title", "body"}], "synthesis": {"title", "body"}}.
+    Titles are None when a section has no recognizable heading.
+    """
+    report = empty_sections()
+    sections = re.split(r"\n(?=## \*\*)", content)
+
+    intro_parts = []
+    cluster_start_idx = -1
+    for idx, s in enumerate(sections):
+        if "## **Cluster 1:" in s:
+            cluster_start_idx = idx
+            break
+        intro_parts.append(s)
+    report["intro"] = process_citations("\n\n".join(intro_parts).strip())
+
+    if cluster_start_idx != -1:
+        synthesis_parts = []
+        for s in sections[cluster_start_idx:]:
+            if "## **Cluster" in s:
+                report["clusters"].append(
+                    _split_heading(process_citations(s.strip()), CLUSTER_HEADING)
+                )
+            else:
+                synthesis_parts.append(s.strip())
+
+        if synthesis_parts:
+            report["synthesis"] = _split_heading(
+                process_citations("\n\n".join(synthesis_parts).strip()),
+                SYNTHESIS_HEADING,
+            )
+    return report
+
+
+def find_report_path(path: str) -> Optional[str]:
+    """
+    Resolves `path` against the working directory, then the project root
+    (to support running from root or from src/).
+    """
+    possible_paths = [
+        os.path.join(os.getcwd(), path),
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), path),
+        # Lambda image: src/ contents and reports/ share the task root
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path),
+    ]
+    for p in possible_paths:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def compile_report_file(path: str) -> Optional[dict]:
+    final_path = find_report_path(path)
+    if not final_path:
+        print(f"Warning: Report not found at {path}")
+        return None
+    with open(final_path, "r", encoding="utf-8") as f:
+        return compile_report(f.read())
+
+
+def compile_all(reports_dir: str = REPORTS_DIR) -> Dict[str, dict]:
+    """Compiles every language's report. Missing reports yield empty slides."""
+    sections = {}
+    for lang, filename in REPORT_FILES.items():
+        sections[lang] = compile_report_file(os.path.join(reports_dir, filename)) or empty_sections()
+    return sections
+
+
+def load_report_sections(reports_dir: str = REPORTS_DIR) -> Dict[str, dict]:
+    """
+    Loads the precompiled slides. Falls back to compiling the Markdown (and
+    warns) when the artifact has not been built, e.g. in a fresh checkout.
+    """
+    path = find_report_path(os.path.join(reports_dir, SECTIONS_FILE))
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    print(
+        f"[Reports] {SECTIONS_FILE} not found. Compiling Markdown at startup; "
+        "run scripts/build_reports.py to precompile."
+    )
+    return compile_all(reports_dir)
@@ -0,0 +1,152 @@
+"""
+Cache of final agent answers, so repeated questions skip the LLM entirely.
+
+Keys combine the normalized question, the answer language, the dashboard
+filters, the prior conversation turns the prompt includes, the model and the
+data version. A dataset refresh changes the version, which retires every entry
+computed over the old data. Entries also expire after RESPONSE_CACHE_TTL
+seconds.
+
+The in-process LRU is always on. Set RESPONSE_CACHE_DIR to also persist
+answers as small JSON files, shared by every worker on the host (on Lambda,
+point it at /tmp).
+
+The same class, with its own namespace, caches the guardrails' relevance
+verdicts (salary_data/guardrails.py).
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Callable, List, Optional
+
+from salary_data.cache import LRUCache
+from salary_data.provinces import fold
+
+NAMESPACE = "response"
+
+# Prior turns that reach the prompt (query() shows the last 3 messages,
+# one of which is the current question)
+HISTORY_TURNS = 2
+
+# Answers that must never be replayed
+_UNCACHEABLE_PREFIXES = ("Error", "⚠️")
+
+
+def normalize_question(text: str) -> str:
+    """Case-, accent-, punctuation- and whitespace-insensitive form of a question."""
+    text = re.sub(r"[^\w\s%$-]", " ", fold(text))
+    return " ".join(text.split())
+
+
+def prior_turns(user_prompt: str, chat_history: Optional[list]) -> List[dict]:
+    """The conversation before the current question, as the prompt sees it."""
+    history = list(chat_history or [])
+    if history and history[-1].get("content") == user_prompt:
+        history = history[:-1]
+    return history[-HISTORY_TURNS:]
+
+
+def response_key(
+    user_prompt: str,
+    lang: str,
+    context_metadata: Optional[dict],
+    chat_history: Optional[list],
+    data_version: str,
+    model: str = "",
+) -> str:
+    context = {
+        k: v for k, v in (context_metadata or {}).items() if k != "language_preference"
+    }
+    turns = [
+        (m.get("role"), normalize_question(str(m.get("content", ""))))
+        for m in prior_turns(user_prompt, chat_history)
+    ]
+    payload = json.dumps(
+        [data_version, model, lang, normalize_question(user_prompt), context, turns],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(answer: str) -> bool:
+    return bool(answer) and not answer.lstrip().startswith(_UNCACHEABLE_PREFIXES)
+
+
+class ResponseCache:
+    """
+    In-process LRU of answers, optionally backed by a directory of JSON files.
+    Values must be JSON-serializable; `cacheable` decides which are stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: Optional[float] = 24 * 3600,
+        directory: Optional[str] = None,
+        namespace: str = NAMESPACE,
+        cacheable: Callable[[Any], bool] = is_cacheable,
+    ):
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.namespace = namespace
+        self.cacheable = cacheable
+        self.disk_hits = 0
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600))) or None,
+            directory=os.getenv("RESPONSE_CACHE_DIR") or None,
+        )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        answer = self.memory.get(self.namespace, key)
+        if answer is not None or not self.directory:
+            return answer
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if self.ttl and time.time() - entry["created_at"] > self.ttl:
+            return None
+        # Promote disk hits so the next lookup stays in memory
+        self.disk_hits += 1
+        self.memory.put(self.namespace, key, entry["output"])
+        return entry["output"]
+
+    def put(self, key: str, answer: Any):
+        if not self.cacheable(answer):
+            return
+        self.memory.put(self.namespace, key, answer)
+        if not self.directory:
+            return
+        try:
+            # Write-then-rename, so concurrent readers never see partial JSON
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"output": answer, "created_at": time.time()}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"[ResponseCache] Failed to persist answer: {e}")
+
+    def stats(self) -> dict:
+        """Memory hit/miss counts; misses served from disk are in `disk_hits`."""
+        return {**self.memory.stats(), "disk_hits": self.disk_hits}
+
+
+# Shared by every agent in the process. Keys include the data version.
+RESPONSE_CACHE = ResponseCache.from_env()
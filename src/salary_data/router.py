@@ -0,0 +1,338 @@
+"""
+Rule-based fast path for the DataJournalistAgent.
+
+Most chat questions map directly onto one of the four custom tools ("top
+paying province in September 2025", "purchasing power loss in Buenos Aires
+between ..."). `IntentRouter` parses provinces, dates and the intent with
+keyword rules, calls the tool computation directly and templates the answer
+in Spanish or English, so those questions never reach the LLM.
+
+The rules are deliberately conservative: comparisons, indices, follow-ups
+that refer back to the conversation, unknown places and dates outside the
+data (including periods after the latest one) all return None and take
+the LLM path. So does a province salary question with a modifier the
+latest net salary does not answer ("gross", "poverty line", "per hour",
+"above the average"). A follow-up cue ("it", "there")
+without history refers to the province selected on the dashboard, or falls
+back to the LLM if none is selected.
+
+A calendar year is always read December to December: "in 2024" is
+2023-12 to 2024-12, and "since 2020" starts at 2019-12.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from salary_data.provinces import ProvinceIndex, fold
+from salary_data.tools import AVERAGE_COLUMN, SalaryTools
+
+MONTHS = {
+    "enero": 1, "january": 1, "jan": 1, "ene": 1,
+    "febrero": 2, "february": 2, "feb": 2,
+    "marzo": 3, "march": 3, "mar": 3,
+    "abril": 4, "april": 4, "apr": 4, "abr": 4,
+    "mayo": 5, "may": 5,
+    "junio": 6, "june": 6, "jun": 6,
+    "julio": 7, "july": 7, "jul": 7,
+    "agosto": 8, "august": 8, "aug": 8, "ago": 8,
+    "septiembre": 9, "setiembre": 9, "september": 9, "sept": 9, "sep": 9,
+    "octubre": 10, "october": 10, "oct": 10,
+    "noviembre": 11, "november": 11, "nov": 11,
+    "diciembre": 12, "december": 12, "dec": 12, "dic": 12,
+}
+
+# Questions the tools cannot answer in a single call
+COMPARISON_WORDS = (
+    "compar", "versus", " vs", "index", "indice", "base 100", "evolution", "evolucion",
+    "correlat", "why", "por que", "explain", "explica", "at least", "al menos",
+)
+FOLLOW_UP_STARTS = ("and ", "y ", "what about", "how about", "tambien", "also")
+FOLLOW_UP_WORDS = (" it ", " it?", " that ", " them", " esa ", " ese ", " eso", " ella", " alli", " there")
+
+INFLATION_WORDS = ("inflation", "inflacion", "ipc", "cpi")
+CHANGE_WORDS = (
+    "purchasing power", "poder adquisitivo", "poder de compra", "real salar", "salario real",
+    "salarios reales", "lost", "lose", "loss", "perdi", "perdida", "gain", "grew", "growth",
+    "gano", "ganaron", "crecio", "crecimiento",
+)
+GAIN_WORDS = ("gain", "grew", "growth", "gano", "ganaron", "crecio", "crecimiento", "improve", "mejor")
+RANKING_WORDS = (
+    "top paying", "top-paying", "pays the most", "pays more", "highest paying", "highest salary",
+    "best paid", "best-paid", "mas paga", "paga mas", "mejor paga", "salario mas alto",
+    "sueldo mas alto", "pays the least", "pays less", "lowest paying", "lowest salary",
+    "worst paid", "menos paga", "paga menos", "peor paga", "salario mas bajo", "sueldo mas bajo",
+)
+LOW_WORDS = ("least", "less", "lowest", "worst", "menos", "peor", "mas bajo")
+# "Lost the least" / "perdió menos" flip the direction of a change ranking
+_LEAST_RE = re.compile(r"\b(?:least|menos)\b")
+SALARY_WORDS = ("salary", "salario", "sueldo", "pay", "paga", "cobra", "earn", "gana")
+# A salary question with any of these asks for more than the latest net figure
+# (another salary type, a reference line, an average, anomalies, another unit)
+_SALARY_MODIFIER_RE = re.compile(
+    r"\b(?:gross|brut[oa]s?|basic|basicos?|real(?:es)?|poverty|pobreza|indigen\w*|canastas?"
+    r"|anomal\w*|average|promedios?|mean|median|mediana|hour\w*|horas?|hourly|week\w*|seman\w*"
+    r"|daily|diari\w*|above|below|over|under|encima|debajo|more than|less than|mas que|menos que)\b"
+)
+# Leading spaces keep "now" from matching inside "know"
+NOW_WORDS = (" today", " now", " current", " latest", " hoy", " ahora", " actual")
+LAST_YEAR_WORDS = ("last year", "past year", "ultimo ano", "ano pasado", "last 12 months", "ultimos 12 meses")
+SINCE_WORDS = ("since", "desde")
+PROVINCE_WORDS = ("province", "provincia", "jurisdic")
+
+SPANISH_WORDS = {
+    "cual", "cuales", "que", "cuanto", "cuanta", "provincia", "provincias", "salario",
+    "sueldo", "entre", "desde", "hoy", "el", "la", "los", "las", "en", "de", "del", "fue",
+    "mas", "perdio", "poder", "adquisitivo",
+}
+ENGLISH_WORDS = {
+    "what", "which", "how", "much", "province", "provinces", "salary", "between", "the",
+    "in", "of", "was", "is", "most", "lost", "purchasing", "power", "today",
+}
+
+_MONTH_RE = re.compile(
+    r"\b(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?\s*(?:de |of |del )?(\d{4})\b"
+)
+_ISO_RE = re.compile(r"\b(\d{4})-(\d{1,2})(?:-\d{1,2})?\b")
+_YEAR_RE = re.compile(r"\b(19\d{2}|20\d{2})\b")
+_TOP_K_RE = re.compile(r"\b(?:top|bottom|primeras?|ultimas?)\s+(\d{1,2})\b|\b(\d{1,2})\s+provin")
+# A capitalized place name after a preposition ("in Narnia", "en Córdoba")
+_PLACE_RE = re.compile(r"\b(?:in|en|for|para|de|of)\s+([A-ZÁÉÍÓÚÑ][\w]+)")
+
+
+class RoutedAnswer(NamedTuple):
+    intent: str
+    answer: str
+    lang: str
+
+
+def detect_language(question: str, default: str = "es") -> str:
+    if "¿" in question or "¡" in question:
+        return "es"
+    words = re.findall(r"\w+", fold(question))
+    es = sum(w in SPANISH_WORDS for w in words)
+    en = sum(w in ENGLISH_WORDS for w in words)
+    if es == en:
+        return default
+    return "es" if es > en else "en"
+
+
+def _has(text: str, words: Tuple[str, ...]) -> bool:
+    return any(w in text for w in words)
+
+
+class IntentRouter:
+    """Answers single-tool questions without the LLM. `route` returns None otherwise."""
+
+    def __init__(self, tools: SalaryTools):
+        self.tools = tools
+        # Exact names and aliases only: a fuzzy guess falls back to the LLM instead
+        self.provinces = ProvinceIndex(c for c in tools.columns if c != AVERAGE_COLUMN)
+
+    # --- Parsing ---
+
+    def find_provinces(self, text: str) -> List[str]:
+        """Canonical provinces mentioned in folded `text`, in order of appearance."""
+        return self.provinces.find(text)
+
+    def has_unknown_place(self, question: str) -> bool:
+        for word in _PLACE_RE.findall(question):
+            token = fold(word)
+            if token not in self.provinces.tokens and token not in MONTHS and token not in (
+                "argentina", "ipc", "cpi", "indec",
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def find_dates(text: str) -> List[Tuple[str, pd.Timestamp]]:
+        """("month" | "year", date) pairs in order of appearance."""
+        found, taken = [], []
+        for match in _MONTH_RE.finditer(text):
+            found.append((match.start(), "month", pd.Timestamp(int(match.group(2)), MONTHS[match.group(1)], 1)))
+            taken.append(match.span())
+        for match in _ISO_RE.finditer(text):
+            month = int(match.group(2))
+            if 1 <= month <= 12:
+                found.append((match.start(), "month", pd.Timestamp(int(match.group(1)), month, 1)))
+                taken.append(match.span())
+        for match in _YEAR_RE.finditer(text):
+            if not any(s <= match.start() < e for s, e in taken):
+                found.append((match.start(), "year", pd.Timestamp(int(match.group(1)), 12, 1)))
+        return [(kind, date) for _, kind, date in sorted(found, key=lambda f: f[0])]
+
+    def date_range(self, text: str, dates) -> Optional[Tuple[str, str]]:
+        """(start, end) for a change question, or None when it is ambiguous."""
+        latest = self.tools.latest_date
+        if len(dates) == 2:
+            start = dates[0][1] - pd.DateOffset(years=1) if dates[0][0] == "year" else dates[0][1]
+            return start.strftime("%Y-%m-%d"), (dates[1][1] + pd.offsets.MonthEnd(0)).strftime("%Y-%m-%d")
+        if len(dates) == 1:
+            kind, date = dates[0]
+            if _has(text, NOW_WORDS) or _has(text, SINCE_WORDS):
+                start = pd.Timestamp(date.year - 1, 12, 1) if kind == "year" else date
+                return start.strftime("%Y-%m-%d"), latest.strftime("%Y-%m-%d")
+            if kind == "year":
+                # A calendar year: December of the previous year to December
+                return f"{date.year - 1}-12-01", f"{date.year}-12-31"
+            return None
+        if _has(text, LAST_YEAR_WORDS):
+            start = latest - pd.DateOffset(years=1)
+            return start.strftime("%Y-%m-%d"), latest.strftime("%Y-%m-%d")
+        return None
+
+    def point_in_time(self, text: str, dates) -> Tuple[bool, Optional[str]]:
+        """(ok, period) for a snapshot question; a None period means the latest data."""
+        if not dates:
+            return True, None
+        if len(dates) > 1:
+            return False, None
+        kind, date = dates[0]
+        if date > self.tools.latest_date:
+            # The tools would clamp a future period to the latest data
+            return False, None
+        end = date + pd.offsets.MonthEnd(0)
+        return True, end.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def top_k(text: str) -> int:
+        match = _TOP_K_RE.search(text)
+        if match:
+            return max(1, int(match.group(1) or match.group(2)))
+        return 5 if re.search(r"\b(provinces|provincias|jurisdictions|jurisdicciones)\b", text) else 1
+
+    # --- Routing ---
+
+    def selected_province(self, context_metadata: Optional[dict]) -> Optional[str]:
+        """The province chosen in the dashboard filters, if it is a single province."""
+        selected = (context_metadata or {}).get("selected_province")
+        found = self.find_provinces(str(selected)) if selected else []
+        return found[0] if len(found) == 1 else None
+
+    def route(
+        self,
+        question: str,
+        lang: str = "es",
+        chat_history: Optional[list] = None,
+        context_metadata: Optional[dict] = None,
+    ) -> Optional[RoutedAnswer]:
+        text = " " + fold(question) + " "
+        if _has(text, COMPARISON_WORDS):
+            return None
+        follow_up = text.strip().startswith(FOLLOW_UP_STARTS) or _has(text, FOLLOW_UP_WORDS)
+        if chat_history and follow_up:
+            return None
+        if self.has_unknown_place(question):
+            return None
+
+        lang = detect_language(question, default=lang)
+        provinces = self.find_provinces(text)
+        dates = self.find_dates(text)
+        if len(provinces) > 1:
+            return None
+        if follow_up and not provinces:
+            # "How much did it lose?" refers to the dashboard's province; "is there a
+            # province that..." and rankings do not, so those go to the LLM
+            selected = self.selected_province(context_metadata)
+            if selected is None or _has(text, RANKING_WORDS) or _has(text, PROVINCE_WORDS):
+                return None
+            provinces = [selected]
+
+        try:
+            if _has(text, INFLATION_WORDS) and not provinces and not _has(text, CHANGE_WORDS):
+                span = self.date_range(text, dates)
+                if span is None:
+                    return None
+                return RoutedAnswer("inflation", self._inflation(lang, *self.tools.inflation_between(*span)), lang)
+
+            if _has(text, CHANGE_WORDS) and not _has(text, INFLATION_WORDS):
+                span = self.date_range(text, dates)
+                if span is None:
+                    return None
+                if provinces:
+                    result = self.tools.real_change_for(*span, provinces[0])
+                    return RoutedAnswer("purchasing_power", self._change(lang, provinces[0], *result), lang)
+                # "Lost the least" is the best change, "gained the least" the worst
+                most_loss = (not _has(text, GAIN_WORDS)) != bool(_LEAST_RE.search(text))
+                result = self.tools.real_change_ranking(*span, self.top_k(text), most_loss=most_loss)
+                return RoutedAnswer("change_ranking", self._change_ranking(lang, most_loss, *result), lang)
+
+            if _has(text, RANKING_WORDS) and not provinces:
+                ok, period = self.point_in_time(text, dates)
+                if not ok:
+                    return None
+                asc = _has(text, LOW_WORDS)
+                label, rows = self.tools.salary_ranking(period, self.top_k(text), asc=asc)
+                return RoutedAnswer("salary_ranking", self._ranking(lang, asc, label, rows), lang)
+
+            if (
+                provinces
+                and _has(text, SALARY_WORDS)
+                and not _has(text, INFLATION_WORDS)
+                and not _SALARY_MODIFIER_RE.search(text)
+            ):
+                ok, period = self.point_in_time(text, dates)
+                if not ok:
+                    return None
+                label, value = self.tools.salary_at(provinces[0], period)
+                return RoutedAnswer("province_salary", self._salary(lang, provinces[0], label, value), lang)
+        except ValueError:
+            # Dates outside the data: the LLM explains what is available
+            return None
+        return None
+
+    # --- Templates ---
+
+    @staticmethod
+    def _salary(lang, prov, label, value):
+        if lang == "es":
+            return f"El salario docente neto en {prov} en {label} fue de ${value:,.2f}."
+        return f"The net teacher salary in {prov} in {label} was ${value:,.2f}."
+
+    @staticmethod
+    def _ranking(lang, asc, label, rows):
+        if len(rows) == 1:
+            prov, value = rows[0]
+            if lang == "es":
+                which = "menos" if asc else "más"
+                return f"La provincia que {which} paga en {label} es {prov}, con un salario docente neto de ${value:,.2f}."
+            which = "lowest" if asc else "top"
+            return f"The {which}-paying province in {label} is {prov}, with a net teacher salary of ${value:,.2f}."
+        lines = "\n".join(f"- {prov}: ${value:,.2f}" for prov, value in rows)
+        if lang == "es":
+            which = "menor" if asc else "mayor"
+            return f"Las {len(rows)} provincias con {which} salario docente neto en {label}:\n{lines}"
+        which = "lowest" if asc else "highest"
+        return f"The {len(rows)} provinces with the {which} net teacher salary in {label}:\n{lines}"
+
+    @staticmethod
+    def _change(lang, prov, start, end, pct):
+        if lang == "es":
+            kind = "una pérdida" if pct < 0 else "una ganancia"
+            return f"Entre {start} y {end}, el poder adquisitivo del salario docente en {prov} varió un {pct:+.2f}% ({kind})."
+        kind = "a loss" if pct < 0 else "a gain"
+        return f"Between {start} and {end}, the purchasing power of teacher salaries in {prov} changed by {pct:+.2f}% ({kind})."
+
+    @staticmethod
+    def _change_ranking(lang, most_loss, start, end, rows):
+        if len(rows) == 1:
+            prov, pct = rows[0]
+            # "Best" rather than "gain": every province may have lost
+            if lang == "es":
+                which = "peor" if most_loss else "mejor"
+                return f"Entre {start} y {end}, {prov} fue la provincia con la {which} variación del poder adquisitivo: {pct:+.2f}%."
+            which = "worst" if most_loss else "best"
+            return f"Between {start} and {end}, {prov} had the {which} purchasing power change: {pct:+.2f}%."
+        lines = "\n".join(f"- {prov}: {pct:+.2f}%" for prov, pct in rows)
+        if lang == "es":
+            which = "peor" if most_loss else "mejor"
+            return f"Las {len(rows)} provincias con {which} variación del poder adquisitivo entre {start} y {end}:\n{lines}"
+        which = "worst" if most_loss else "best"
+        return f"The {len(rows)} provinces with the {which} purchasing power change between {start} and {end}:\n{lines}"
+
+    @staticmethod
+    def _inflation(lang, start, end, pct):
+        if lang == "es":
+            return f"La inflación (IPC) entre {start} y {end} fue de {pct:+.2f}%."
+        return f"Inflation (IPC) between {start} and {end} was {pct:+.2f}%."
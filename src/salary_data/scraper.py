@@ -12,6 +12,11 @@ import requests as req
 from datetime import datetime
 from io import BytesIO
 
+# datos.gob.ar rejects requests without a browser-like User-Agent
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
 
 class Scraper:
     """A class to scrape and process Argentine teacher salary and economic data.
@@ -30,19 +35,30 @@ class Scraper:
     """
 
     def __init__(self):
-        """Initializes the Scraper with default URLs and constructs the IPC URL."""
+        """Initializes the Scraper with default URLs. The IPC URL is built lazily."""
         self.URL_TESTIGO_BRUTO = "https://www.argentina.gob.ar/sites/default/files/2022/07/1._salario_bruto_mg10_1225.xlsx"
         self.URL_TESTIGO_NETO = "https://www.argentina.gob.ar/sites/default/files/2022/07/2._salario_de_bolsillo_mg10_1225.xlsx"
         self.URL_BASICO = "https://www.argentina.gob.ar/sites/default/files/2022/07/3._sueldo_basico_1225.xlsx"
         self.URL_REMUNERATIVOS = "https://www.argentina.gob.ar/sites/default/files/2022/07/4._porcentaje_de_componentes_remunerativos_sobre_el_salario_bruto_provincial_del_mg10_1225.xlsx"
         self.URL_SUMAS_ADICIONALES = "https://www.argentina.gob.ar/sites/default/files/2022/07/5._sumas_adicionales12_25.xlsx"
 
-        # IPC URL construction
-        self.URL_IPC = self._build_ipc_url()
+        # IPC URL is resolved on first use (it needs a HEAD request to INDEC)
+        self._url_ipc = None
 
         # CBA/CBT URL from datos.gob.ar
         self.URL_CBA_CBT = "https://infra.datos.gob.ar/catalog/sspm/dataset/150/distribution/150.1/download/valores-canasta-basica-alimentos-canasta-basica-total-mensual-2016.csv"
 
+    @property
+    def URL_IPC(self):
+        """Lazily constructed IPC URL, so building a Scraper never hits the network."""
+        if self._url_ipc is None:
+            self._url_ipc = self._build_ipc_url()
+        return self._url_ipc
+
+    @URL_IPC.setter
+    def URL_IPC(self, value):
+        self._url_ipc = value
+
     def _build_ipc_url(self):
         """Constructs the URL for the INDEC IPC data based on the current date.
 
@@ -80,7 +96,20 @@ class Scraper:
         """
         return "_" if match.group() in [" ", ", ", " y "] else ""
 
-    def get_cgecse_salaries(self, url):
+    def download(self, url, headers=None):
+        """Downloads a raw source file without parsing it.
+
+        Args:
+            url (str): The URL of the source file.
+            headers (dict, optional): Extra HTTP headers for the request.
+
+        Returns:
+            bytes: The raw file content.
+        """
+        r = req.get(url, headers=headers, timeout=10)
+        return r.content
+
+    def get_cgecse_salaries(self, url, content=None):
         """Scrapes and cleans teacher salary data from CGECSE Excel files.
 
         Processes the Excel file from the given URL, handles quarterly column
@@ -88,13 +117,16 @@ class Scraper:
 
         Args:
             url (str): The URL of the CGECSE Excel file.
+            content (bytes, optional): Already downloaded file content. If given,
+                no request is made.
 
         Returns:
             pd.DataFrame: A DataFrame with dates as index and provinces as columns.
                 The values are cast to 'float32'.
         """
-        r = req.get(url, timeout=10)
-        df = pd.read_excel(BytesIO(r.content), header=6)
+        if content is None:
+            content = self.download(url)
+        df = pd.read_excel(BytesIO(content), header=6)
         df.drop([df.columns[0]], axis=1, inplace=True)
         df.rename({df.columns[0]: "jurisdiction"}, axis=1, inplace=True)
 
@@ -127,19 +159,24 @@ class Scraper:
 
         return df.astype("float32")  # convert to numeric
 
-    def get_ipc_indec(self):
+    def get_ipc_indec(self, content=None):
         """Retrieves inflation data from INDEC.
 
         Fetches the IPC (Consumer Price Index) from the INDEC portal, cleans
         column names, and prefixes them with 'infl_'.
 
+        Args:
+            content (bytes, optional): Already downloaded file content. If given,
+                no request is made.
+
         Returns:
             pd.DataFrame: A DataFrame with inflation indices by category.
                 The index is the date and columns are prefixed with 'infl_'.
         """
-        r = req.get(self.URL_IPC, timeout=10)
+        if content is None:
+            content = self.download(self.URL_IPC)
         df = pd.read_excel(
-            BytesIO(r.content),
+            BytesIO(content),
             sheet_name="Índices IPC Cobertura Nacional",
             header=5,
             nrows=26,
@@ -157,20 +194,22 @@ class Scraper:
 
         return df.add_prefix("infl_", axis=1).astype("float32")
 
-    def get_cba_cbt(self):
+    def get_cba_cbt(self, content=None):
         """Fetches CBA (Indigency Line) and CBT (Poverty Line) data from datos.gob.ar.
 
         Retrieves monthly values for the Basic Food Basket (CBA) and Total Basic
         Basket (CBT) for the GBA region.
 
+        Args:
+            content (bytes, optional): Already downloaded file content. If given,
+                no request is made.
+
         Returns:
             pd.DataFrame: A DataFrame with 'indice_tiempo' as index, 'cba', and 'cbt'.
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        r = req.get(self.URL_CBA_CBT, headers=headers, timeout=10)
-        df = pd.read_csv(BytesIO(r.content))
+        if content is None:
+            content = self.download(self.URL_CBA_CBT, headers=BROWSER_HEADERS)
+        df = pd.read_csv(BytesIO(content))
         df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"])
         df.set_index("indice_tiempo", inplace=True)
         return df
@@ -0,0 +1,164 @@
+"""
+Immutable dataset snapshots and a background refresher for the dashboard.
+
+Callbacks read one `DataSnapshot` at the start of a request and use it for the
+whole request, so a refresh that lands mid-request can never mix versions.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+# Align dashboard data to start from Dec 2016 (INDEC IPC start)
+START_LIMIT = "2016-12-01"
+
+# Datasets without which the dashboard cannot render
+REQUIRED_DATASETS = [
+    "net_salaries",
+    "gross_salaries",
+    "basic_salaries",
+    "inflation_ipc",
+    "poverty_lines",
+]
+
+
+class DataSnapshot(NamedTuple):
+    """One consistent, read-only version of every dashboard dataset."""
+
+    version: str
+    net_salary: pd.DataFrame
+    gross_salary: pd.DataFrame
+    basic_salary: pd.DataFrame
+    ipc: pd.DataFrame
+    cba_cbt: pd.DataFrame
+    clusters: Optional[pd.DataFrame]
+    anomalies: Optional[pd.DataFrame]
+    loaded_at: datetime
+
+    @property
+    def has_analytics(self) -> bool:
+        return self.clusters is not None and self.anomalies is not None
+
+    @property
+    def agent_dfs(self) -> Dict[str, pd.DataFrame]:
+        """The subset of datasets consumed by the DataJournalistAgent."""
+        return {
+            "net_salaries": self.net_salary,
+            "inflation_ipc": self.ipc,
+            "poverty_lines": self.cba_cbt,
+            "anomalies": self.anomalies,
+        }
+
+
+def manifest_version(manifest: Optional[dict]) -> str:
+    """Version id of a loader manifest, or a local id for scraped/unversioned data."""
+    if not manifest:
+        return f"local-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    return manifest["version"]
+
+
+def build_snapshot(all_data: Dict[str, pd.DataFrame], version: str) -> DataSnapshot:
+    """Derives the aligned dashboard frames from the raw loader output."""
+    return DataSnapshot(
+        version=version,
+        net_salary=all_data["net_salaries"].loc[START_LIMIT:],
+        gross_salary=all_data["gross_salaries"].loc[START_LIMIT:],
+        basic_salary=all_data["basic_salaries"].loc[START_LIMIT:],
+        ipc=all_data["inflation_ipc"],
+        cba_cbt=all_data["poverty_lines"].loc[START_LIMIT:],
+        clusters=all_data.get("clusters"),
+        anomalies=all_data.get("anomalies"),
+        loaded_at=datetime.now(),
+    )
+
+
+class SnapshotRefresher:
+    """
+    Holds the current DataSnapshot and, optionally, refreshes it in a daemon
+    thread by polling the loader's manifest (the S3 `current` pointer) every
+    `interval` seconds.
+
+    New versions are loaded entirely off the request path and published with a
+    single reference assignment, which is atomic in CPython.
+    """
+
+    def __init__(self, loader, interval: int = 0):
+        self.loader = loader
+        self.interval = interval
+        self._snapshot: Optional[DataSnapshot] = None
+        self._version: Optional[str] = None
+        self._listeners: List[Callable[[DataSnapshot], None]] = []
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> DataSnapshot:
+        """Returns the active snapshot. Read it once per request."""
+        return self._snapshot
+
+    def add_listener(self, fn: Callable[[DataSnapshot], None]):
+        """Registers a callback invoked (in the refresher thread) after each swap."""
+        self._listeners.append(fn)
+
+    def load_initial(self) -> DataSnapshot:
+        """Blocking first load. Falls back to scraping like DataLoader does."""
+        manifest = self.loader.get_manifest()
+        all_data = self.loader.get_all_data(manifest=manifest)
+        self._swap(build_snapshot(all_data, manifest_version(manifest)))
+        return self._snapshot
+
+    def check_now(self) -> bool:
+        """
+        Polls the manifest once and swaps in a new snapshot if it changed.
+        Returns True if a new snapshot was published.
+        """
+        with self._refresh_lock:
+            manifest = self.loader.get_manifest()
+            if manifest is None or manifest["version"] == self._version:
+                return False
+
+            # Load exactly the version we just resolved, not whatever is current now
+            all_data = self.loader.get_all_data(allow_scrape=False, manifest=manifest)
+            missing = [name for name in REQUIRED_DATASETS if name not in all_data]
+            if missing:
+                print(f"[Refresher] Incomplete dataset (missing {missing}). Keeping current snapshot.")
+                return False
+
+            snapshot = build_snapshot(all_data, manifest_version(manifest))
+            self._swap(snapshot)
+            print(f"[Refresher] Swapped in dataset version {snapshot.version}.")
+            return True
+
+    def _swap(self, snapshot: DataSnapshot):
+        self._snapshot = snapshot
+        self._version = snapshot.version
+        for fn in self._listeners:
+            try:
+                fn(snapshot)
+            except Exception as e:
+                print(f"[Refresher] Listener failed for version {snapshot.version}: {e}")
+
+    def start(self):
+        """Starts the polling thread. No-op if interval <= 0 or already running."""
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="data-refresher", daemon=True
+        )
+        self._thread.start()
+        print(f"[Refresher] Polling for new data every {self.interval}s.")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check_now()
+            except Exception as e:
+                print(f"[Refresher] Refresh check failed: {e}")
@@ -0,0 +1,77 @@
+"""
+Phase timings for the dashboard's cold start.
+
+`salary_app.py` imports this module first and calls `startup_profile.mark()`
+after each block of module-level work, so every cold start logs where its time
+went. `scripts/benchmark_startup.py` reads the same profile and enforces budgets
+with `check_budgets`.
+"""
+
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    # ru_maxrss is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StartupProfile:
+    """Records wall time, peak RSS and (if tracing) Python allocations per phase."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._last = self._started
+        self.phases: List[Tuple[str, float]] = []
+        self.memory: Dict[str, dict] = {}
+
+    def mark(self, phase: str):
+        """Closes `phase`, which ran since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+        stats = {"peak_rss_mb": _peak_rss_mb()}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            stats["traced_mb"] = current / 2**20
+            stats["traced_peak_mb"] = peak / 2**20
+        self.memory[phase] = stats
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._started) * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": {name: ms for name, ms in self.phases},
+            "total_ms": self.total_ms,
+            "memory": self.memory,
+        }
+
+    def report(self):
+        parts = " ".join(f"{name}={ms:.0f}ms" for name, ms in self.phases)
+        print(f"[Startup] {parts} total={self.total_ms:.0f}ms rss={_peak_rss_mb():.0f}MB")
+
+
+def check_budgets(results: dict, budgets: dict) -> List[str]:
+    """Budgets that `results` exceed, plus any chat module imported at startup."""
+    failures = [
+        f"{key}: {results[key]:.1f} > {limit}"
+        for key, limit in budgets.items()
+        if key in results and results[key] > limit
+    ]
+    if results["chat_modules"]:
+        failures.append(f"chat stack imported at startup: {', '.join(results['chat_modules'])}")
+    return failures
+
+
+# Created when salary_app.py first imports this module, i.e. at cold start
+startup_profile = StartupProfile()
@@ -0,0 +1,251 @@
+"""
+Object storage backends and Parquet encoding profiles for DataLoader.
+
+Backends give DataLoader a minimal get/put/head interface over S3, a local
+directory or process memory, selected with DATA_STORAGE_BACKEND. The local and
+in-memory backends let cold-start and update paths be benchmarked offline.
+
+A profile controls how DataLoader writes Parquet: compression codec and level,
+row-group size, dictionary encoding and whether float columns are downcast to
+float32. Reading always works regardless of the profile used to write.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from io import BytesIO
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+class StorageProfile(NamedTuple):
+    name: str
+    compression: Optional[str]
+    compression_level: Optional[int] = None
+    # None writes a single row group (our frames are a few hundred rows at most)
+    row_group_size: Optional[int] = None
+    # "auto" dictionary-encodes only non-float columns (province names, labels)
+    use_dictionary: object = "auto"
+    float32: bool = False
+
+
+STORAGE_PROFILES = {
+    # What `df.to_parquet()` wrote before profiles existed
+    "legacy": StorageProfile("legacy", compression="snappy", use_dictionary=True),
+    # Small objects that decode fast, at full precision
+    "dashboard": StorageProfile("dashboard", compression="zstd", compression_level=3),
+    # As dashboard, with float64 columns downcast to float32 (lossy, opt-in)
+    "compact": StorageProfile(
+        "compact", compression="zstd", compression_level=3, float32=True
+    ),
+    # Smallest objects, full precision, slower to write
+    "archive": StorageProfile("archive", compression="zstd", compression_level=19),
+}
+
+DEFAULT_PROFILE = "dashboard"
+
+
+def get_profile(name: Optional[str] = None) -> StorageProfile:
+    """Returns the named profile, or the one set in DATA_STORAGE_PROFILE."""
+    name = name or os.getenv("DATA_STORAGE_PROFILE", DEFAULT_PROFILE)
+    if name not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile '{name}'. Available: {', '.join(STORAGE_PROFILES)}"
+        )
+    return STORAGE_PROFILES[name]
+
+
+def _dictionary_columns(df: pd.DataFrame) -> List[str]:
+    return [str(c) for c in df.columns if not pd.api.types.is_float_dtype(df[c])]
+
+
+def to_parquet_bytes(df: pd.DataFrame, profile: StorageProfile) -> bytes:
+    """Encodes a DataFrame (with its index) as Parquet using `profile`."""
+    if profile.float32:
+        float_cols = df.select_dtypes(include="float64").columns
+        if len(float_cols):
+            df = df.astype({c: "float32" for c in float_cols})
+
+    use_dictionary = profile.use_dictionary
+    if use_dictionary == "auto":
+        use_dictionary = _dictionary_columns(df)
+
+    out_buffer = BytesIO()
+    df.to_parquet(
+        out_buffer,
+        index=True,
+        engine="pyarrow",
+        compression=profile.compression,
+        compression_level=profile.compression_level,
+        row_group_size=profile.row_group_size,
+        use_dictionary=use_dictionary,
+    )
+    return out_buffer.getvalue()
+
+
+def read_parquet_bytes(
+    content: bytes, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Decodes Parquet bytes. When `columns` is given only those column chunks are
+    decoded (the index is always restored).
+    """
+    return pd.read_parquet(BytesIO(content), columns=columns)
+
+
+def parquet_columns(content: bytes) -> List[str]:
+    """Lists the data columns of a Parquet object by reading only its footer."""
+    schema = pq.ParquetFile(BytesIO(content)).schema_arrow
+    index_cols = set(
+        c for c in (schema.pandas_metadata or {}).get("index_columns", [])
+        if isinstance(c, str)
+    )
+    return [name for name in schema.names if name not in index_cols]
+
+
+# --- Storage Backends ---
+
+
+class StorageBackend:
+    """
+    Minimal object store interface. `get` and `head` raise KeyError for missing
+    objects; any other exception is a transport error. Callers handle both.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ):
+        raise NotImplementedError
+
+    def head(self, key: str) -> str:
+        """Returns the object's ETag."""
+        raise NotImplementedError
+
+
+class S3Backend(StorageBackend):
+    """Amazon S3 through an already configured boto3 client."""
+
+    name = "s3"
+
+    def __init__(self, client, bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def get(self, key):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            raise KeyError(key)
+        return response["Body"].read()
+
+    def put(self, key, body, content_type=None, cache_control=None):
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **extra)
+
+    def head(self, key):
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ETag"].strip('"')
+
+
+class _EmulatedLatency:
+    """Optional fixed delay per request, to approximate S3 round trips offline."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def _wait(self):
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+
+class LocalBackend(StorageBackend, _EmulatedLatency):
+    """Objects stored as files under `root`, with keys as relative paths."""
+
+    name = "local"
+
+    def __init__(self, root: str, latency_ms: float = 0.0):
+        _EmulatedLatency.__init__(self, latency_ms)
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Key escapes the storage root: {key}")
+        return path
+
+    def get(self, key):
+        self._wait()
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def put(self, key, body, content_type=None, cache_control=None):
+        self._wait()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename, so readers never see a partially written object
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    def head(self, key):
+        return hashlib.md5(self.get(key)).hexdigest()
+
+
+# Shared by every MemoryBackend created without an explicit store, so a loader
+# and an update run in the same process see the same objects.
+_MEMORY_STORE: Dict[str, bytes] = {}
+
+
+class MemoryBackend(StorageBackend, _EmulatedLatency):
+    """Objects kept in a process-local dict. For tests and benchmarks."""
+
+    name = "memory"
+
+    def __init__(self, store: Optional[Dict[str, bytes]] = None, latency_ms: float = 0.0):
+        _EmulatedLatency.__init__(self, latency_ms)
+        self.store = _MEMORY_STORE if store is None else store
+
+    def get(self, key):
+        self._wait()
+        return self.store[key]
+
+    def put(self, key, body, content_type=None, cache_control=None):
+        self._wait()
+        self.store[key] = bytes(body)
+
+    def head(self, key):
+        self._wait()
+        return hashlib.md5(self.store[key]).hexdigest()
+
+
+def get_local_backend(name: str) -> StorageBackend:
+    """
+    Builds a non-S3 backend from the environment:
+    DATA_STORAGE_PATH (local root, default ./data_store) and
+    DATA_STORAGE_LATENCY_MS (emulated per-request latency, default 0).
+    """
+    latency_ms = float(os.getenv("DATA_STORAGE_LATENCY_MS", "0"))
+    if name == "local":
+        return LocalBackend(os.getenv("DATA_STORAGE_PATH", "data_store"), latency_ms)
+    if name == "memory":
+        return MemoryBackend(latency_ms=latency_ms)
+    raise ValueError(f"Unknown storage backend '{name}'. Use 's3', 'local' or 'memory'.")
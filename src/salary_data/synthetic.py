@@ -0,0 +1,115 @@
+"""
+Synthetic datasets shaped like the real ones, for offline tests and benchmarks.
+
+Frame shapes, dtypes, index names and column names mirror what `Scraper`
+and `AnalyticsPipeline` produce, so tests and the storage, loader and startup
+benchmarks exercise realistic sizes without network access.
+"""
+
+import numpy as np
+import pandas as pd
+
+PROVINCES = [
+    "Buenos Aires",
+    "Catamarca",
+    "Chaco",
+    "Chubut",
+    "Ciudad de Buenos Aires",
+    "Córdoba",
+    "Corrientes",
+    "Entre Ríos",
+    "Formosa",
+    "Jujuy",
+    "La Pampa",
+    "La Rioja",
+    "Mendoza",
+    "Misiones",
+    "Neuquén",
+    "Río Negro",
+    "Salta",
+    "San Juan",
+    "San Luis",
+    "Santa Cruz",
+    "Santa Fe",
+    "Santiago del Estero",
+    "Tierra del Fuego",
+    "Tucumán",
+]
+
+IPC_CATEGORIES = [
+    "Nivel_general",
+    "Alimentos_bebidas_no_alcohólicas",
+    "Bebidas_alcohólicas_tabaco",
+    "Prendas_de_vestir_calzado",
+    "Vivienda_agua_electricidad_gas_otros_combustibles",
+    "Equipamiento_mantenimiento_del_hogar",
+    "Salud",
+    "Transporte",
+    "Comunicación",
+    "Recreación_cultura",
+    "Educación",
+    "Restaurantes_hoteles",
+    "Bienes_servicios_varios",
+    "Estacional",
+    "Núcleo",
+    "Regulados",
+    "Bienes",
+    "Servicios",
+    "Bienes_no_durables",
+    "Servicios_privados",
+]
+
+
+def make_dataset(seed: int = 0, end: str = "2025-09-01") -> dict:
+    """Returns a dict with the same keys and frame layouts as DataLoader.get_all_data()."""
+    rng = np.random.default_rng(seed)
+    columns = PROVINCES + ["Promedio Ponderado (MG Total)"]
+
+    quarters = pd.date_range("2003-03-01", end, freq="3MS", name="date")
+    growth = 1 + rng.uniform(0.01, 0.12, (len(quarters), len(columns)))
+    net = pd.DataFrame(
+        np.cumprod(growth, axis=0) * 500, index=quarters, columns=columns
+    ).astype("float32")
+
+    months = pd.date_range("2016-12-01", end, freq="MS")
+    ipc = pd.DataFrame(
+        np.cumprod(1 + rng.uniform(0.01, 0.08, (len(months), len(IPC_CATEGORIES))), axis=0)
+        * 100,
+        index=months,
+        columns=["infl_" + c for c in IPC_CATEGORIES],
+    ).astype("float32")
+
+    poverty_index = pd.DatetimeIndex(months, name="indice_tiempo")
+    basket = np.cumprod(1 + rng.uniform(0.01, 0.08, len(months))) * 5000
+    poverty = pd.DataFrame(
+        {
+            "canasta_basica_alimentaria": basket,
+            "canasta_basica_total": basket * 2.1,
+            "linea_indigencia": basket * 3.09,
+            "linea_pobreza": basket * 6.49,
+        },
+        index=poverty_index,
+    )
+
+    analytics_dates = net.loc["2016-12-01":].index
+    clusters = pd.DataFrame(
+        {"province": PROVINCES, "cluster": [i % 6 for i in range(len(PROVINCES))]}
+    )
+    anomalies = pd.DataFrame(
+        [
+            (d, p, -1 if rng.random() < 0.1 else 1)
+            for d in analytics_dates
+            for p in PROVINCES
+        ],
+        columns=["date", "province", "anomaly"],
+    )
+
+    return {
+        "net_salaries": net,
+        "gross_salaries": (net * 1.3).astype("float32"),
+        "basic_salaries": (net * 0.6).astype("float32"),
+        "inflation_ipc": ipc,
+        "poverty_lines": poverty,
+        "clusters": clusters,
+        "anomalies": anomalies,
+    }
@@ -0,0 +1,185 @@
+"""
+Per-request agent telemetry.
+
+`RequestTelemetry` times the stages of one chat request (guardrail, fast path,
+prompt building, the agent loop, output cleaning) and owns a
+`TelemetryHandler`, a LangChain callback that records every LLM call (duration,
+tokens, requested tools) and tool run (name, args, duration) inside the agent
+loop. `emit` prints the record as one JSON log line and, with
+AGENT_TELEMETRY_MLFLOW=1, logs its metrics to MLflow; the agent also attaches
+it to the response dict as `response["telemetry"]`.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class TelemetryHandler(BaseCallbackHandler):
+    """Records LLM calls and tool runs of an agent loop, in order."""
+
+    def __init__(self):
+        self.llm_calls = []
+        self.tools = []
+        # run id -> (start time, record), for runs still in flight
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, record: dict, target: list):
+        with self._lock:
+            target.append(record)
+            self._open[run_id] = (time.perf_counter(), record)
+
+    def _end(self, run_id, **fields) -> Optional[dict]:
+        with self._lock:
+            start, record = self._open.pop(run_id, (None, None))
+        if record is not None:
+            record["ms"] = _ms(time.perf_counter() - start)
+            record.update(fields)
+        return record
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, {}, self.llm_calls)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, {}, self.llm_calls)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        record = self._end(run_id)
+        if record is None:
+            return
+        try:
+            message = response.generations[0][0].message
+        except (AttributeError, IndexError):
+            return
+        usage = getattr(message, "usage_metadata", None) or {}
+        record["prompt_tokens"] = usage.get("input_tokens", 0)
+        record["completion_tokens"] = usage.get("output_tokens", 0)
+        tool_calls = [c["name"] for c in getattr(message, "tool_calls", None) or []]
+        if tool_calls:
+            record["tool_calls"] = tool_calls
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name", "tool")
+        self._start(run_id, {"name": name, "args": inputs or input_str}, self.tools)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+
+class RequestTelemetry:
+    """Stage timings plus the agent-loop trace of one request."""
+
+    def __init__(self, model: str = "", data_version: Optional[str] = None):
+        self.request_id = uuid.uuid4().hex[:12]
+        self.model = model
+        self.data_version = data_version
+        # How the request was answered: rejected, busy, router, cache, llm, partial,
+        # cancelled (speculative run stopped by the guardrail) or error
+        self.path = None
+        # Whether the agent started while the LLM guardrail was still deciding
+        self.speculative = False
+        self.stages = {}
+        # Set when the run hit a limit: {"stopped_by": ..., the limits}
+        self.budget = None
+        self.handler = TelemetryHandler()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(self.stages.get(name, 0.0) + _ms(time.perf_counter() - start), 3)
+
+    def to_dict(self, usage: Optional[dict] = None) -> dict:
+        llm_ms = sum(c.get("ms", 0.0) for c in self.handler.llm_calls)
+        tool_ms = sum(t.get("ms", 0.0) for t in self.handler.tools)
+        record = {
+            "request_id": self.request_id,
+            "model": self.model,
+            "data_version": self.data_version,
+            "path": self.path,
+            "total_ms": _ms(time.perf_counter() - self._start),
+            "stages": dict(self.stages),
+            "iterations": len(self.handler.llm_calls),
+            "llm_ms": round(llm_ms, 3),
+            "tool_ms": round(tool_ms, 3),
+            "llm_calls": list(self.handler.llm_calls),
+            "tools": list(self.handler.tools),
+        }
+        if "agent" in self.stages:
+            # Agent loop time spent outside the LLM and the tools (langchain itself)
+            record["overhead_ms"] = round(self.stages["agent"] - llm_ms - tool_ms, 3)
+        if self.budget:
+            record["budget"] = dict(self.budget)
+        if self.speculative:
+            record["speculative"] = True
+        if usage:
+            record["tokens"] = {
+                k: usage[k] for k in ("prompt_tokens", "completion_tokens", "cached_tokens") if k in usage
+            }
+        return record
+
+    def emit(self, usage: Optional[dict] = None) -> dict:
+        """Logs the record as one JSON line (and to MLflow if enabled) and returns it."""
+        record = self.to_dict(usage)
+        print(f"[Telemetry] {json.dumps(record, ensure_ascii=False, default=str)}")
+        if os.getenv("AGENT_TELEMETRY_MLFLOW", "0") == "1":
+            log_to_mlflow(record)
+        return record
+
+
+def metrics(record: dict) -> dict:
+    """The numeric fields of a record, flattened for metric stores."""
+    flat = {
+        "total_ms": record["total_ms"],
+        "iterations": record["iterations"],
+        "llm_ms": record["llm_ms"],
+        "tool_ms": record["tool_ms"],
+        "tool_calls": len(record["tools"]),
+        "budget_exhausted": int("budget" in record),
+    }
+    if "overhead_ms" in record:
+        flat["overhead_ms"] = record["overhead_ms"]
+    flat.update({f"stage_{name}_ms": ms for name, ms in record["stages"].items()})
+    flat.update({f"tokens_{name}": n for name, n in record.get("tokens", {}).items()})
+    return flat
+
+
+def log_to_mlflow(record: dict):
+    """
+    Logs a record to the active MLflow run (e.g. during scripts/run_evaluation.py),
+    or to a short run of its own in the MLFLOW_TELEMETRY_EXPERIMENT experiment.
+    """
+    try:
+        import mlflow
+
+        if mlflow.active_run() is not None:
+            mlflow.log_metrics(metrics(record))
+            mlflow.log_dict(record, f"telemetry/{record['request_id']}.json")
+            return
+        mlflow.set_experiment(os.getenv("MLFLOW_TELEMETRY_EXPERIMENT", "Agent_Telemetry"))
+        with mlflow.start_run(run_name=f"request_{record['request_id']}"):
+            mlflow.set_tags({"path": record["path"], "model": record["model"]})
+            mlflow.log_metrics(metrics(record))
+            mlflow.log_dict(record, "telemetry.json")
+    except Exception as e:
+        print(f"[Telemetry] MLflow sink failed: {e}")
@@ -0,0 +1,339 @@
+"""
+Deterministic computations behind the DataJournalistAgent's tools.
+
+LLMs call the same tool with the same arguments over and over, in slightly
+different spellings ("chaco", "2024-01", "2024-01-15"). `SalaryTools`
+normalizes the arguments first (canonical province names, dates snapped to the
+index dates actually used), then memoizes the result in a shared, bounded LRU
+keyed by the data version, so equivalent calls across queries and users hit
+the cache.
+
+The underlying numbers are precomputed once per dataset: the % change in real
+salary for every (start, end, province) triple, its rankings, and the nominal
+rankings per date. Computing a tool result is then a date snap (binary search
+over ~40 dates) plus array indexing, with no DataFrame scans or sorts.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from salary_data.cache import LRUCache
+from salary_data.provinces import ProvinceIndex, fold  # noqa: F401  (fold is re-exported)
+from salary_data.scraper import Scraper
+
+AVERAGE_COLUMN = "Promedio Ponderado (MG Total)"
+
+# Shared by every agent in the process. Keys include the data version.
+TOOL_CACHE = LRUCache(maxsize=int(os.getenv("TOOL_CACHE_SIZE", "1024")))
+
+
+def _parse_input(input_val: any, target_key: str) -> any:
+    """Helper to handle cases where LLM passes a JSON string instead of unpacked args."""
+    if isinstance(input_val, str):
+        cleaned = input_val.strip(" '\"[]")
+        if cleaned.startswith("{") and cleaned.endswith("}"):
+            try:
+                data = json.loads(cleaned)
+                return data.get(target_key, cleaned)
+            except Exception:
+                return cleaned
+    return input_val
+
+
+def _clean(input_val: any, target_key: str) -> Optional[str]:
+    """Unwraps and strips a raw LLM argument. Empty and 'none' become None."""
+    val = _parse_input(input_val, target_key)
+    if val is None:
+        return None
+    val = str(val).strip(" '\"[]")
+    return None if val == "" or val.lower() == "none" else val
+
+
+def _to_bool(input_val: any, target_key: str) -> bool:
+    val = _parse_input(input_val, target_key)
+    if isinstance(val, str):
+        return val.strip(" '\"[]").lower() in ("true", "1", "yes")
+    return bool(val)
+
+
+def frames_version(dfs_dict: Dict[str, pd.DataFrame]) -> str:
+    """Content fingerprint for frames that did not come with a data version."""
+    digest = 0
+    for name in sorted(dfs_dict):
+        df = dfs_dict[name]
+        if df is not None:
+            digest = hash((digest, name, int(pd.util.hash_pandas_object(df).sum())))
+    return f"frames-{digest & 0xFFFFFFFFFFFF:012x}"
+
+
+def prepare_frames(dfs_dict: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Aligns the agent datasets on the dates shared by salaries and the IPC and
+    derives real salaries, based at the first common date.
+    """
+    scraper = Scraper()
+    df_net = dfs_dict.get("net_salaries")
+    df_ipc = dfs_dict.get("inflation_ipc")
+    df_poverty = dfs_dict.get("poverty_lines")
+    df_anomalies = dfs_dict.get("anomalies")
+
+    common_index = df_net.index.intersection(df_ipc.index)
+    df_net = df_net.loc[common_index]
+    df_ipc = df_ipc.loc[common_index]
+    df_poverty = df_poverty.loc[common_index]
+
+    start_limit = df_net.index.min()
+    df_real = scraper.calculate_real_salary(
+        df_net, df_ipc["infl_Nivel_general"], base_date=start_limit
+    )
+
+    return {
+        "nominal_salaries": df_net,
+        "real_salaries": df_real,
+        "inflation_ipc": df_ipc,
+        "poverty_lines": df_poverty,
+        "anomalies": df_anomalies,
+    }
+
+
+class DateAxis:
+    """Sorted date index with O(log n) snapping to positions."""
+
+    def __init__(self, index: pd.DatetimeIndex):
+        self.index = index
+        self._i8 = index.asi8
+
+    def on_or_before(self, value: str) -> int:
+        """Position of the latest date <= value."""
+        pos = int(np.searchsorted(self._i8, pd.Timestamp(value).value, side="right")) - 1
+        if pos < 0:
+            raise ValueError(f"No data on or before {value}")
+        return pos
+
+    def on_or_after(self, value: str) -> int:
+        """Position of the earliest date >= value."""
+        pos = int(np.searchsorted(self._i8, pd.Timestamp(value).value, side="left"))
+        if pos >= len(self._i8):
+            raise ValueError(f"No data on or after {value}")
+        return pos
+
+    def label(self, pos: int) -> str:
+        return self.index[pos].strftime("%Y-%m")
+
+
+class ChangeTensor:
+    """
+    % change of every column between every pair of dates, `change[s, e, p]`,
+    plus province orderings for each (s, e) sorted by that change. With ~40
+    quarterly dates and 25 columns this is ~40k floats.
+    """
+
+    def __init__(self, df: pd.DataFrame, ranked_columns: List[str]):
+        values = df.to_numpy(dtype="float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.change = (values[np.newaxis, :, :] / values[:, np.newaxis, :] - 1) * 100
+
+        self.ranked = np.array([df.columns.get_loc(c) for c in ranked_columns], dtype=np.int64)
+        ranked_change = self.change[:, :, self.ranked]
+        # NaNs sort last in both directions, as in pandas
+        self.ascending = self.ranked[np.argsort(ranked_change, axis=2, kind="stable")]
+        self.descending = self.ranked[np.argsort(-ranked_change, axis=2, kind="stable")]
+
+
+class SalaryTools:
+    """Memoized tool computations over one prepared agent dataset."""
+
+    def __init__(
+        self,
+        dfs_dict: Dict[str, pd.DataFrame],
+        data_version: Optional[str] = None,
+        cache: Optional[LRUCache] = None,
+    ):
+        self.dfs_dict = dfs_dict
+        self.data_version = data_version or frames_version(dfs_dict)
+        self.cache = TOOL_CACHE if cache is None else cache
+        self.provinces = ProvinceIndex(dfs_dict["nominal_salaries"].columns)
+        self._precompute()
+
+    def _precompute(self):
+        df_net = self.dfs_dict["nominal_salaries"].sort_index()
+        df_real = self.dfs_dict["real_salaries"].sort_index()
+        df_ipc = self.dfs_dict["inflation_ipc"].sort_index()
+
+        self.columns = list(df_net.columns)
+        self._col_pos = {c: i for i, c in enumerate(self.columns)}
+        self.ranked_columns = [c for c in self.columns if c != AVERAGE_COLUMN]
+
+        self.net_axis = DateAxis(df_net.index)
+        self.net_values = df_net.to_numpy(dtype="float64")
+        ranked = np.array([self._col_pos[c] for c in self.ranked_columns], dtype=np.int64)
+        ranked_net = self.net_values[:, ranked]
+        self.net_ascending = ranked[np.argsort(ranked_net, axis=1, kind="stable")]
+        self.net_descending = ranked[np.argsort(-ranked_net, axis=1, kind="stable")]
+
+        self.real_axis = DateAxis(df_real.index)
+        self.real_columns = list(df_real.columns)
+        self._real_col_pos = {c: i for i, c in enumerate(self.real_columns)}
+        self.real_change = ChangeTensor(
+            df_real, [c for c in self.real_columns if c != AVERAGE_COLUMN]
+        )
+
+        self.ipc_axis = DateAxis(df_ipc.index)
+        self.ipc_values = df_ipc["infl_Nivel_general"].to_numpy(dtype="float64")
+
+    # --- Argument normalization ---
+
+    def normalize_province(self, province: any) -> Optional[str]:
+        """Canonical column name for `province`, or the cleaned input if unknown."""
+        name = _clean(province, "province")
+        if name is None:
+            return None
+        return self.provinces.resolve(name) or name
+
+    def _memo(self, tool_name: str, key: tuple, fn):
+        return self.cache.get_or_compute(tool_name, (self.data_version,) + key, fn)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    # --- Structured lookups (used by the intent router) ---
+
+    @property
+    def latest_date(self) -> pd.Timestamp:
+        return self.net_axis.index[-1]
+
+    def salary_at(self, province: str, period: Optional[str] = None):
+        """(date label, net salary) for a canonical province name."""
+        pos = self.net_axis.on_or_before(period) if period else len(self.net_axis.index) - 1
+        return self.net_axis.label(pos), float(self.net_values[pos, self._col_pos[province]])
+
+    def salary_ranking(self, period: Optional[str], k: int, asc: bool = False):
+        """(date label, [(province, net salary)]) for the top or bottom k."""
+        pos = self.net_axis.on_or_before(period) if period else len(self.net_axis.index) - 1
+        order = self.net_ascending if asc else self.net_descending
+        return self.net_axis.label(pos), [
+            (self.columns[p], float(self.net_values[pos, p])) for p in order[pos, :k]
+        ]
+
+    def real_change_for(self, start_date: str, end_date: str, province: str):
+        """(start label, end label, % change in real salary) for one province."""
+        s_pos = self.real_axis.on_or_after(start_date)
+        e_pos = self.real_axis.on_or_before(end_date)
+        change = self.real_change.change[s_pos, e_pos, self._real_col_pos[province]]
+        return self.real_axis.label(s_pos), self.real_axis.label(e_pos), float(change)
+
+    def real_change_ranking(self, start_date: str, end_date: str, k: int, most_loss: bool = True):
+        """(start label, end label, [(province, % change)]) for the k biggest losers or winners."""
+        tensor = self.real_change
+        s_pos = self.real_axis.on_or_after(start_date)
+        e_pos = self.real_axis.on_or_before(end_date)
+        order = tensor.ascending if most_loss else tensor.descending
+        changes = tensor.change[s_pos, e_pos]
+        return (
+            self.real_axis.label(s_pos),
+            self.real_axis.label(e_pos),
+            [(self.real_columns[p], float(changes[p])) for p in order[s_pos, e_pos, :k]],
+        )
+
+    def inflation_between(self, start_date: str, end_date: str):
+        """(start label, end label, % change in the general IPC)."""
+        s_pos = self.ipc_axis.on_or_after(start_date)
+        e_pos = self.ipc_axis.on_or_before(end_date)
+        change = (self.ipc_values[e_pos] / self.ipc_values[s_pos] - 1) * 100
+        return self.ipc_axis.label(s_pos), self.ipc_axis.label(e_pos), float(change)
+
+    # --- Tools ---
+
+    def province_salary(self, province: any, period: any = None) -> str:
+        prov = self.normalize_province(province)
+        period_val = _clean(period, "period") if period else None
+        pos = (
+            self.net_axis.on_or_before(period_val)
+            if period_val
+            else len(self.net_axis.index) - 1
+        )
+
+        if prov not in self._col_pos:
+            return f"Error: Province '{prov}' not found. Available: {', '.join(self.columns)}"
+
+        def compute():
+            val = self.net_values[pos, self._col_pos[prov]]
+            return f"Nominal salary for {prov} in {self.net_axis.label(pos)}: ${val:,.2f}"
+
+        return self._memo("get_province_salary", (prov, pos), compute)
+
+    def purchasing_power_change(
+        self,
+        start_date: any,
+        end_date: any,
+        province: any = None,
+        k: any = None,
+        most_loss: any = True,
+    ) -> str:
+        axis, tensor = self.real_axis, self.real_change
+        s_pos = axis.on_or_after(_clean(start_date, "start_date"))
+        e_pos = axis.on_or_before(_clean(end_date, "end_date"))
+        prov = self.normalize_province(province) if province else None
+        k_val = _clean(k, "k") if k else None
+        k_val = int(float(k_val)) if k_val else None
+        most_loss_val = _to_bool(most_loss, "most_loss")
+        period = f"({axis.label(s_pos)} to {axis.label(e_pos)})"
+
+        if prov:
+            if prov not in self._real_col_pos:
+                raise KeyError(prov)
+
+            def compute():
+                loss = tensor.change[s_pos, e_pos, self._real_col_pos[prov]]
+                return f"Purchasing power change for {prov} {period}: {loss:+.2f}%"
+
+            return self._memo(
+                "calculate_purchasing_power_loss", (s_pos, e_pos, prov), compute
+            )
+
+        def compute_all():
+            changes = tensor.change[s_pos, e_pos]
+            if k_val:
+                # most_loss: the lowest % changes (most negative) first
+                order = tensor.ascending if most_loss_val else tensor.descending
+                res = f"{'Worst' if most_loss_val else 'Best'} {k_val} provinces in purchasing power change {period}:\n"
+                for p in order[s_pos, e_pos, :k_val]:
+                    res += f"- {self.real_columns[p]}: {changes[p]:+.2f}%\n"
+                return res
+
+            loss_all = pd.Series(
+                changes[tensor.ranked], index=[self.real_columns[p] for p in tensor.ranked]
+            )
+            return f"Purchasing power change for all provinces {period}:\n{loss_all.to_string()}"
+
+        key = (s_pos, e_pos, None, k_val, most_loss_val if k_val else None)
+        return self._memo("calculate_purchasing_power_loss", key, compute_all)
+
+    def ranking_top_k(self, k: any, period: any, asc: any = False) -> str:
+        k_val = int(float(_clean(k, "k")))
+        asc_val = _to_bool(asc, "asc")
+        pos = self.net_axis.on_or_before(_clean(period, "period"))
+
+        def compute():
+            order = self.net_ascending if asc_val else self.net_descending
+            res = f"{'Bottom' if asc_val else 'Top'} {k_val} provinces in {self.net_axis.label(pos)}:\n"
+            for p in order[pos, :k_val]:
+                res += f"- {self.columns[p]}: ${self.net_values[pos, p]:,.2f}\n"
+            return res
+
+        return self._memo("get_ranking_top_k", (pos, k_val, asc_val), compute)
+
+    def inflation_change(self, start_date: any, end_date: any) -> str:
+        axis = self.ipc_axis
+        s_pos = axis.on_or_after(_clean(start_date, "start_date"))
+        e_pos = axis.on_or_before(_clean(end_date, "end_date"))
+
+        def compute():
+            inflation_change = (self.ipc_values[e_pos] / self.ipc_values[s_pos] - 1) * 100
+            return f"Inflation (IPC) change from {axis.label(s_pos)} to {axis.label(e_pos)}: {inflation_change:+.2f}%"
+
+        return self._memo("calculate_inflation_change", (s_pos, e_pos), compute)
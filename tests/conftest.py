@@ -0,0 +1,16 @@
+import os
+
+# Tests never reach S3: DataLoaders created without an explicit backend (e.g. by
+# importing salary_app) read a synthetic snapshot from the in-memory store.
+os.environ.setdefault("DATA_STORAGE_BACKEND", "memory")
+# Nor the network: litellm uses its bundled model price map instead of fetching it
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+def pytest_configure(config):
+    if os.environ["DATA_STORAGE_BACKEND"] != "memory":
+        return
+    from salary_data.synthetic import make_dataset
+    from salary_data.loader import DataLoader
+
+    DataLoader().publish_snapshot(make_dataset(), force=True)
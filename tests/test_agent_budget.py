@@ -0,0 +1,62 @@
+import os
+from salary_data.synthetic import make_dataset
+from salary_data.agent import AgentBudget, DataJournalistAgent
+from salary_data.response_cache import ResponseCache
+
+LOOPING = os.path.join(os.path.dirname(__file__), "fixtures", "looping_agent.json")
+
+
+def _agent(budget, **model_params):
+    data = make_dataset()
+    agent = DataJournalistAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": f"fake/{LOOPING}", **model_params},
+        data_version="v1",
+        response_cache=ResponseCache(maxsize=8),
+        budget=budget,
+    )
+    agent.router = None
+    return agent
+
+
+def test_iteration_limit_returns_partial_answer_with_tool_results():
+    agent = _agent(AgentBudget(max_iterations=3, deadline_s=30, llm_timeout_s=5))
+
+    res = agent.query("Who pays the most?", context_metadata={"language_preference": "en"})
+
+    assert res["partial"] is True and res["stopped_by"] == "iterations"
+    assert res["output"].startswith("I couldn't complete the analysis")
+    assert "Top 3 provinces in 2025-09" in res["output"]
+    assert "Nominal salary for Chaco" in res["output"]
+    assert res["telemetry"]["path"] == "partial"
+    assert res["telemetry"]["budget"]["stopped_by"] == "iterations"
+    assert res["telemetry"]["iterations"] == 3
+    # Partial answers are not cached
+    assert "cached" not in agent.query("Who pays the most?")
+
+
+def test_deadline_stops_between_steps():
+    agent = _agent(
+        AgentBudget(max_iterations=50, deadline_s=0.25, llm_timeout_s=5), first_token_delay=0.1
+    )
+
+    res = agent.query("Who pays the most?")
+
+    assert res["stopped_by"] == "deadline"
+    assert res["telemetry"]["iterations"] < 50
+    assert res["output"].startswith("No pude completar el análisis")
+
+
+def test_llm_call_timeout_ends_run_gracefully():
+    agent = _agent(
+        AgentBudget(max_iterations=8, deadline_s=30, llm_timeout_s=0.05), first_token_delay=1.0
+    )
+
+    res = agent.query("Who pays the most?", context_metadata={"language_preference": "en"})
+
+    assert res["stopped_by"] == "llm_timeout"
+    assert res["output"] == (
+        "I couldn't complete the analysis in the time available. "
+        "Try a more specific question (one province, one period)."
+    )
+    assert res["telemetry"]["llm_calls"][0]["error"] == "TimeoutError"
@@ -0,0 +1,61 @@
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from salary_data.agent_pool import AgentPool, AgentPoolTimeout
+from salary_data.chat import BUSY_MESSAGE, ChatService
+
+
+class Executor:
+    """Stands in for DataJournalistAgent: clones share `shared`."""
+
+    def __init__(self, shared):
+        self.shared = shared
+
+    def clone(self):
+        return Executor(self.shared)
+
+
+def test_pool_grows_to_size_and_bounds_concurrency():
+    primary = Executor(shared={"frames": 1})
+    pool = AgentPool(primary, size=2, timeout=5)
+    running, peak, seen = [0], [0], set()
+    lock = threading.Lock()
+
+    def request():
+        with pool.acquire() as agent:
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                seen.add(id(agent))
+            time.sleep(0.05)
+            assert agent.shared is primary.shared
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = pool.stats()
+    assert peak[0] == 2 and len(seen) == 2
+    assert stats["executors"] == 2 and stats["acquired"] == 6
+    assert stats["queued"] >= 4 and stats["in_use"] == 0
+
+
+def test_busy_pool_times_out_and_chat_answers_busy(monkeypatch):
+    pool = AgentPool(Executor(shared=None), size=1, timeout=0.05)
+    held = pool.checkout()
+    with pytest.raises(AgentPoolTimeout):
+        pool.checkout()
+    assert pool.stats()["timeouts"] == 1
+
+    service = ChatService(None, model_params={}, guardrail_model="test/model")
+    service._validator = SimpleNamespace(validate=lambda q: (True, ""))
+    monkeypatch.setattr(service, "get_pool", lambda: pool)
+    assert service.answer("salary?", {}, []) == BUSY_MESSAGE
+
+    pool.checkin(held)
+    assert pool.stats()["in_use"] == 0
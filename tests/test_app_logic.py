@@ -2,6 +2,8 @@ from src.salary_app import (
     process_citations,
     parse_report,
     navigate_carousel,
+    serve_layout,
+    data_store,
     REPORT_SECTIONS,
 )
 
@@ -52,9 +54,11 @@ Synthesis text.
 
     assert "Intro text" in REPORT_SECTIONS["en"]["intro"]
     assert len(REPORT_SECTIONS["en"]["clusters"]) == 2
-    assert "Cluster 1 text" in REPORT_SECTIONS["en"]["clusters"][0]
-    assert "Synthesis text" in REPORT_SECTIONS["en"]["synthesis"]
-    assert "Ref 1" in REPORT_SECTIONS["en"]["synthesis"]
+    assert REPORT_SECTIONS["en"]["clusters"][0]["title"] == "Title 1"
+    assert "Cluster 1 text" in REPORT_SECTIONS["en"]["clusters"][0]["body"]
+    assert REPORT_SECTIONS["en"]["synthesis"]["title"] == "Final"
+    assert "Synthesis text" in REPORT_SECTIONS["en"]["synthesis"]["body"]
+    assert "Ref 1" in REPORT_SECTIONS["en"]["synthesis"]["body"]
 
 
 def test_navigate_carousel_logic():
@@ -77,3 +81,22 @@ def test_navigate_carousel_logic():
         # Case 4: Prev clicked at index 7
         mock_ctx.triggered = [{"prop_id": "analytics-prev.n_clicks"}]
         assert navigate_carousel(1, 0, 7) == 6
+
+
+def _component(layout, component_id):
+    return next(c for c in layout._traverse() if getattr(c, "id", None) == component_id)
+
+
+def test_layout_defaults_follow_the_current_snapshot(monkeypatch):
+    """Each page load builds its dropdown defaults from data_store.current()."""
+    snap = data_store.current()
+    month = _component(serve_layout(), "comparison-month-dropdown")
+    assert month.value == len(snap.net_salary.index) - 1
+
+    # After a refresh swaps the snapshot, the next page load follows it
+    other = snap._replace(net_salary=snap.net_salary.iloc[:-1])
+    monkeypatch.setattr(data_store, "current", lambda: other)
+    layout = serve_layout()
+
+    assert _component(layout, "comparison-month-dropdown").value == len(other.net_salary.index) - 1
+    assert _component(layout, "date-picker-range").end_date == other.net_salary.index[-1]
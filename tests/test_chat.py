@@ -0,0 +1,119 @@
+import os
+import sys
+import subprocess
+import threading
+from types import SimpleNamespace
+import pytest
+from salary_data.chat import ChatService
+
+
+class FakeAgent:
+    built = 0
+
+    def __init__(self, dfs, model_params=None, **kwargs):
+        FakeAgent.built += 1
+        self.dfs = dfs
+
+
+class FakeStore:
+    def __init__(self):
+        self.snapshot = SimpleNamespace(version="v1", agent_dfs={"net_salaries": None})
+
+    def current(self):
+        return self.snapshot
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Keep the real langchain stack out of the test
+    monkeypatch.setitem(
+        sys.modules, "salary_data.agent", SimpleNamespace(DataJournalistAgent=FakeAgent)
+    )
+    FakeAgent.built = 0
+    return ChatService(FakeStore(), model_params={}, guardrail_model="test/model")
+
+
+def test_chat_modules_do_not_import_llm_stack():
+    code = (
+        "import sys, salary_data.chat, salary_data.guardrails; "
+        "print(any(m in sys.modules for m in ('litellm', 'langchain_experimental')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=os.environ.copy()
+    )
+    assert result.stdout.strip() == "False", result.stderr
+
+
+def test_agent_built_once_per_snapshot_version(service):
+    assert not service.agent_ready
+    first = service.get_agent()
+    assert service.get_agent() is first
+    assert FakeAgent.built == 1
+
+    service.data_store.snapshot = SimpleNamespace(version="v2", agent_dfs={})
+    service.on_snapshot(service.data_store.snapshot)
+    assert FakeAgent.built == 2
+    assert service.get_agent() is not first
+
+
+def test_on_snapshot_skips_unused_agent(service):
+    service.on_snapshot(service.data_store.current())
+    assert FakeAgent.built == 0
+
+
+def test_concurrent_first_requests_build_one_agent(service):
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(service.get_agent())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert FakeAgent.built == 1
+    assert all(a is agents[0] for a in agents)
+
+
+def test_prewarm_builds_validator_and_agent(service):
+    service.prewarm(background=False)
+    assert service.agent_ready
+    assert service.get_validator().relevance_model == "test/model"
+
+
+def test_answer_runs_guardrail_then_agent(service, monkeypatch):
+    service._validator = SimpleNamespace(
+        validate=lambda q: (False, "Off topic.") if "weather" in q else (True, "")
+    )
+    monkeypatch.setattr(
+        FakeAgent,
+        "query",
+        lambda self, q, context_metadata, chat_history, telemetry, callbacks: {"output": f"A: {q}"},
+        raising=False,
+    )
+
+    assert service.answer("weather?", {}, []) == "Off topic."
+    assert service.answer("salary?", {}, []) == "A: salary?"
+
+
+def test_stream_answer_accumulates_tools_and_draft(service, monkeypatch):
+    service._validator = SimpleNamespace(validate=lambda q: (True, ""))
+    events = [
+        {"type": "token", "text": "Let me check. "},
+        {"type": "tool", "name": "get_ranking_top_k", "input": "{}"},
+        {"type": "token", "text": "Neu"},
+        {"type": "token", "text": "quén"},
+        {"type": "final", "output": "Neuquén."},
+    ]
+    monkeypatch.setattr(
+        FakeAgent, "stream_query", lambda self, q, **kwargs: iter(events), raising=False
+    )
+
+    gen = service.stream_answer("top?", {}, [])
+    states = []
+    try:
+        while True:
+            states.append(next(gen))
+    except StopIteration as stop:
+        answer = stop.value
+
+    assert states[-1] == {"tools": ["get_ranking_top_k"], "draft": "Neuquén"}
+    assert answer == "Neuquén."
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from salary_data.synthetic import make_dataset
+from salary_data.agent import DataJournalistAgent
+from salary_data.fake_llm import FixtureChatModel
+from salary_data.response_cache import ResponseCache
+
+
+def test_fixture_model_picks_script_by_question_and_step():
+    llm = FixtureChatModel.from_fixture("default")
+    question = HumanMessage(content="Today: 2025-10-01.\n\nUSER QUESTION: Top 3 provinces?")
+
+    first = llm.invoke([SystemMessage(content="inflation rules"), question])
+    assert first.tool_calls[0]["name"] == "get_ranking_top_k"
+
+    second = llm.invoke(
+        [question, first, ToolMessage(content="...", tool_call_id=first.tool_calls[0]["id"])]
+    )
+    assert second.content.startswith("Final Answer: These are the three provinces")
+    # Questions no script matches get the fallback script
+    other = llm.invoke([HumanMessage(content="USER QUESTION: Salary in Chaco?")])
+    assert other.tool_calls[0]["name"] == "get_province_salary"
+
+
+def test_fake_model_runs_agent_offline_under_concurrency():
+    data = make_dataset()
+    agent = DataJournalistAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": "fake/default"},
+        data_version="v1",
+        response_cache=ResponseCache(maxsize=0),
+    )
+    agent.router = None
+    questions = ["Top 3 provinces?", "Compare Córdoba against inflation"] * 4
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        answers = list(pool.map(lambda q: agent.query(q)["output"], questions))
+
+    assert answers[::2] == [
+        "These are the three provinces with the highest net teacher salary in September 2025."
+    ] * 4
+    assert all(a.startswith("Between December 2023 and September 2025") for a in answers[1::2])
@@ -0,0 +1,79 @@
+import threading
+from salary_data.jobs import DONE, ERROR, PENDING, UNKNOWN, JobQueue, worker_processes
+
+
+def test_job_result_is_polled_by_id():
+    release = threading.Event()
+    queue = JobQueue(max_workers=2)
+
+    job_id = queue.submit(lambda: release.wait(5) and "answer")
+    assert queue.status(job_id)["state"] == PENDING
+
+    release.set()
+    queue._jobs[job_id][1].result(timeout=5)
+    assert queue.status(job_id) == {"state": DONE, "result": "answer"}
+
+    queue.discard(job_id)
+    assert queue.status(job_id)["state"] == UNKNOWN
+
+
+def test_failed_job_reports_error():
+    queue = JobQueue(max_workers=1)
+
+    def boom():
+        raise RuntimeError("LLM down")
+
+    job_id = queue.submit(boom)
+    queue._jobs[job_id][1].exception(timeout=5)
+
+    assert queue.status(job_id) == {"state": ERROR, "error": "LLM down"}
+
+
+def test_other_workers_see_results_through_directory(tmp_path):
+    queue = JobQueue(max_workers=1, directory=str(tmp_path))
+    job_id = queue.submit(lambda: "¿Chaco?")
+    queue._jobs[job_id][1].result(timeout=5)
+
+    # A second process on the same host shares only the directory
+    other = JobQueue(max_workers=1, directory=str(tmp_path))
+    status = other.status(job_id)
+
+    assert status["state"] == DONE and status["result"] == "¿Chaco?"
+
+
+def test_streaming_job_exposes_latest_partial():
+    step = threading.Event()
+    finish = threading.Event()
+    queue = JobQueue(max_workers=1)
+
+    def stream():
+        yield {"draft": "Cha"}
+        step.set()
+        finish.wait(5)
+        return "Chaco"
+
+    job_id = queue.submit_stream(stream)
+    step.wait(5)
+    assert queue.status(job_id) == {"state": PENDING, "partial": {"draft": "Cha"}}
+
+    finish.set()
+    queue._jobs[job_id][1].result(timeout=5)
+    assert queue.status(job_id) == {"state": DONE, "result": "Chaco"}
+
+
+def test_from_env_warns_about_several_workers_without_a_job_dir(monkeypatch, capsys, tmp_path):
+    monkeypatch.delenv("CHAT_JOB_DIR", raising=False)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setenv("GUNICORN_CMD_ARGS", "--bind 0.0.0.0:8050 --workers 3")
+    assert worker_processes() == 3
+
+    JobQueue.from_env()
+    assert "[Jobs] WARNING: 3 worker processes" in capsys.readouterr().out
+
+    monkeypatch.setenv("CHAT_JOB_DIR", str(tmp_path))
+    assert JobQueue.from_env().directory == str(tmp_path)
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.delenv("GUNICORN_CMD_ARGS")
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert worker_processes() == 1
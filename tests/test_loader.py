@@ -0,0 +1,137 @@
+import pandas as pd
+import pytest
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from salary_data.loader import DataLoader, CURRENT_KEY, frame_hash
+from salary_data.storage import MemoryBackend, S3Backend
+
+
+class FakeS3:
+    """Minimal in-memory stand-in for the boto3 S3 client."""
+
+    exceptions = SimpleNamespace(NoSuchKey=KeyError)
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+        self.puts.append((Key, kwargs.get("CacheControl")))
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {"Body": BytesIO(self.objects[Key])}
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """A DataLoader wired to an in-memory S3 and a mocked scraper (no network)."""
+    monkeypatch.setenv("AWS_S3_BUCKET", "test-bucket")
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID", raising=False)
+    with patch("salary_data.loader.Scraper"), patch("salary_data.loader.boto3"):
+        dl = DataLoader()
+    dl.s3_client = FakeS3()
+    dl.storage = S3Backend(dl.s3_client, "test-bucket")
+    return dl
+
+
+def sample_df(value=1.0):
+    dates = pd.date_range("2024-03-01", periods=3, freq="3MS")
+    return pd.DataFrame({"Chaco": [value, 2.0, 3.0]}, index=dates)
+
+
+def test_frame_hash_tracks_content():
+    assert frame_hash(sample_df()) == frame_hash(sample_df())
+    assert frame_hash(sample_df()) != frame_hash(sample_df(value=9.0))
+    assert frame_hash(sample_df()) != frame_hash(sample_df().astype("float32"))
+
+
+def test_publish_snapshot_writes_pointer_last(loader):
+    data = {"net_salaries": sample_df(), "inflation_ipc": sample_df(value=5.0)}
+
+    version = loader.publish_snapshot(data, source_hashes={"net_salaries": "abc"})
+
+    keys = [key for key, _ in loader.s3_client.puts]
+    assert keys[-1] == CURRENT_KEY
+    assert f"snapshots/{version}/raw/net_salaries.parquet" in keys
+    assert dict(loader.s3_client.puts)[keys[0]] == "public, max-age=31536000, immutable"
+
+    manifest = loader.get_manifest()
+    assert manifest["version"] == version
+    assert loader.load_hashes() == {"sources": {"net_salaries": "abc"}, "objects": manifest["hashes"]}
+    loaded = loader.get_all_data(allow_scrape=False)
+    pd.testing.assert_frame_equal(
+        loaded["inflation_ipc"], sample_df(value=5.0), check_freq=False, check_dtype=False
+    )
+
+
+def test_load_dataset_reads_only_the_requested_columns(loader):
+    ipc = pd.DataFrame(
+        {"infl_Nivel_general": [1.0, 2.0, 3.0], "infl_Salud": [4.0, 5.0, 6.0]},
+        index=sample_df().index,
+    )
+    loader.publish_snapshot({"inflation_ipc": ipc})
+
+    df = loader.load_dataset("inflation_ipc", columns=["infl_Nivel_general"])
+
+    assert list(df.columns) == ["infl_Nivel_general"]
+    pd.testing.assert_index_equal(df.index, ipc.index, check_exact=False)
+    assert loader.dataset_columns("inflation_ipc") == ["infl_Nivel_general", "infl_Salud"]
+
+
+def test_publish_snapshot_reuses_unchanged_objects(loader):
+    first = loader.publish_snapshot({"net_salaries": sample_df(), "clusters": sample_df()})
+    second = loader.publish_snapshot({"net_salaries": sample_df(value=7.0)})
+
+    objects = loader.resolve_current()["objects"]
+    assert second != first
+    assert objects["net_salaries"].startswith(f"snapshots/{second}/")
+    # Not re-uploaded, still served from the previous immutable snapshot
+    assert objects["clusters"].startswith(f"snapshots/{first}/")
+
+
+def test_failed_upload_leaves_pointer_untouched(loader):
+    first = loader.publish_snapshot({"net_salaries": sample_df()})
+    loader._save_to_s3 = MagicMock(return_value=False)
+
+    assert loader.publish_snapshot({"net_salaries": sample_df(value=3.0)}) is None
+    assert loader.resolve_current()["version"] == first
+
+
+def test_rollback_restores_previous_manifest(loader):
+    first = loader.publish_snapshot({"net_salaries": sample_df()})
+    snapshot_manifest = loader._load_json(f"snapshots/{first}/manifest.json")
+    loader._save_json({**snapshot_manifest, "version": "broken"}, CURRENT_KEY)
+
+    assert loader.rollback(first) is True
+    assert loader.resolve_current()["version"] == first
+
+
+def test_scrape_without_analytics_uses_raw_sources(loader):
+    loader.scraper.get_cgecse_salaries.return_value = sample_df()
+    loader.scraper.get_ipc_indec.return_value = sample_df()
+    loader.scraper.get_cba_cbt.return_value = sample_df()
+    loader.pipeline = MagicMock()
+    raw = {"net_salaries": b"net", "inflation_ipc": b"ipc"}
+
+    data = loader.scrape_and_process_all(raw_sources=raw, run_analytics=False)
+
+    assert "clusters" not in data and "anomalies" not in data
+    loader.scraper.get_ipc_indec.assert_called_once_with(content=b"ipc")
+    loader.pipeline.run_pipeline.assert_not_called()
+
+
+def test_memory_backend_selected_from_env(monkeypatch):
+    monkeypatch.setenv("DATA_STORAGE_BACKEND", "memory")
+    with patch("salary_data.loader.Scraper"):
+        dl = DataLoader()
+    dl.storage = MemoryBackend({})
+
+    version = dl.publish_snapshot({"net_salaries": sample_df()})
+
+    assert dl.s3_client is None
+    assert dl.get_manifest()["version"] == version
+    assert "net_salaries" in dl.get_all_data(allow_scrape=False)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from salary_data.prompts import PROMPT_CACHE, query_input, schema_block, system_prompt
+
+
+def _dfs():
+    dates = pd.date_range("2023-03-01", periods=4, freq="3MS")
+    nominal = pd.DataFrame({"Chaco": np.arange(4.0), "Salta": np.arange(4.0)}, index=dates)
+    return {
+        "nominal_salaries": nominal,
+        "real_salaries": nominal,
+        "inflation_ipc": pd.DataFrame({"infl_Nivel_general": np.arange(4.0)}, index=dates),
+        "anomalies": pd.DataFrame({"date": dates, "province": "Chaco", "anomaly": 1}),
+    }
+
+
+def test_schema_block_describes_frames_without_rows():
+    block = schema_block(_dfs())
+
+    assert "df1 nominal_salaries" in block
+    assert "date index 2023-03 to 2023-12" in block
+    assert "df3 inflation_ipc" in block and "infl_Nivel_general (float)" in block
+    assert "df4 anomalies" in block and "province (text)" in block
+    # No values from the data itself
+    assert "3.0" not in block
+
+
+def test_system_prompt_is_static_and_built_once_per_version():
+    PROMPT_CACHE.clear()
+    dfs = _dfs()
+
+    first = system_prompt(dfs, "v1", "compact")
+    second = system_prompt(dfs, "v1", "compact")
+
+    assert first is second
+    assert "Provinces: Chaco, Salta" in first
+    assert PROMPT_CACHE.stats()["hits"] == 1
+
+
+def test_query_input_truncates_long_history():
+    history = [
+        {"role": "user", "content": "Resumen"},
+        {"role": "assistant", "content": "x" * 5000},
+    ]
+
+    text = query_input("¿Y Chaco?", "es", "2025-09-01", "2026-01-01", chat_history=history)
+
+    assert "ASSISTANT: " + "x" * 600 + " [...]" in text
+    assert text.endswith("USER QUESTION: ¿Y Chaco?")
+    assert "Respond in ES" in text
@@ -0,0 +1,67 @@
+import sys
+import numpy as np
+import pandas as pd
+from salary_data.guardrails import InputValidator
+from salary_data.provinces import PROVINCES, ProvinceIndex
+from salary_data.tools import SalaryTools
+from salary_data.cache import LRUCache
+
+
+def test_resolve_exact_alias_fuzzy_and_miss():
+    index = ProvinceIndex(PROVINCES)
+
+    assert index.resolve("CORDOBA") == "Córdoba"
+    assert index.resolve("Provincia de Neuquén") == "Neuquén"
+    assert index.resolve("CABA") == "Ciudad de Buenos Aires"
+    assert index.resolve("Capital Federal") == "Ciudad de Buenos Aires"
+    assert index.resolve("Cordova") == "Córdoba"
+    assert index.resolve("Tucuman province") == "Tucumán"
+    # Too far from any name: "Santa" is not a typo of "Salta"
+    assert index.resolve("Santa") is None
+    assert index.resolve("Narnia") is None
+
+    assert index.stats() == {
+        "exact": 3, "alias": 2, "fuzzy": 1, "miss": 2, "retries_saved": 3,
+    }
+
+
+def test_find_prefers_longest_names_and_mentions_allows_typos():
+    index = ProvinceIndex(PROVINCES)
+
+    assert index.find("sueldos en Ciudad de Buenos Aires vs. Bs. As.") == [
+        "Ciudad de Buenos Aires",
+        "Buenos Aires",
+    ]
+    assert index.find("salary in caba and cordoba") == ["Ciudad de Buenos Aires", "Córdoba"]
+    assert index.mentions("docentes de Mendosa")
+    # Lowercase words need a closer match: "missions" is not "Misiones", "chacos" is "Chaco"
+    assert not index.mentions("docentes de mendosa")
+    assert not index.mentions("space missions")
+    assert index.mentions("docentes de chacos")
+    assert not index.mentions("what is the weather like?")
+
+
+def test_tools_and_guardrails_share_the_index(monkeypatch):
+    dates = pd.date_range("2023-03-01", periods=4, freq="3MS")
+    nominal = pd.DataFrame(
+        {"Córdoba": np.linspace(100, 400, 4), "Ciudad de Buenos Aires": np.linspace(90, 300, 4)},
+        index=dates,
+    )
+    months = pd.date_range("2023-01-01", periods=12, freq="MS")
+    tools = SalaryTools(
+        {
+            "nominal_salaries": nominal,
+            "real_salaries": nominal / 2,
+            "inflation_ipc": pd.DataFrame({"infl_Nivel_general": np.linspace(100, 200, 12)}, index=months),
+        },
+        data_version="v1",
+        cache=LRUCache(maxsize=8),
+    )
+
+    assert tools.province_salary("Cordova") == "Nominal salary for Córdoba in 2023-12: $400.00"
+    assert tools.province_salary("CABA").startswith("Nominal salary for Ciudad de Buenos Aires")
+    assert tools.provinces.stats()["retries_saved"] == 2
+
+    # Accented names no longer fall through to the LLM relevance check
+    monkeypatch.setitem(sys.modules, "litellm", None)
+    assert InputValidator().is_relevant("¿Y los docentes de Neuquén?") == (True, "Heuristic_Match")
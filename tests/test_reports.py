@@ -0,0 +1,39 @@
+import json
+from salary_data.reports import compile_report, load_report_sections, REPORT_FILES
+
+
+def test_compile_report_extracts_titles_and_bodies():
+    content = """# Intro
+Intro [[3]].
+
+## **Cluster 1: First**
+Body one.
+
+## **Cluster 2 without title**
+Body two.
+
+## **Síntesis y Perspectivas Futuras: Cierre**
+Closing.
+"""
+    report = compile_report(content)
+
+    assert '<sup><a href="#ref3">3</a></sup>' in report["intro"]
+    assert report["clusters"][0] == {"title": "First", "body": "Body one."}
+    assert report["clusters"][1]["title"] is None
+    assert report["clusters"][1]["body"].startswith("## **Cluster 2")
+    assert report["synthesis"] == {"title": "Cierre", "body": "Closing."}
+
+
+def test_load_report_sections_prefers_artifact(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "reports").mkdir()
+    artifact = {"en": {"intro": "prebuilt", "clusters": [], "synthesis": {"title": None, "body": ""}}}
+    (tmp_path / "reports" / "report_sections.json").write_text(json.dumps(artifact))
+
+    assert load_report_sections()["en"]["intro"] == "prebuilt"
+
+
+def test_shipped_artifact_covers_every_language():
+    sections = load_report_sections()
+    assert set(sections) == set(REPORT_FILES)
+    assert all(len(s["clusters"]) == 6 and s["synthesis"]["title"] for s in sections.values())
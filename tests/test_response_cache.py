@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+import pytest
+from salary_data.response_cache import ResponseCache, normalize_question, response_key
+
+CONTEXT = {"selected_province": "Chaco", "language_preference": "es"}
+
+
+def test_equivalent_questions_share_a_key():
+    assert normalize_question("¿Cuál es la provincia que MÁS paga?") == normalize_question(
+        "cual es la provincia que mas paga"
+    )
+    history = [{"role": "user", "content": "¿Cuál es la provincia que más paga?"}]
+    assert response_key(
+        "¿Cuál es la provincia que más paga?", "es", CONTEXT, history, "v1"
+    ) == response_key("cual es la provincia que mas paga", "es", CONTEXT, None, "v1")
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"lang": "en"},
+        {"data_version": "v2"},
+        {"context": {"selected_province": "Salta"}},
+        {"history": [{"role": "user", "content": "y en Salta?"}]},
+    ],
+)
+def test_key_depends_on_language_context_history_and_version(change):
+    base = dict(lang="es", context=CONTEXT, history=None, data_version="v1")
+    args = {**base, **change}
+    assert response_key("top", args["lang"], args["context"], args["history"], args["data_version"]) != (
+        response_key("top", "es", CONTEXT, None, "v1")
+    )
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache(maxsize=8)
+    cache.put("k", "Error: rate limited")
+    cache.put("q", "⚠️ **Quota reached.** Please wait 30s.")
+    assert cache.get("k") is None and cache.get("q") is None
+
+
+def test_disk_backend_survives_a_new_process_cache(tmp_path):
+    ResponseCache(maxsize=8, directory=str(tmp_path)).put("k", "Chaco pays $500.")
+
+    fresh = ResponseCache(maxsize=8, directory=str(tmp_path))
+    assert fresh.get("k") == "Chaco pays $500."
+    assert fresh.stats()["disk_hits"] == 1
+
+    expired = ResponseCache(maxsize=8, ttl=1e-9, directory=str(tmp_path))
+    assert expired.get("k") is None
+
+
+def test_agent_query_skips_llm_on_repeat():
+    import pandas as pd
+    from salary_data.agent import DataJournalistAgent
+
+    agent = DataJournalistAgent.__new__(DataJournalistAgent)
+    agent.model_params = {"model": "fake/test"}
+    agent.dfs_dict = {"nominal_salaries": pd.DataFrame(index=pd.to_datetime(["2025-06-01"]))}
+    agent.tools = MagicMock(data_version="v1")
+    agent.response_cache = ResponseCache(maxsize=8)
+    agent.router = None
+    agent.agent = MagicMock()
+    agent.agent.invoke.return_value = {"output": "Final Answer: Chaco pays the most."}
+
+    first = agent.query("Who pays the most?", context_metadata={"language_preference": "en"})
+    second = agent.query("who pays the MOST", context_metadata={"language_preference": "en"})
+
+    assert first["output"] == second["output"] == "Chaco pays the most."
+    assert second["cached"] is True
+    agent.agent.invoke.assert_called_once()
@@ -0,0 +1,159 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from salary_data.cache import LRUCache
+from salary_data.router import IntentRouter, detect_language
+from salary_data.tools import SalaryTools
+
+
+@pytest.fixture
+def router():
+    dates = pd.date_range("2023-03-01", periods=8, freq="3MS")
+    nominal = pd.DataFrame(
+        {
+            "Buenos Aires": np.linspace(100, 800, 8),
+            "Ciudad de Buenos Aires": np.linspace(120, 900, 8),
+            "Córdoba": np.linspace(90, 600, 8),
+            "Promedio Ponderado (MG Total)": np.linspace(95, 700, 8),
+        },
+        index=dates,
+    )
+    dfs = {
+        "nominal_salaries": nominal,
+        "real_salaries": nominal / np.linspace(1, 4, 8)[:, None],
+        "inflation_ipc": pd.DataFrame({"infl_Nivel_general": np.linspace(100, 400, 8)}, index=dates),
+    }
+    return IntentRouter(SalaryTools(dfs, data_version="v1", cache=LRUCache(maxsize=64)))
+
+
+def test_detects_question_language():
+    assert detect_language("¿Cuál fue la provincia que más perdió?", "en") == "es"
+    assert detect_language("Which province pays the most?", "es") == "en"
+
+
+def test_provinces_match_longest_name_and_aliases(router):
+    assert router.find_provinces(" salario en ciudad de buenos aires ") == ["Ciudad de Buenos Aires"]
+    assert router.find_provinces(" salary in caba and cordoba ") == ["Ciudad de Buenos Aires", "Córdoba"]
+
+
+def test_routes_salary_ranking(router):
+    routed = router.route("Which is the top paying province in December 2023?", lang="es")
+
+    assert routed.intent == "salary_ranking"
+    assert routed.answer == (
+        "The top-paying province in 2023-12 is Ciudad de Buenos Aires, "
+        "with a net teacher salary of $454.29."
+    )
+
+
+def test_routes_purchasing_power_between_dates(router):
+    routed = router.route(
+        "What was the purchasing power loss in Buenos Aires between March 2023 and today?"
+    )
+
+    assert routed.intent == "purchasing_power"
+    assert routed.answer.startswith("Between 2023-03 and 2024-12, the purchasing power")
+    assert "(a gain)" in routed.answer or "(a loss)" in routed.answer
+
+
+def test_routes_spanish_calendar_year_ranking(router):
+    routed = router.route("¿Cuál fue la provincia que más poder adquisitivo perdió en 2024?", lang="en")
+
+    assert routed.intent == "change_ranking"
+    assert routed.lang == "es"
+    assert routed.answer.startswith("Entre 2023-12 y 2024-12,")
+
+
+@pytest.mark.parametrize(
+    "question,best",
+    [
+        ("Which province lost the most purchasing power in 2024?", False),
+        ("Which province lost the least purchasing power in 2024?", True),
+        ("¿Qué provincia perdió más poder adquisitivo en 2024?", False),
+        ("¿Qué provincia perdió menos poder adquisitivo en 2024?", True),
+    ],
+)
+def test_change_ranking_direction_follows_least_and_most(router, question, best):
+    routed = router.route(question)
+
+    assert routed.intent == "change_ranking"
+    # Buenos Aires had the best change in 2024, Córdoba the worst
+    assert ("Buenos Aires" in routed.answer) == best
+    assert ("Córdoba" in routed.answer) != best
+
+
+def test_follow_ups_use_the_selected_province_and_years_run_december_to_december(router):
+    question = "How much purchasing power did it lose since last year?"
+    routed = router.route(question, context_metadata={"selected_province": "Córdoba"})
+    assert routed.intent == "purchasing_power" and "in Córdoba" in routed.answer
+    # The weighted average or no selection: the LLM resolves "it"
+    assert router.route(question, context_metadata={"selected_province": "Promedio Ponderado (MG Total)"}) is None
+    assert router.route(question) is None
+
+    since = router.route("How much purchasing power did Córdoba lose since 2024?")
+    during = router.route("How much purchasing power did Córdoba lose in 2024?")
+    assert since.answer.startswith("Between 2023-12 and 2024-12")
+    assert since.answer == during.answer
+
+
+@pytest.mark.parametrize(
+    "question,history",
+    [
+        ("Compare the salary of Córdoba versus inflation in 2024.", []),
+        ("What was the inflation in Narnia in 2024?", []),
+        ("Which province pays the most in March 1990?", []),
+        ("Which province lost at least 10% since 2023?", []),
+        ("And how much did it lose since last year?", [{"role": "user", "content": "Who pays the most?"}]),
+    ],
+)
+def test_falls_back_to_llm(router, question, history):
+    assert router.route(question, chat_history=history) is None
+
+
+def test_routes_province_salary(router):
+    routed = router.route("What is the salary in Córdoba?")
+
+    assert routed.intent == "province_salary" and "2024-12" in routed.answer
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "Is the salary in Córdoba above the poverty line?",
+        "¿El sueldo en Córdoba supera la canasta básica?",
+        "Was there any anomaly in the salary of Córdoba in 2024?",
+        "What is the gross salary in Córdoba?",
+        "¿Cuál es el salario bruto en Córdoba?",
+        "What is the basic salary in Córdoba?",
+        "What is the salary in Córdoba in real terms?",
+        "Does Córdoba pay more than the average?",
+        "¿Córdoba paga más que el promedio?",
+        "How much is the salary in Córdoba per hour?",
+        "¿Cuánto cobra por hora un docente en Córdoba?",
+        # After the latest data (2024-12): the tools would answer with 2024-12
+        "What will the salary in Córdoba be in 2026?",
+        "What is the salary in Córdoba in March 2025?",
+        "Which province pays the most in 2026?",
+    ],
+)
+def test_salary_questions_with_modifiers_or_future_dates_fall_back_to_llm(router, question):
+    assert router.route(question) is None
+
+
+def test_agent_answers_routed_questions_without_llm(router):
+    from salary_data.agent import DataJournalistAgent
+
+    agent = DataJournalistAgent.__new__(DataJournalistAgent)
+    agent.model_params = {"model": "fake/test"}
+    agent.tools = router.tools
+    agent.router = router
+    agent.response_cache = MagicMock()
+    agent.agent = MagicMock()
+
+    res = agent.query("Top paying province in December 2023", context_metadata={"language_preference": "en"})
+
+    assert res["routed"] == "salary_ranking"
+    agent.agent.invoke.assert_not_called()
+    agent.response_cache.get.assert_not_called()
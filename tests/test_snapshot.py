@@ -0,0 +1,91 @@
+import pandas as pd
+import numpy as np
+import pytest
+from salary_data.snapshot import (
+    SnapshotRefresher,
+    build_snapshot,
+    manifest_version,
+)
+
+
+def make_data(scale=1.0):
+    dates = pd.date_range(start="2015-03-01", periods=40, freq="3MS")
+    months = pd.date_range(start="2016-12-01", periods=110, freq="MS")
+    salaries = pd.DataFrame(
+        {"Chaco": np.linspace(100, 500, 40) * scale, "Salta": np.linspace(90, 450, 40)},
+        index=dates,
+    )
+    return {
+        "net_salaries": salaries,
+        "gross_salaries": salaries * 1.3,
+        "basic_salaries": salaries * 0.6,
+        "inflation_ipc": pd.DataFrame(
+            {"infl_Nivel_general": np.linspace(100, 900, 110)}, index=months
+        ),
+        "poverty_lines": pd.DataFrame(
+            {"linea_pobreza": np.linspace(10, 90, 110)}, index=months
+        ),
+    }
+
+
+class FakeLoader:
+    def __init__(self):
+        self.manifest = {"version": "v1", "objects": {}}
+        self.data = make_data()
+        self.loads = 0
+
+    def get_manifest(self):
+        return self.manifest
+
+    def get_all_data(self, allow_scrape=True, manifest=None):
+        self.loads += 1
+        return self.data
+
+
+def test_build_snapshot_aligns_to_start_limit():
+    snap = build_snapshot(make_data(), "v1")
+
+    assert snap.net_salary.index.min() == pd.Timestamp("2016-12-01")
+    assert snap.cba_cbt.index.min() == pd.Timestamp("2016-12-01")
+    assert not snap.has_analytics
+    assert set(snap.agent_dfs) == {"net_salaries", "inflation_ipc", "poverty_lines", "anomalies"}
+
+
+def test_manifest_version():
+    assert manifest_version({"version": "20260101T000000Z", "objects": {}}) == "20260101T000000Z"
+    assert manifest_version(None).startswith("local-")
+
+
+def test_check_now_swaps_only_on_manifest_change():
+    loader = FakeLoader()
+    refresher = SnapshotRefresher(loader)
+    swapped = []
+    refresher.add_listener(lambda snap: swapped.append(snap.version))
+
+    first = refresher.load_initial()
+    assert refresher.check_now() is False
+    assert refresher.current() is first
+
+    loader.manifest = {"version": "v2", "objects": {}}
+    loader.data = make_data(scale=2.0)
+    assert refresher.check_now() is True
+
+    second = refresher.current()
+    assert second is not first
+    assert second.version != first.version
+    # The old snapshot is untouched, so in-flight requests keep a consistent view
+    assert first.net_salary["Chaco"].iloc[-1] == pytest.approx(500.0)
+    assert second.net_salary["Chaco"].iloc[-1] == pytest.approx(1000.0)
+    assert swapped == [first.version, second.version]
+
+
+def test_check_now_keeps_snapshot_when_data_incomplete():
+    loader = FakeLoader()
+    refresher = SnapshotRefresher(loader)
+    first = refresher.load_initial()
+
+    loader.manifest = {"version": "v2", "objects": {}}
+    loader.data = {"net_salaries": make_data()["net_salaries"]}
+
+    assert refresher.check_now() is False
+    assert refresher.current() is first
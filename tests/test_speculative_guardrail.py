@@ -0,0 +1,71 @@
+import sys
+import json
+import time
+from types import SimpleNamespace
+from salary_data.synthetic import make_dataset
+from salary_data.agent import DataJournalistAgent
+from salary_data.agent_pool import AgentPool
+from salary_data.chat import ChatService
+from salary_data.guardrails import OFF_TOPIC_MESSAGE
+from salary_data.response_cache import ResponseCache
+
+
+def _service(monkeypatch, verdict: str, llm_delay: float):
+    """Speculative ChatService over the fixture agent; the guardrail LLM answers in 0.2 s."""
+
+    def completion(model, messages, **kwargs):
+        time.sleep(0.2)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=verdict))])
+
+    monkeypatch.setitem(sys.modules, "litellm", SimpleNamespace(completion=completion))
+    monkeypatch.setenv("GUARDRAIL_CLASSIFIER", "0")
+    data = make_dataset()
+    agent = DataJournalistAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": "fake/default", "first_token_delay": llm_delay},
+        data_version="v1",
+        response_cache=ResponseCache(maxsize=8),
+    )
+    store = SimpleNamespace(current=lambda: SimpleNamespace(version="v1"))
+    service = ChatService(store, model_params={}, guardrail_model="test/model", speculative=True)
+    service._agent_entry = ("v1", AgentPool(agent))
+    return service, agent
+
+
+def _telemetry(capsys) -> dict:
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[Telemetry] ")]
+    return json.loads(lines[-1][len("[Telemetry] "):])
+
+
+def test_rejected_speculative_run_is_stopped_and_never_cached(monkeypatch, capsys):
+    service, agent = _service(monkeypatch, "IRRELEVANT", llm_delay=0.3)
+
+    assert service.answer("What do you think of it?", {}, []) == OFF_TOPIC_MESSAGE
+
+    record = _telemetry(capsys)
+    assert record["path"] == "cancelled" and record["speculative"] is True
+    # Stopped before its first tool call
+    assert record["iterations"] == 1 and record["tools"] == []
+    assert agent.response_cache.stats()["size"] == 0
+
+
+def test_accepted_speculative_run_overlaps_the_guardrail(monkeypatch, capsys):
+    service, agent = _service(monkeypatch, "RELEVANT", llm_delay=0.1)
+
+    start = time.perf_counter()
+    gen = service.stream_answer("What do you think of it?", {"language_preference": "en"}, [])
+    states = []
+    try:
+        while True:
+            states.append(next(gen))
+    except StopIteration as stop:
+        answer = stop.value
+    elapsed = time.perf_counter() - start
+
+    record = _telemetry(capsys)
+    assert record["path"] == "llm" and record["speculative"] is True
+    assert answer and answer != OFF_TOPIC_MESSAGE
+    # Two LLM calls of >= 0.1 s ran while the 0.2 s guardrail call was in flight
+    assert elapsed < 0.2 + record["llm_ms"] / 1000
+    # The verdict was cached, so asking again does not start a speculative run
+    assert service.get_validator().precheck("What do you think of it?") == (True, "")
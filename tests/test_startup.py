@@ -0,0 +1,38 @@
+import os
+import sys
+import subprocess
+from salary_data.startup import StartupProfile, check_budgets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_startup_profile_records_phases():
+    profile = StartupProfile()
+    profile.mark("imports")
+    profile.mark("data")
+
+    result = profile.as_dict()
+    assert list(result["phases"]) == ["imports", "data"]
+    assert result["total_ms"] >= sum(result["phases"].values()) - 1e-6
+    assert "peak_rss_mb" in result["memory"]["data"]
+
+
+def test_check_budgets_flags_slow_phases_and_chat_imports():
+    results = {"total_ms": 900.0, "data_ms": 700.0, "chat_modules": []}
+    assert check_budgets(results, {"total_ms": 1000, "data_ms": 800}) == []
+
+    failures = check_budgets(
+        {**results, "chat_modules": ["litellm"]}, {"total_ms": 1000, "data_ms": 500}
+    )
+    assert failures == ["data_ms: 700.0 > 500", "chat stack imported at startup: litellm"]
+
+
+def test_cold_start_meets_the_startup_budgets():
+    # The real check: fresh interpreters import salary_app against synthetic data
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "src")}
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "benchmark_startup.py"), "--repeat", "1"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+    assert "[Startup] All budgets met." in result.stdout
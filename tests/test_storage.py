@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from salary_data.storage import (
+    STORAGE_PROFILES,
+    LocalBackend,
+    MemoryBackend,
+    get_local_backend,
+    get_profile,
+    to_parquet_bytes,
+    read_parquet_bytes,
+    parquet_columns,
+)
+
+
+@pytest.fixture
+def ipc_frame():
+    dates = pd.date_range("2016-12-01", periods=24, freq="MS", name="date")
+    return pd.DataFrame(
+        {
+            "infl_Nivel_general": np.linspace(100, 300, 24),
+            "infl_Salud": np.linspace(100, 280, 24),
+            "infl_Transporte": np.linspace(100, 320, 24),
+        },
+        index=dates,
+    )
+
+
+@pytest.mark.parametrize("profile", list(STORAGE_PROFILES.values()), ids=list(STORAGE_PROFILES))
+def test_profiles_round_trip(ipc_frame, profile):
+    df = read_parquet_bytes(to_parquet_bytes(ipc_frame, profile))
+
+    pd.testing.assert_index_equal(df.index, ipc_frame.index)
+    np.testing.assert_allclose(df.values, ipc_frame.values, rtol=1e-6)
+
+
+def test_only_the_compact_profile_downcasts_floats(monkeypatch, ipc_frame):
+    df = read_parquet_bytes(to_parquet_bytes(ipc_frame, get_profile("compact")))
+    assert (df.dtypes == "float32").all()
+
+    # The default profile is lossless
+    monkeypatch.delenv("DATA_STORAGE_PROFILE", raising=False)
+    for name in (None, "dashboard", "archive", "legacy"):
+        df = read_parquet_bytes(to_parquet_bytes(ipc_frame, get_profile(name)))
+        pd.testing.assert_frame_equal(df, ipc_frame, check_freq=False)
+
+
+def test_projected_read_decodes_only_the_requested_columns(ipc_frame):
+    body = to_parquet_bytes(ipc_frame, get_profile("dashboard"))
+
+    df = read_parquet_bytes(body, columns=["infl_Salud"])
+
+    assert list(df.columns) == ["infl_Salud"]
+    pd.testing.assert_series_equal(df["infl_Salud"], ipc_frame["infl_Salud"], check_freq=False)
+    assert parquet_columns(body) == list(ipc_frame.columns)
+
+
+def test_get_profile_from_env(monkeypatch):
+    monkeypatch.setenv("DATA_STORAGE_PROFILE", "legacy")
+    assert get_profile().name == "legacy"
+
+    with pytest.raises(ValueError):
+        get_profile("missing")
+
+
+@pytest.mark.parametrize("kind", ["local", "memory"])
+def test_offline_backends_round_trip(kind, tmp_path):
+    backend = LocalBackend(str(tmp_path)) if kind == "local" else MemoryBackend({})
+
+    backend.put("snapshots/v1/raw/net.parquet", b"payload", cache_control="immutable")
+
+    assert backend.get("snapshots/v1/raw/net.parquet") == b"payload"
+    assert backend.head("snapshots/v1/raw/net.parquet") == backend.head("snapshots/v1/raw/net.parquet")
+    with pytest.raises(KeyError):
+        backend.get("current.json")
+
+
+def test_local_backend_rejects_keys_outside_root(tmp_path):
+    with pytest.raises(ValueError):
+        LocalBackend(str(tmp_path)).put("../escape.json", b"{}")
+
+
+def test_get_local_backend_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATA_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setenv("DATA_STORAGE_LATENCY_MS", "5")
+    backend = get_local_backend("local")
+    assert isinstance(backend, LocalBackend) and backend.latency_ms == 5.0
+    with pytest.raises(ValueError):
+        get_local_backend("gcs")
@@ -0,0 +1,53 @@
+from langchain_core.messages import AIMessage
+from salary_data.synthetic import make_dataset
+from salary_data.agent import DataJournalistAgent
+from salary_data.fake_llm import ScriptedChatModel, tool_call
+from salary_data.response_cache import ResponseCache
+
+
+class ScriptedAgent(DataJournalistAgent):
+    def _make_llm(self):
+        return ScriptedChatModel(
+            responses=[
+                tool_call("get_province_salary", province="Chaco", period="2024-06"),
+                AIMessage(content="Final Answer: Chaco paid the most in 2024-06."),
+            ]
+        )
+
+
+def _agent():
+    data = make_dataset()
+    agent = ScriptedAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": "scripted"},
+        data_version="v1",
+        response_cache=ResponseCache(maxsize=0),
+    )
+    agent.router = None
+    return agent
+
+
+def test_stream_query_yields_tool_tokens_then_clean_answer():
+    events = list(_agent().stream_query("Who paid the most?"))
+
+    assert events[0] == {
+        "type": "tool",
+        "name": "get_province_salary",
+        "input": "{'province': 'Chaco', 'period': '2024-06'}",
+    }
+    tokens = "".join(e["text"] for e in events if e["type"] == "token")
+    assert tokens == "Final Answer: Chaco paid the most in 2024-06."
+    # The final event carries the post-processed answer, as query() returns it
+    assert events[-1]["type"] == "final"
+    assert events[-1]["output"] == "Chaco paid the most in 2024-06."
+
+
+def test_stream_query_short_circuits_cached_answers():
+    agent = _agent()
+    agent.response_cache = ResponseCache(maxsize=8)
+    agent.query("Who paid the most?")
+
+    events = list(agent.stream_query("who paid the MOST"))
+
+    assert events[0].pop("telemetry")["path"] == "cache"
+    assert events == [{"type": "final", "output": "Chaco paid the most in 2024-06.", "cached": True}]
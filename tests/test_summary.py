@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+import pytest
+from salary_data.synthetic import make_dataset
+from salary_data.cache import LRUCache
+from salary_data.summary import SummaryStore
+
+
+class FakeStore:
+    def __init__(self, version="v1"):
+        data = make_dataset()
+        self.agent_dfs = {
+            k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")
+        }
+        self.snapshot = SimpleNamespace(version=version, agent_dfs=self.agent_dfs)
+
+    def current(self):
+        return self.snapshot
+
+
+@pytest.fixture
+def store():
+    return FakeStore()
+
+
+def test_summary_rendered_once_per_version_and_language(store):
+    summaries = SummaryStore(store, cache=LRUCache(maxsize=6))
+
+    first = summaries.get("es")
+    again = summaries.get("es")
+    english = summaries.get("en")
+
+    assert first is again
+    assert first.startswith("# Resumen Ejecutivo")
+    assert english.startswith("# Executive Summary")
+    # Two renders and one shared set of prepared frames
+    assert summaries.cache.stats()["namespaces"]["frames"]["misses"] == 1
+    assert summaries.cache.stats()["namespaces"]["summary"]["misses"] == 2
+
+
+def test_new_snapshot_is_prerendered_in_both_languages(store):
+    summaries = SummaryStore(store, cache=LRUCache(maxsize=6))
+    summaries.get("es")
+
+    store.snapshot = SimpleNamespace(version="v2", agent_dfs=store.agent_dfs)
+    summaries.on_snapshot(store.snapshot)
+    misses = summaries.cache.stats()["namespaces"]["summary"]["misses"]
+    summaries.get("es")
+    summaries.get("en")
+
+    assert summaries.cache.stats()["namespaces"]["summary"]["misses"] == misses
@@ -0,0 +1,56 @@
+import json
+import sys
+from types import SimpleNamespace
+from salary_data.synthetic import make_dataset
+from salary_data.agent import DataJournalistAgent
+from salary_data.response_cache import ResponseCache
+from salary_data.telemetry import RequestTelemetry, metrics
+
+
+def test_query_attaches_step_timings_tools_and_iterations(capsys):
+    data = make_dataset()
+    agent = DataJournalistAgent(
+        {k: data[k] for k in ("net_salaries", "inflation_ipc", "poverty_lines", "anomalies")},
+        model_params={"model": "fake/default"},
+        data_version="v1",
+        response_cache=ResponseCache(maxsize=0),
+    )
+    agent.router = None
+
+    record = agent.query("Compare Córdoba against inflation")["telemetry"]
+
+    assert record["path"] == "llm" and record["data_version"] == "v1"
+    assert set(record["stages"]) == {"fast_path", "build_prompt", "agent", "clean_output"}
+    assert record["iterations"] == 3
+    assert [c.get("tool_calls") for c in record["llm_calls"]] == [
+        ["calculate_inflation_change"],
+        ["calculate_purchasing_power_loss"],
+        None,
+    ]
+    assert record["tools"][1]["name"] == "calculate_purchasing_power_loss"
+    assert record["tools"][1]["args"]["province"] == "Córdoba"
+    assert record["stages"]["agent"] >= record["llm_ms"] + record["tool_ms"]
+    # One JSON log line per request
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[Telemetry] ")]
+    assert json.loads(lines[-1][len("[Telemetry] "):])["request_id"] == record["request_id"]
+
+
+def test_emit_logs_metrics_to_active_mlflow_run(monkeypatch):
+    logged = {}
+    mlflow = SimpleNamespace(
+        active_run=lambda: object(),
+        log_metrics=lambda m: logged.update(metrics=m),
+        log_dict=lambda d, path: logged.update(path=path),
+    )
+    monkeypatch.setitem(sys.modules, "mlflow", mlflow)
+    monkeypatch.setenv("AGENT_TELEMETRY_MLFLOW", "1")
+    telemetry = RequestTelemetry(model="fake/default")
+    with telemetry.stage("guardrail"):
+        pass
+    telemetry.path = "rejected"
+
+    record = telemetry.emit()
+
+    assert logged["metrics"] == metrics(record)
+    assert "stage_guardrail_ms" in logged["metrics"]
+    assert logged["path"] == f"telemetry/{record['request_id']}.json"
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from salary_data.cache import LRUCache
+from salary_data.tools import SalaryTools, fold
+
+
+@pytest.fixture
+def dfs():
+    dates = pd.date_range("2023-03-01", periods=8, freq="3MS")
+    months = pd.date_range("2023-01-01", periods=30, freq="MS")
+    nominal = pd.DataFrame(
+        {
+            "Córdoba": np.linspace(100, 800, 8),
+            "Chaco": np.linspace(90, 600, 8),
+            "Promedio Ponderado (MG Total)": np.linspace(95, 700, 8),
+        },
+        index=dates,
+    )
+    return {
+        "nominal_salaries": nominal,
+        "real_salaries": nominal / np.linspace(1, 4, 8)[:, None],
+        "inflation_ipc": pd.DataFrame({"infl_Nivel_general": np.linspace(100, 400, 30)}, index=months),
+    }
+
+
+@pytest.fixture
+def tools(dfs):
+    return SalaryTools(dfs, data_version="v1", cache=LRUCache(maxsize=64))
+
+
+def test_fold_ignores_case_and_accents():
+    assert fold("  CÓRDOBA ") == fold("cordoba")
+
+
+def test_equivalent_arguments_share_one_cache_entry(tools):
+    first = tools.province_salary("cordoba", "2024-01-15")
+    second = tools.province_salary('{"province": "Córdoba"}', "2023-12-01")
+
+    assert first == second == "Nominal salary for Córdoba in 2023-12: $400.00"
+    stats = tools.stats()["namespaces"]["get_province_salary"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_unknown_province_is_reported_not_cached(tools):
+    assert tools.province_salary("Narnia").startswith("Error: Province 'Narnia' not found")
+    assert len(tools.cache) == 0
+
+
+def test_ranking_excludes_average_and_parses_bool_strings(tools):
+    res = tools.ranking_top_k("2", "2024-12", asc="false")
+    assert res.splitlines()[0] == "Top 2 provinces in 2024-12:"
+    assert "Promedio" not in res
+    assert tools.ranking_top_k(2, "2024-12-31", asc=False) == res
+    assert tools.stats()["hits"] == 1
+
+
+def test_purchasing_power_and_inflation_snap_dates(tools):
+    single = tools.purchasing_power_change("2023-02-01", "2024-12-31", province="chaco")
+    assert single.startswith("Purchasing power change for Chaco (2023-03 to 2024-12):")
+
+    worst = tools.purchasing_power_change("2023-03-01", "2024-12-01", k=1, most_loss=True)
+    assert worst.startswith("Worst 1 provinces")
+
+    assert tools.inflation_change("2023-01-01", "2023-02-01") == (
+        "Inflation (IPC) change from 2023-01 to 2023-02: +10.34%"
+    )
+
+
+def test_data_version_separates_entries(dfs):
+    cache = LRUCache(maxsize=64)
+    SalaryTools(dfs, data_version="v1", cache=cache).inflation_change("2023-01-01", "2024-01-01")
+    SalaryTools(dfs, data_version="v2", cache=cache).inflation_change("2023-01-01", "2024-01-01")
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("t", "a", 1)
+    cache.put("t", "b", 2)
+    cache.get("t", "a")
+    cache.put("t", "c", 3)
+
+    assert cache.get("t", "b") is None
+    assert cache.get("t", "a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_change_tensor_matches_pandas(dfs):
+    tools = SalaryTools(dfs, data_version="v1", cache=LRUCache(maxsize=0))
+    real = dfs["real_salaries"]
+    s, e = 1, 6
+
+    expected = (real.iloc[e] / real.iloc[s] - 1) * 100
+    np.testing.assert_allclose(tools.real_change.change[s, e], expected.to_numpy())
+
+    worst = [tools.real_columns[p] for p in tools.real_change.ascending[s, e]]
+    assert worst == list(expected.drop("Promedio Ponderado (MG Total)").sort_values().index)
+
+
+def test_dates_outside_the_data_raise(tools):
+    with pytest.raises(ValueError):
+        tools.inflation_change("2030-01-01", "2031-01-01")